@@ -0,0 +1,417 @@
+# benchmarks/controller_suite.py
+# Description : Latency and throughput of every controller method across data sizes
+#
+# Usage: python benchmarks/controller_suite.py [--scales 1k,10k,100k,1m] [--only NAME]
+#                                              [--budget S] [--warm-cache]
+#                                              [--baseline PATH] [--save-baseline]
+# Seeds one database per scale with seed.py (kept in --data-dir, so later runs
+# reuse it), times each TransactionController, BudgetController,
+# SavingsController and UserController method against the first seeded user
+# and writes p50/p95/p99 latency and rows/sec as JSON. With a baseline (by
+# default the one saved in --data-dir) any case whose p50 got slower by more
+# than --threshold is reported and the exit status is 1.
+#
+# Writes pair up (create, then delete in teardown; updates write back the
+# values already stored), so the seeded databases stay the same size run
+# after run. The query cache is off unless --warm-cache is given, so reads
+# are timed against SQLite rather than the cache.
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import database
+from controllers import (
+    BudgetController, DashboardService, SavingsController, TransactionController, UserController, query_cache
+)
+from database.money import from_minor_units
+from seed import PASSWORD, seed_database
+
+SCALES = "1k,10k,100k,1m"
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), "signance-bench")
+
+
+def parse_scale(text):
+    """'10k' -> 10000, '1m' -> 1000000."""
+    text = text.strip().lower()
+    multiplier = {"k": 1000, "m": 1000000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * multiplier)
+
+
+def format_scale(rows):
+    for suffix, size in (("m", 1000000), ("k", 1000)):
+        if rows >= size and rows % size == 0:
+            return f"{rows // size}{suffix}"
+    return str(rows)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Bench:
+    """Controllers plus sample ids of the user every case runs against."""
+
+    def __init__(self):
+        self.transactions = TransactionController()
+        self.budgets = BudgetController()
+        self.savings = SavingsController()
+        self.users = UserController()
+        self.dashboard = DashboardService()
+        self.counter = 0
+        self.created = {"transaction": [], "budget": [], "saving": []}
+        with database.connection() as conn:
+            self.user_id, self.username, self.email = conn.execute(
+                "SELECT user_id, username, email FROM users ORDER BY user_id LIMIT 1"
+            ).fetchone()
+            self.transaction_ids = [row[0] for row in conn.execute(
+                "SELECT transaction_id FROM transactions WHERE user_id = ? ORDER BY random() LIMIT 256", (self.user_id,)
+            )]
+            self.budget_ids = [row[0] for row in conn.execute(
+                "SELECT budget_id FROM budgets WHERE user_id = ?", (self.user_id,)
+            )]
+            self.saving_ids = [row[0] for row in conn.execute(
+                "SELECT saving_id FROM savings WHERE user_id = ?", (self.user_id,)
+            )]
+        self.users.login(self.username, PASSWORD)
+
+    def next(self, items=None):
+        """A fresh counter value, or the next item of `items` round-robin."""
+        self.counter += 1
+        return self.counter if items is None else items[self.counter % len(items)]
+
+    def new_transaction(self):
+        return self.transactions.create_transaction(self.user_id, "12.50", "foods", "expense", "bench setup")
+
+    def new_budget(self):
+        today = date.today()
+        return self.budgets.create_budget(self.user_id, "other", "100.00", today, today + timedelta(days=30)).budget_id
+
+    def new_saving(self):
+        return self.savings.create_saving(self.user_id, "bench setup", "500.00", datetime.now() + timedelta(days=90)).saving_id
+
+    def stored_transaction(self):
+        with database.connection() as conn:
+            return conn.execute(
+                "SELECT transaction_id, amount, category, transaction_type, description FROM transactions WHERE transaction_id = ?",
+                (self.next(self.transaction_ids),)
+            ).fetchone()
+
+    def cleanup(self):
+        """Remove whatever the create cases left behind."""
+        for transaction_id in self.created["transaction"]:
+            self.transactions.delete_transaction(transaction_id)
+        for budget_id in self.created["budget"]:
+            self.budgets.delete_budget(budget_id)
+        for saving_id in self.created["saving"]:
+            self.savings.delete_saving(saving_id)
+        with database.transaction() as conn:
+            conn.execute("DELETE FROM users WHERE username LIKE 'bench-register-%'")
+        for created in self.created.values():
+            created.clear()
+
+
+def _rows(case, result):
+    if case.write:
+        return 1
+    if result is None:
+        return 0
+    if isinstance(result, (list, tuple)) and not (result and isinstance(result[0], (int, str))):
+        return len(result)
+    return 1
+
+
+def _created(kind, value):
+    # Controllers return ids or model objects; keep the id for cleanup
+    return getattr(value, f"{kind}_id", value)
+
+
+class Case:
+    """One timed call. `setup` runs untimed before each call and its result
+    is passed to `run`; `run` returns what the controller returned. Reads
+    count the rows they return, writes one row per call."""
+
+    def __init__(self, name, run, setup=None, write=False, max_rows=None, max_iterations=None):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.write = write
+        self.max_rows = max_rows
+        self.max_iterations = max_iterations
+
+
+def _record(kind):
+    def wrap(run):
+        def recorded(bench, arg):
+            result = run(bench, arg)
+            if result is not None:
+                bench.created[kind].append(_created(kind, result))
+            return result
+        return recorded
+    return wrap
+
+
+def _year_range():
+    today = date.today()
+    return date(today.year, 1, 1), today
+
+
+CASES = [
+    # TransactionController
+    Case("transactions.create_transaction", _record("transaction")(
+        lambda b, _: b.transactions.create_transaction(b.user_id, "12.50", "foods", "expense", f"bench {b.next()}")), write=True),
+    Case("transactions.create_transaction[skip_duplicates]", _record("transaction")(
+        lambda b, _: b.transactions.create_transaction(b.user_id, "12.50", "foods", "expense", f"bench {b.next()}",
+                                                       skip_duplicates=True)), write=True),
+    Case("transactions.update_transaction",
+         lambda b, row: b.transactions.update_transaction(row[0], from_minor_units(row[1]), row[2], row[3], row[4]),
+         setup=lambda b: b.stored_transaction(), write=True),
+    Case("transactions.delete_transaction",
+         lambda b, transaction_id: b.transactions.delete_transaction(transaction_id),
+         setup=lambda b: b.new_transaction(), write=True),
+    Case("transactions.get_transaction_by_id",
+         lambda b, _: b.transactions.get_transaction_by_id(b.next(b.transaction_ids))),
+    Case("transactions.list_transactions",
+         lambda b, _: b.transactions.list_transactions(b.user_id, limit=200)[0]),
+    Case("transactions.list_transactions[category]",
+         lambda b, _: b.transactions.list_transactions(b.user_id, limit=200, filters={"category": "education"})[0]),
+    Case("transactions.get_transactions_by_user_id",
+         lambda b, _: b.transactions.get_transactions_by_user_id(b.user_id), max_rows=1000000),
+    Case("transactions.get_all_transactions",
+         lambda b, _: b.transactions.get_all_transactions(), max_rows=100000),
+    Case("transactions.aggregate",
+         lambda b, _: b.transactions.aggregate(b.user_id, *_year_range())),
+    Case("transactions.aggregate[day]",
+         lambda b, _: b.transactions.aggregate(b.user_id, *_year_range(), bucket="day")),
+    Case("transactions.calculate_monthly_spending",
+         lambda b, _: b.transactions.calculate_monthly_spending(b.user_id)),
+    Case("transactions.calculate_monthly_category_spending",
+         lambda b, _: b.transactions.calculate_monthly_category_spending(b.user_id)),
+    Case("transactions.calculate_last_six_months_spending",
+         lambda b, _: b.transactions.calculate_last_six_months_spending(b.user_id)),
+    Case("transactions.calculate_last_six_months_income",
+         lambda b, _: b.transactions.calculate_last_six_months_income(b.user_id)),
+
+    # BudgetController
+    Case("budgets.create_budget", _record("budget")(
+        lambda b, _: b.budgets.create_budget(b.user_id, "other", "100.00", date.today(), date.today() + timedelta(days=30))), write=True),
+    Case("budgets.update_budget",
+         lambda b, budget: b.budgets.update_budget(budget.budget_id, budget.amount, budget.start_date, budget.end_date),
+         setup=lambda b: b.budgets.get_budget_by_id(b.next(b.budget_ids)), write=True),
+    Case("budgets.delete_budget",
+         lambda b, budget_id: b.budgets.delete_budget(budget_id),
+         setup=lambda b: b.new_budget(), write=True),
+    Case("budgets.get_budget_by_id",
+         lambda b, _: b.budgets.get_budget_by_id(b.next(b.budget_ids))),
+    Case("budgets.get_all_budgets",
+         lambda b, _: b.budgets.get_all_budgets(b.user_id)),
+    Case("budgets.get_active_budgets",
+         lambda b, _: b.budgets.get_active_budgets(b.user_id)),
+
+    # SavingsController
+    Case("savings.create_saving", _record("saving")(
+        lambda b, _: b.savings.create_saving(b.user_id, f"bench {b.next()}", "500.00", datetime.now() + timedelta(days=90))), write=True),
+    Case("savings.update_saving",
+         lambda b, saving: b.savings.update_saving(saving.saving_id, saving.name, saving.target_amount, saving.deadline),
+         setup=lambda b: b.savings.get_saving_by_id(b.next(b.saving_ids)), write=True),
+    Case("savings.update_current_amount",
+         lambda b, saving: b.savings.update_current_amount(saving.saving_id, saving.current_amount),
+         setup=lambda b: b.savings.get_saving_by_id(b.next(b.saving_ids)), write=True),
+    Case("savings.delete_saving",
+         lambda b, saving_id: b.savings.delete_saving(saving_id),
+         setup=lambda b: b.new_saving(), write=True),
+    Case("savings.get_saving_by_id",
+         lambda b, _: b.savings.get_saving_by_id(b.next(b.saving_ids))),
+    Case("savings.get_all_savings",
+         lambda b, _: b.savings.get_all_savings(b.user_id)),
+
+    # UserController (login and register are dominated by bcrypt)
+    Case("users.login", lambda b, _: b.users.login(b.username, PASSWORD), max_iterations=5),
+    Case("users.register",
+         lambda b, name: b.users.register(name, f"{name}@example.com", PASSWORD),
+         setup=lambda b: f"bench-register-{b.next()}", write=True, max_iterations=5),
+    Case("users.is_username_taken", lambda b, _: b.users.is_username_taken(b.username)),
+    Case("users.is_email_registered", lambda b, _: b.users.is_email_registered(b.email)),
+    Case("users.get_user_by_username_or_email", lambda b, _: b.users.get_user_by_username_or_email(b.email)),
+    Case("users.get_logged_in_user", lambda b, _: b.users.get_logged_in_user()),
+    Case("users.logout_user", lambda b, _: b.users.logout_user(), write=True),
+
+    # What the dashboard page asks for on every refresh
+    Case("dashboard.snapshot", lambda b, _: b.dashboard.snapshot(b.user_id)),
+]
+
+
+def time_case(bench, case, budget, min_iterations, max_iterations):
+    """Call a case until `budget` seconds are used; returns its latency stats."""
+    limit = min(max_iterations, case.max_iterations or max_iterations)
+    # One untimed call warms SQLite's page cache and the statement cache
+    case.run(bench, case.setup(bench) if case.setup else None)
+    latencies = []
+    rows = 0
+    spent = 0.0
+    while len(latencies) < limit and (len(latencies) < min_iterations or spent < budget):
+        arg = case.setup(bench) if case.setup else None
+        started = time.perf_counter()
+        result = case.run(bench, arg)
+        elapsed = time.perf_counter() - started
+        latencies.append(elapsed)
+        rows += _rows(case, result)
+        spent += elapsed
+    return {
+        "iterations": len(latencies),
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "ops_per_second": len(latencies) / spent if spent else 0.0,
+        "rows_per_call": rows / len(latencies),
+        "rows_per_second": rows / spent if spent else 0.0,
+    }
+
+
+def seeded_database(data_dir, rows, seed):
+    path = os.path.join(data_dir, f"seed-{format_scale(rows)}-{seed}.db")
+    if not os.path.exists(path):
+        print(f"Seeding {rows:,} transactions into {path} ...", file=sys.stderr)
+        partial = path + ".part"
+        for leftover in (partial, partial + "-wal", partial + "-shm"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        summary = seed_database(partial, rows, seed=seed)
+        os.replace(partial, path)
+        print(f"  done in {summary['seconds']:.1f}s", file=sys.stderr)
+    return path
+
+
+def run_suite(scales, data_dir, seed=0, only=None, budget=1.0, min_iterations=3, max_iterations=200, warm_cache=False):
+    results = {}
+    query_cache.enabled = warm_cache
+    for rows in scales:
+        path = seeded_database(data_dir, rows, seed)
+        database.configure_pool(path=path)
+        bench = Bench()
+        scale = results[format_scale(rows)] = {}
+        try:
+            for case in CASES:
+                if only and not any(part in case.name for part in only):
+                    continue
+                if case.max_rows is not None and rows > case.max_rows:
+                    continue
+                query_cache.clear()
+                print(f"  {format_scale(rows):>5} {case.name}", file=sys.stderr)
+                try:
+                    scale[case.name] = time_case(bench, case, budget, min_iterations, max_iterations)
+                finally:
+                    bench.cleanup()
+        finally:
+            database.get_pool().close()
+    return results
+
+
+def compare(results, baseline, threshold, floor_ms):
+    """Cases present in both runs whose p50 grew by more than `threshold`
+    (a fraction) and by more than `floor_ms`, which keeps sub-millisecond
+    noise from being reported."""
+    regressions = []
+    for scale, cases in results.items():
+        for name, stats in cases.items():
+            before = baseline.get(scale, {}).get(name)
+            if before is None:
+                continue
+            change = stats["p50_ms"] / before["p50_ms"] - 1 if before["p50_ms"] else 0.0
+            if change > threshold and stats["p50_ms"] - before["p50_ms"] > floor_ms:
+                regressions.append({
+                    "scale": scale, "case": name, "baseline_p50_ms": before["p50_ms"],
+                    "p50_ms": stats["p50_ms"], "change": change,
+                })
+    return regressions
+
+
+def print_table(results, baseline):
+    for scale, cases in results.items():
+        print(f"\n{scale} transactions")
+        print(f"  {'case':<52} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'rows/s':>12} {'vs base':>8}")
+        for name, stats in cases.items():
+            before = baseline.get(scale, {}).get(name) if baseline else None
+            change = f"{stats['p50_ms'] / before['p50_ms'] - 1:+.0%}" if before and before["p50_ms"] else ""
+            print(f"  {name:<52} {stats['p50_ms']:9.3f} {stats['p95_ms']:9.3f} {stats['p99_ms']:9.3f} "
+                  f"{stats['rows_per_second']:12,.0f} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Signance controllers across data sizes")
+    parser.add_argument("--scales", default=SCALES, help="comma separated row counts, e.g. 1k,100k,10m")
+    parser.add_argument("--only", help="comma separated substrings of case names to run")
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds spent timing each case")
+    parser.add_argument("--min-iterations", type=int, default=3)
+    parser.add_argument("--max-iterations", type=int, default=200)
+    parser.add_argument("--warm-cache", action="store_true", help="leave the query cache on")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic data seed")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="where seeded databases and results are kept")
+    parser.add_argument("--output", help="result JSON (default: DATA_DIR/controllers-latest.json)")
+    parser.add_argument("--baseline", help="baseline JSON to compare with (default: DATA_DIR/controllers-baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.3, help="p50 slow-down reported as a regression")
+    parser.add_argument("--floor-ms", type=float, default=0.1, help="ignore p50 changes smaller than this")
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    output = args.output or os.path.join(args.data_dir, "controllers-latest.json")
+    baseline_path = args.baseline or os.path.join(args.data_dir, "controllers-baseline.json")
+    scales = [parse_scale(scale) for scale in args.scales.split(",") if scale.strip()]
+    only = [part.strip() for part in args.only.split(",")] if args.only else None
+
+    warnings.simplefilter("ignore", DeprecationWarning)
+    results = run_suite(scales, args.data_dir, args.seed, only, args.budget,
+                        args.min_iterations, args.max_iterations, args.warm_cache)
+
+    baseline = None
+    if os.path.exists(baseline_path) and not args.save_baseline:
+        with open(baseline_path, encoding="utf-8") as handle:
+            baseline = json.load(handle)["results"]
+    regressions = compare(results, baseline, args.threshold, args.floor_ms) if baseline else []
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "warm_cache": args.warm_cache,
+            "seed": args.seed,
+            "baseline": baseline_path if baseline else None,
+        },
+        "results": results,
+        "regressions": regressions,
+    }
+    with open(output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    if args.save_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+
+    print_table(results, baseline)
+    print(f"\nResults written to {output}")
+    if args.save_baseline:
+        print(f"Saved as baseline: {baseline_path}")
+    for regression in regressions:
+        print(f"REGRESSION {regression['scale']} {regression['case']}: "
+              f"{regression['baseline_p50_ms']:.3f} -> {regression['p50_ms']:.3f} ms ({regression['change']:+.0%})")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+# benchmarks/dashboard_chart.py
+# Description : Redraw time and memory of the dashboard line chart
+#
+# Usage: python benchmarks/dashboard_chart.py [--iterations N]
+# Runs offscreen against a throwaway database; the real one is never touched.
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from PyQt5.QtWidgets import QApplication
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+import database
+from controllers import BudgetController, TransactionController, UserController
+from models.transaction import Category
+from views.components import get_runner
+from views.pages.dashboard_page import DashboardPage
+
+
+def seed(user_controller, transaction_controller):
+    user_controller.register("bench", "bench@example.com", "bench-password")
+    user_id = user_controller.get_user_by_username_or_email("bench")[0]
+    for i in range(60):
+        transaction_type = "income" if i % 3 == 0 else "expense"
+        transaction_controller.create_transaction(user_id, 10 + i, Category.FOODS.value, transaction_type, f"bench {i}")
+    return user_id
+
+
+def wait_for(app, condition, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("dashboard did not finish loading")
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def rebuild_redraw(canvas, months, spending, income):
+    """What the chart used to do on every refresh."""
+    canvas.figure.clear()
+    ax = canvas.figure.add_subplot(111)
+    ax.plot(months, spending, marker='o', color='blue', label='Spending')
+    ax.plot(months, income, marker='o', color='green', label='Income')
+    ax.set_title('Monthly Spending vs Income')
+    ax.set_xlabel('Month')
+    ax.set_ylabel('Amount ($)')
+    ax.grid(True)
+    ax.legend()
+    canvas.draw()
+
+
+def time_redraws(app, chart, iterations):
+    series = [([100 * (i + k) for k in range(6)], [150 * (i + k) for k in range(6)]) for i in range(iterations)]
+    months = chart.MONTH_NAMES[:6]
+
+    # Same size canvas, redrawn the old way
+    legacy = FigureCanvas(Figure(figsize=chart.figure.get_size_inches(), dpi=chart.figure.dpi))
+    start = time.perf_counter()
+    for spending, income in series:
+        rebuild_redraw(legacy, months, spending, income)
+    rebuild = (time.perf_counter() - start) / iterations
+
+    start = time.perf_counter()
+    for spending, income in series:
+        chart.show_series(dict(zip(months, spending)), dict(zip(months, income)))
+        # Flush the idle draw so both sides pay for a full render
+        chart.canvas.draw()
+    in_place = (time.perf_counter() - start) / iterations
+    return rebuild, in_place
+
+
+def measure_updates(app, page, transaction_controller, iterations):
+    """Time update_dashboard() and the memory it keeps, with new data every time.
+
+    A transaction is added before each update (untimed), so every snapshot
+    differs and the chart really runs set_ydata() and draw_idle(); unchanged
+    data would be skipped and prove nothing. Returns the mean update time,
+    the memory growth and how many updates actually redrew the chart.
+    """
+    runner = get_runner()
+    canvas = page.line_chart.canvas
+    draws = [0]
+    draw = canvas.draw
+
+    def counted_draw(*args, **kwargs):
+        draws[0] += 1
+        return draw(*args, **kwargs)
+    canvas.draw = counted_draw
+
+    def one_update(i):
+        transaction_type = "income" if i % 2 else "expense"
+        transaction_controller.create_transaction(
+            page.user_id, 5 + i % 97, Category.FOODS.value, transaction_type, f"update {i}"
+        )
+        start = time.perf_counter()
+        page.update_dashboard()
+        wait_for(app, lambda: not runner.is_busy(page, "dashboard"))
+        # Run the idle draw the update scheduled
+        app.processEvents()
+        return time.perf_counter() - start
+
+    for i in range(5):
+        one_update(i)
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    draws[0] = 0
+    elapsed = sum(one_update(5 + i) for i in range(iterations)) / iterations
+    redraws = draws[0]
+    gc.collect()
+    growth = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    canvas.draw = draw
+    return elapsed, growth, redraws
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard line chart")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database.configure_pool(path=os.path.join(workdir, "bench.db"))
+        database.initialize_database()
+
+        app = QApplication(sys.argv)
+
+        user_controller = UserController()
+        transaction_controller = TransactionController()
+        user_id = seed(user_controller, transaction_controller)
+
+        page = DashboardPage(user_id, user_controller, transaction_controller, BudgetController(), lambda: None)
+        page.resize(1200, 800)
+        page.show()
+
+        rebuild, in_place = time_redraws(app, page.line_chart, args.iterations)
+        update_time, growth, redraws = measure_updates(app, page, transaction_controller, args.iterations)
+
+        print(f"chart redraw, rebuild figure : {rebuild * 1000:8.2f} ms")
+        print(f"chart redraw, in place       : {in_place * 1000:8.2f} ms ({rebuild / in_place:.1f}x faster)")
+        print(f"update_dashboard round trip  : {update_time * 1000:8.2f} ms")
+        print(f"chart redraws                : {redraws:8d} of {args.iterations} updates")
+        print(f"memory growth over {args.iterations} updates : {growth / 1024:8.1f} KiB")
+        print(f"pyplot figures alive         : {len(plt.get_fignums())}")
+
+        page.close()
+        database.get_pool().close()
+
+
+if __name__ == "__main__":
+    main()
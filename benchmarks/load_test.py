@@ -0,0 +1,178 @@
+# benchmarks/load_test.py
+# Description : Requests/sec and latency percentiles of the local API server
+#
+# Usage: python benchmarks/load_test.py [--users N] [--transactions N]
+#                                       [--concurrency C] [--duration S] [--json]
+# Seeds a throwaway database, starts src/server.py on a free port and runs C
+# keep-alive clients with a mixed read/write workload against it.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+# The same synthetic users, history, budgets and savings as the other benchmarks
+from seed import PASSWORD, seed_database
+
+CATEGORIES = ["foods", "transport", "entertainment", "education", "other"]
+
+# (name, weight, method, path, body factory)
+WORKLOAD = [
+    ("list transactions", 40, "GET", "/transactions?limit=50", None),
+    ("dashboard", 25, "GET", "/reports/dashboard", None),
+    ("totals", 10, "GET", "/reports/totals?bucket=month&group_by=type,category", None),
+    ("budgets", 10, "GET", "/budgets", None),
+    ("create transaction", 15, "POST", "/transactions", lambda: {
+        "amount": f"{random.randint(100, 50000) / 100:.2f}",
+        "category": random.choice(CATEGORIES),
+        "transaction_type": "expense",
+        "description": "load test",
+    }),
+]
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None, token=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        payload = json.dumps(body).encode() if body is not None else b""
+        headers = f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(payload)}\r\n"
+        if token:
+            headers += f"Authorization: Bearer {token}\r\n"
+        self.writer.write(headers.encode() + b"\r\n" + payload)
+        await self.writer.drain()
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        length = int(re.search(rb"(?i)content-length: *(\d+)", head).group(1))
+        data = await self.reader.readexactly(length)
+        return status, json.loads(data)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_load(host, port, users, concurrency, duration):
+    tokens = []
+    for index in range(users):
+        client = Client(host, port)
+        status, body = await client.request("POST", "/login", {"username": f"user{index}", "password": PASSWORD})
+        client.close()
+        if status != 200:
+            raise RuntimeError(f"login failed: {status} {body}")
+        tokens.append(body["token"])
+
+    names = [entry[0] for entry in WORKLOAD]
+    weights = [entry[1] for entry in WORKLOAD]
+    latencies = {name: [] for name in names}
+    errors = {}
+    deadline = time.perf_counter() + duration
+
+    async def worker(number):
+        client = Client(host, port)
+        token = tokens[number % len(tokens)]
+        try:
+            while time.perf_counter() < deadline:
+                name, _, method, path, body = random.choices(WORKLOAD, weights)[0]
+                started = time.perf_counter()
+                status, _ = await client.request(method, path, body() if body else None, token)
+                latencies[name].append(time.perf_counter() - started)
+                if status >= 400:
+                    errors[status] = errors.get(status, 0) + 1
+        finally:
+            client.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(number) for number in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    every = [value for values in latencies.values() for value in values]
+    return {
+        "requests": len(every),
+        "elapsed": elapsed,
+        "requests_per_second": len(every) / elapsed,
+        "p50_ms": percentile(every, 0.50) * 1000,
+        "p95_ms": percentile(every, 0.95) * 1000,
+        "p99_ms": percentile(every, 0.99) * 1000,
+        "max_ms": max(every, default=0) * 1000,
+        "errors": errors,
+        "endpoints": {
+            name: {
+                "requests": len(values),
+                "p50_ms": percentile(values, 0.50) * 1000,
+                "p99_ms": percentile(values, 0.99) * 1000,
+            }
+            for name, values in latencies.items()
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Signance API server")
+    parser.add_argument("--users", type=int, default=4)
+    parser.add_argument("--transactions", type=int, default=20000, help="seeded transactions per user")
+    parser.add_argument("--concurrency", type=int, default=32, help="simultaneous keep-alive clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--workers", type=int, default=8, help="server worker threads")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, "load.db")
+        seed_database(path, args.users * args.transactions, users=args.users)
+
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(SRC, "server.py"), "--database", path,
+             "--port", "0", "--workers", str(args.workers)],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+        try:
+            line = server.stdout.readline()
+            match = re.search(r"http://([\d.]+):(\d+)", line)
+            if not match:
+                raise RuntimeError(f"server did not start: {line!r}")
+            result = asyncio.run(run_load(match.group(1), int(match.group(2)), args.users, args.concurrency, args.duration))
+        finally:
+            server.terminate()
+            server.wait()
+
+    result.update(users=args.users, seeded_transactions=args.users * args.transactions,
+                  concurrency=args.concurrency, workers=args.workers)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    print(f"{result['requests']:,} requests in {result['elapsed']:.1f}s "
+          f"({args.concurrency} clients, {args.workers} workers, {result['seeded_transactions']:,} rows)")
+    print(f"  {result['requests_per_second']:,.0f} req/s   p50 {result['p50_ms']:.1f} ms   "
+          f"p95 {result['p95_ms']:.1f} ms   p99 {result['p99_ms']:.1f} ms   max {result['max_ms']:.1f} ms")
+    for name, stats in result["endpoints"].items():
+        print(f"  {name:<20} {stats['requests']:>7,}   p50 {stats['p50_ms']:6.1f} ms   p99 {stats['p99_ms']:6.1f} ms")
+    if result["errors"]:
+        print(f"  errors: {result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/login_cycles.py
+# Description : Memory and widget count across repeated login/logout cycles
+#
+# Usage: python benchmarks/login_cycles.py [--cycles N] [--max-growth-kib K]
+# Runs offscreen against a throwaway database and exits non-zero when a
+# cycle leaves widgets behind or memory keeps growing after the warm-up.
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from PyQt5.QtCore import QCoreApplication, QEvent
+from PyQt5.QtWidgets import QApplication
+
+import database
+from views.components import get_runner
+from views.main_window import MainWindow, get_controller
+
+SESSION_PAGES = ["Dashboard", "Transactions", "Savings", "Budget"]
+
+
+def seed():
+    user_controller = get_controller("UserController")
+    transaction_controller = get_controller("TransactionController")
+    user_controller.register("bench", "bench@example.com", "bench-password")
+    user_id = user_controller.get_user_by_username_or_email("bench")[0]
+    for i in range(500):
+        transaction_type = "income" if i % 3 == 0 else "expense"
+        transaction_controller.create_transaction(user_id, 10 + i, "foods", transaction_type, f"bench {i}")
+
+
+def settle(app, timeout=10.0):
+    """Let background tasks deliver and deferred deletes run."""
+    deadline = time.perf_counter() + timeout
+    runner = get_runner()
+    while not runner.is_idle():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("background tasks did not finish")
+        app.processEvents()
+        time.sleep(0.001)
+    app.processEvents()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    gc.collect()
+
+
+def cycle(app, window):
+    window.on_login_successful("bench")
+    settle(app)
+    for name in SESSION_PAGES:
+        window.switch_page(name)
+        settle(app)
+    window.logout()
+    settle(app)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check login/logout cycles for leaks")
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--max-growth-kib", type=float, default=256.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database.configure_pool(path=os.path.join(workdir, "bench.db"))
+        database.initialize_database()
+        app = QApplication(sys.argv)
+        seed()
+
+        window = MainWindow()
+        window.show()
+        settle(app)
+
+        for _ in range(args.warmup):
+            cycle(app, window)
+
+        tracemalloc.start()
+        baseline_memory = tracemalloc.get_traced_memory()[0]
+        baseline_widgets = len(QApplication.allWidgets())
+        start = time.perf_counter()
+        for _ in range(args.cycles):
+            cycle(app, window)
+        elapsed = (time.perf_counter() - start) / args.cycles
+        growth = (tracemalloc.get_traced_memory()[0] - baseline_memory) / 1024
+        tracemalloc.stop()
+        widgets = len(QApplication.allWidgets())
+        pages = len(window.pages.built_pages())
+
+        print(f"login/logout cycle           : {elapsed * 1000:8.2f} ms")
+        print(f"memory growth over {args.cycles} cycles : {growth:8.1f} KiB")
+        print(f"live widgets                 : {baseline_widgets} -> {widgets}")
+        print(f"pages built after logout     : {pages}")
+
+        window.close()
+        get_runner().shutdown()
+        database.get_pool().close()
+
+    failed = widgets > baseline_widgets or growth > args.max_growth_kib
+    if failed:
+        print("FAIL: login/logout cycles leak")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+# benchmarks/page_refresh.py
+# Description : Cost of the page refreshes users wait on, across data sizes
+#
+# Usage: python benchmarks/page_refresh.py [--scales 1k,10k,100k,1m] [--iterations N]
+#                                          [--only PAGE] [--warm-cache]
+#                                          [--baseline PATH] [--save-baseline]
+# Runs offscreen against the databases controller_suite.py seeds (kept in
+# --data-dir) and, for each page and scale, times the refresh until its
+# results are on screen:
+#
+#   open      page constructed, shown and its first load on screen (cold
+#             render, including the dashboard's first chart draw)
+#   wall      call to settled, including the background query
+#   blocked   time the GUI thread was busy (the call itself plus every event
+#             loop pass that applied results or painted); "longest" is the
+#             worst single stall, which is what the user sees as a freeze
+#   widgets   QWidget children of the page after the refresh
+#   items     rows the page shows (table rows, list items, loaded model rows)
+#   rss       resident memory after the refreshes, and its growth across them
+#
+# Regressions in wall p50 against a baseline are flagged like controller_suite.
+
+import argparse
+import gc
+import json
+import os
+import resource
+import statistics
+import sys
+import time
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from PyQt5.QtCore import QCoreApplication, QEvent
+from PyQt5.QtWidgets import QApplication, QWidget
+
+import database
+from controllers import BudgetController, SavingsController, TransactionController, UserController, query_cache
+from views.components import get_runner
+# Imported up front so the first open is not charged for loading matplotlib
+from views.pages import BudgetPage, DashboardPage, SavingsPage, TransactionPage
+from controller_suite import (
+    DEFAULT_DATA_DIR, SCALES, compare, format_scale, parse_scale, percentile, seeded_database
+)
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes():
+    """Current resident set size; the peak where /proc is not available."""
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _transaction_page(user_id):
+    page = TransactionPage(user_id, TransactionController())
+    return page, page.refresh_transaction_list, lambda: page.model.rowCount()
+
+
+def _budget_page(user_id):
+    page = BudgetPage(user_id, BudgetController())
+    return page, page.refresh_budget_list, lambda: page.table_widget.rowCount()
+
+
+def _savings_page(user_id):
+    page = SavingsPage(user_id, SavingsController())
+    return page, page.refresh_savings_list, lambda: page.list_widget.count()
+
+
+def _dashboard_page(user_id):
+    transactions = TransactionController()
+    page = DashboardPage(user_id, UserController(), transactions, BudgetController(), lambda: None)
+    # MainWindow.switch_page loads the dashboard, the other pages load themselves
+    page.update_dashboard()
+
+    def items():
+        snapshot = page.snapshot
+        return len(snapshot.months) + len(snapshot.category_budgets) if snapshot is not None else 0
+    return page, page.update_dashboard, items
+
+
+# name: factory returning (page, refresh, item count) with the first load started
+PAGES = {
+    "TransactionPage.refresh_transaction_list": _transaction_page,
+    "BudgetPage.refresh_budget_list": _budget_page,
+    "SavingsPage.refresh_savings_list": _savings_page,
+    "DashboardPage.update_dashboard": _dashboard_page,
+}
+
+
+class Stopwatch:
+    """Splits a refresh into GUI-thread work and idle waiting."""
+
+    def __init__(self):
+        self.blocks = []
+
+    def run(self, fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        self.blocks.append(time.perf_counter() - started)
+        return result
+
+
+def refresh_once(app, refresh, timeout=60.0):
+    """Refresh and pump the event loop until every background task delivered."""
+    runner = get_runner()
+    watch = Stopwatch()
+    started = time.perf_counter()
+    result = watch.run(refresh)
+    watch.run(app.processEvents)
+    while not runner.is_idle():
+        if time.perf_counter() - started > timeout:
+            raise TimeoutError("refresh did not finish")
+        time.sleep(0.0005)
+        watch.run(app.processEvents)
+    # One more pass paints whatever the results changed
+    watch.run(app.processEvents)
+    return time.perf_counter() - started, watch.blocks, result
+
+
+def settle(app):
+    while not get_runner().is_idle():
+        app.processEvents()
+        time.sleep(0.001)
+    app.processEvents()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    gc.collect()
+
+
+def open_page(factory, user_id):
+    page, refresh, items = factory(user_id)
+    page.resize(1200, 800)
+    page.show()
+    return page, refresh, items
+
+
+def measure_page(app, factory, user_id, iterations, warmup):
+    query_cache.clear()
+    opened, open_blocks, (page, refresh, items) = refresh_once(app, lambda: open_page(factory, user_id))
+    for _ in range(warmup):
+        query_cache.clear()
+        refresh_once(app, refresh)
+    gc.collect()
+    rss_before = rss_bytes()
+
+    walls, blocked, longest = [], [], []
+    for _ in range(iterations):
+        query_cache.clear()
+        wall, blocks, _ = refresh_once(app, refresh)
+        walls.append(wall)
+        blocked.append(sum(blocks))
+        longest.append(max(blocks))
+    gc.collect()
+    rss_after = rss_bytes()
+
+    result = {
+        "iterations": iterations,
+        "open_ms": opened * 1000,
+        "open_longest_block_ms": max(open_blocks) * 1000,
+        "p50_ms": percentile(walls, 0.50) * 1000,
+        "p95_ms": percentile(walls, 0.95) * 1000,
+        "mean_ms": statistics.fmean(walls) * 1000,
+        "blocked_p50_ms": percentile(blocked, 0.50) * 1000,
+        "blocked_p95_ms": percentile(blocked, 0.95) * 1000,
+        "longest_block_ms": max(longest) * 1000,
+        "widgets": len(page.findChildren(QWidget)),
+        "items": items(),
+        "rss_mb": rss_after / 2 ** 20,
+        "rss_growth_kb": (rss_after - rss_before) / 1024,
+    }
+    page.close()
+    page.deleteLater()
+    settle(app)
+    return result
+
+
+def run_pages(app, scales, data_dir, seed=0, only=None, iterations=10, warmup=2, warm_cache=False):
+    results = {}
+    query_cache.enabled = warm_cache
+    for rows in scales:
+        path = seeded_database(data_dir, rows, seed)
+        database.configure_pool(path=path)
+        with database.connection() as conn:
+            user_id = conn.execute("SELECT user_id FROM users ORDER BY user_id LIMIT 1").fetchone()[0]
+        scale = results[format_scale(rows)] = {}
+        for name, factory in PAGES.items():
+            if only and not any(part in name for part in only):
+                continue
+            print(f"  {format_scale(rows):>5} {name}", file=sys.stderr)
+            scale[name] = measure_page(app, factory, user_id, iterations, warmup)
+        database.get_pool().close()
+    return results
+
+
+def print_table(results, baseline):
+    for scale, pages in results.items():
+        print(f"\n{scale} transactions")
+        print(f"  {'page refresh':<42} {'open':>8} {'wall p50':>9} {'p95':>8} {'blocked':>8} {'longest':>8} "
+              f"{'widgets':>8} {'items':>6} {'rss MB':>7} {'growth':>8} {'vs base':>8}")
+        for name, stats in pages.items():
+            before = baseline.get(scale, {}).get(name) if baseline else None
+            change = f"{stats['p50_ms'] / before['p50_ms'] - 1:+.0%}" if before and before["p50_ms"] else ""
+            print(f"  {name:<42} {stats['open_ms']:8.2f} {stats['p50_ms']:9.2f} {stats['p95_ms']:8.2f} {stats['blocked_p50_ms']:8.2f} "
+                  f"{stats['longest_block_ms']:8.2f} {stats['widgets']:8} {stats['items']:6} "
+                  f"{stats['rss_mb']:7.1f} {stats['rss_growth_kb']:7.0f}K {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Signance page refreshes offscreen")
+    parser.add_argument("--scales", default=SCALES, help="comma separated row counts, e.g. 1k,100k,10m")
+    parser.add_argument("--only", help="comma separated substrings of page names to run")
+    parser.add_argument("--iterations", type=int, default=10, help="timed refreshes per page and scale")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed refreshes first")
+    parser.add_argument("--warm-cache", action="store_true", help="leave the query cache on")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic data seed")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="where seeded databases and results are kept")
+    parser.add_argument("--output", help="result JSON (default: DATA_DIR/pages-latest.json)")
+    parser.add_argument("--baseline", help="baseline JSON to compare with (default: DATA_DIR/pages-baseline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.3, help="wall p50 slow-down reported as a regression")
+    parser.add_argument("--floor-ms", type=float, default=1.0, help="ignore p50 changes smaller than this")
+    args = parser.parse_args()
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    output = args.output or os.path.join(args.data_dir, "pages-latest.json")
+    baseline_path = args.baseline or os.path.join(args.data_dir, "pages-baseline.json")
+    scales = [parse_scale(scale) for scale in args.scales.split(",") if scale.strip()]
+    only = [part.strip() for part in args.only.split(",")] if args.only else None
+
+    app = QApplication(sys.argv)
+    results = run_pages(app, scales, args.data_dir, args.seed, only,
+                        args.iterations, args.warmup, args.warm_cache)
+    get_runner().shutdown(wait=True)
+
+    baseline = None
+    if os.path.exists(baseline_path) and not args.save_baseline:
+        with open(baseline_path, encoding="utf-8") as handle:
+            baseline = json.load(handle)["results"]
+    regressions = compare(results, baseline, args.threshold, args.floor_ms) if baseline else []
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "qt_platform": os.environ.get("QT_QPA_PLATFORM"),
+            "warm_cache": args.warm_cache,
+            "seed": args.seed,
+            "baseline": baseline_path if baseline else None,
+        },
+        "results": results,
+        "regressions": regressions,
+    }
+    with open(output, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2)
+    if args.save_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+
+    print_table(results, baseline)
+    print(f"\nResults written to {output}")
+    if args.save_baseline:
+        print(f"Saved as baseline: {baseline_path}")
+    for regression in regressions:
+        print(f"REGRESSION {regression['scale']} {regression['case']}: "
+              f"{regression['baseline_p50_ms']:.2f} -> {regression['p50_ms']:.2f} ms ({regression['change']:+.0%})")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
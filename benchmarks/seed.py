@@ -0,0 +1,206 @@
+# benchmarks/seed.py
+# Description : Synthetic users, transactions, budgets and savings for benchmarks
+#
+# Usage: python benchmarks/seed.py PATH [--rows N] [--users N] [--years N] [--seed N]
+# Writes a fresh database at PATH with N transactions in total, spread over
+# the users in date order: a monthly salary, occasional other income and
+# expenses whose category mix and amounts follow a typical household.
+# The same arguments always produce the same data.
+
+import argparse
+import os
+import random
+import sys
+import time
+from bisect import bisect
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import database
+from database.dates import to_db_timestamp
+from database.fingerprints import transaction_fingerprint
+from database.rollups import rebuild_rollups
+
+PASSWORD = "bench-password"
+BATCH_SIZE = 50000
+
+# category: (share of expenses, median amount in minor units, merchants)
+EXPENSES = {
+    "foods": (0.45, 1800, ["Supermarket", "Bakery", "Coffee Bar", "Noodle House", "Food Court", "Grocer"]),
+    "transport": (0.20, 1500, ["Fuel Station", "Metro Card", "Ride Share", "Parking", "Toll Road"]),
+    "entertainment": (0.15, 4500, ["Cinema", "Streaming", "Concert Hall", "Game Store", "Bookshop"]),
+    "education": (0.05, 25000, ["University", "Online Course", "Stationery", "Language School"]),
+    "other": (0.15, 6000, ["Pharmacy", "Hardware", "Electricity", "Phone Bill", "Gift Shop", "Clinic"]),
+}
+SALARY_DAY = 25
+LOGNORMAL_MEAN = 1.377  # exp(0.8 ** 2 / 2): mean over median of the amounts
+OTHER_INCOME_SHARE = 0.03
+SAVING_GOALS = [("Emergency fund", 1500000), ("Holiday", 600000), ("New laptop", 250000)]
+
+
+def default_users(rows):
+    """One user per 100k rows, so per-user history stays realistic as totals grow."""
+    return max(1, rows // 100000)
+
+
+def _expense_picker(rng):
+    categories = list(EXPENSES)
+    bounds = list(accumulate(EXPENSES[category][0] for category in categories))
+    descriptions = {
+        category: [f"{merchant} {branch}" for merchant in EXPENSES[category][2] for branch in range(1, 41)]
+        for category in categories
+    }
+    random = rng.random
+
+    def pick():
+        category = categories[bisect(bounds, random() * bounds[-1])]
+        names = descriptions[category]
+        # Log-normal amounts: mostly near the median with a long tail
+        amount = max(50, int(rng.lognormvariate(0, 0.8) * EXPENSES[category][1]))
+        return category, amount, names[int(random() * len(names))]
+    return pick
+
+
+def _user_rows(rng, user_id, count, start, end):
+    """Yield `count` INSERT tuples for one user in date order between start and end."""
+    span = (end - start).total_seconds()
+    salary = rng.randint(3000, 12000) * 100
+    pick_expense = _expense_picker(rng)
+    next_salary = datetime(start.year, start.month, SALARY_DAY, 9)
+    if next_salary < start:
+        next_salary = (next_salary + timedelta(days=31)).replace(day=SALARY_DAY)
+    for index in range(count):
+        # A jittered grid keeps the dates increasing without sorting anything
+        moment = start + timedelta(seconds=span * (index + rng.random()) / count)
+        if moment >= next_salary:
+            moment = next_salary
+            category, transaction_type, amount, description = "other", "income", salary, "Salary"
+            next_salary = (next_salary + timedelta(days=31)).replace(day=SALARY_DAY)
+        elif rng.random() < OTHER_INCOME_SHARE:
+            category, transaction_type = "other", "income"
+            amount, description = rng.randint(20, 800) * 100, "Transfer in"
+        else:
+            category, amount, description = pick_expense()
+            transaction_type = "expense"
+        yield (
+            user_id, amount, category, transaction_type, description, to_db_timestamp(moment),
+            transaction_fingerprint(user_id, moment, amount, transaction_type, description)
+        )
+
+
+def seed_database(path, rows, users=None, years=3, seed=0, progress=None):
+    """Create a database at `path` holding `rows` synthetic transactions.
+
+    Triggers and secondary indexes on transactions are dropped during the
+    load and rebuilt at the end, which is much faster than maintaining them
+    row by row. Returns a summary dict.
+    """
+    if os.path.exists(path):
+        raise FileExistsError(path)
+    users = users or default_users(rows)
+    rng = random.Random(seed)
+    started = time.perf_counter()
+
+    database.configure_pool(path=path)
+    database.initialize_database()
+    from utils.helpers import hash_password
+    password_hash = hash_password(PASSWORD)
+
+    end = datetime.now().replace(microsecond=0)
+    start = end - timedelta(days=365 * years)
+    with database.transaction("IMMEDIATE") as conn:
+        conn.executemany(
+            "INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+            [(f"user{n}", f"user{n}@example.com", password_hash) for n in range(users)]
+        )
+        user_ids = [row[0] for row in conn.execute("SELECT user_id FROM users ORDER BY user_id")]
+        deferred = conn.execute(
+            "SELECT type, name, sql FROM sqlite_master WHERE tbl_name = 'transactions' "
+            "AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+        ).fetchall()
+        for kind, name, _ in deferred:
+            conn.execute(f"DROP {kind.upper()} {name}")
+
+    insert = """
+        INSERT INTO transactions (user_id, amount, category, transaction_type, description, date, fingerprint)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+    written = 0
+    for position, user_id in enumerate(user_ids):
+        count = rows // users + (1 if position < rows % users else 0)
+        pending = _user_rows(rng, user_id, count, start, end)
+        while True:
+            batch = [row for _, row in zip(range(BATCH_SIZE), pending)]
+            if not batch:
+                break
+            with database.transaction("IMMEDIATE") as conn:
+                conn.executemany(insert, batch)
+            written += len(batch)
+            if progress is not None:
+                progress(written, rows)
+
+    with database.transaction("IMMEDIATE") as conn:
+        for _, _, sql in deferred:
+            conn.execute(sql)
+        rebuild_rollups(conn)
+
+        # A monthly budget per category for the last year, sized around what
+        # the user actually spends there, and a few saving goals
+        budgets = []
+        for position, user_id in enumerate(user_ids):
+            per_month = (rows // users + (1 if position < rows % users else 0)) / (years * 12)
+            for months_back in range(12, -1, -1):
+                month_start = (end.replace(day=1) - timedelta(days=months_back * 30)).replace(day=1, hour=0, minute=0, second=0)
+                # Budget ends are stored as the exclusive bound: the next month's start
+                month_end = (month_start + timedelta(days=32)).replace(day=1)
+                for category, (share, median, _) in EXPENSES.items():
+                    expected = per_month * share * median * LOGNORMAL_MEAN
+                    budgets.append((
+                        user_id, category, max(1000, int(expected * rng.uniform(0.8, 1.3))),
+                        to_db_timestamp(month_start), to_db_timestamp(month_end)
+                    ))
+        conn.executemany(
+            "INSERT INTO budgets (user_id, category, amount, start_date, end_date) VALUES (?, ?, ?, ?, ?)", budgets
+        )
+        conn.executemany(
+            "INSERT INTO savings (user_id, name, target_amount, current_amount, deadline, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (user_id, name, target, rng.randint(0, target), to_db_timestamp(end + timedelta(days=rng.randint(60, 900))),
+                 to_db_timestamp(start + timedelta(days=rng.randint(0, 300))))
+                for user_id in user_ids for name, target in SAVING_GOALS
+            ]
+        )
+    database.get_pool().close()
+
+    return {
+        "path": path,
+        "rows": written,
+        "users": users,
+        "budgets": len(budgets),
+        "savings": users * len(SAVING_GOALS),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic Signance database")
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=100000, help="transactions in total")
+    parser.add_argument("--users", type=int, help="default: one per 100k rows")
+    parser.add_argument("--years", type=int, default=3, help="history length")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    def progress(written, total):
+        print(f"\r{written:,}/{total:,} transactions", end="", file=sys.stderr, flush=True)
+
+    summary = seed_database(args.path, args.rows, args.users, args.years, args.seed, progress)
+    print(file=sys.stderr)
+    print(f"Seeded {summary['rows']:,} transactions for {summary['users']:,} users "
+          f"in {summary['seconds']:.1f}s -> {summary['path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,437 @@
+#src/cli.py
+# Description : Headless command line over the controllers, no Qt or matplotlib
+
+import argparse
+import contextlib
+import getpass
+import json
+import os
+import sys
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from database.database import configure_pool, get_pool, initialize_database
+# Controllers load on first use, so each command imports only what it needs
+import controllers
+from controllers.export_controller import EXPORT_FORMATS, EXPORT_TABLES
+from models.transaction import TransactionType, Category
+from utils.helpers import json_default
+from utils.log import configure_logging, get_logger
+
+logger = get_logger(__name__)
+
+# Where `login` remembers the user; override with --session or SIGNANCE_SESSION
+DEFAULT_SESSION_PATH = Path.home() / ".signance" / "session.json"
+
+
+class CommandError(Exception):
+    """A failure reported as {"error": ...} with exit status 1."""
+
+
+def amount(text):
+    try:
+        value = Decimal(text)
+    except InvalidOperation:
+        raise argparse.ArgumentTypeError(f"invalid amount {text!r}")
+    if value <= 0:
+        raise argparse.ArgumentTypeError("amount must be positive")
+    return value
+
+
+def day(text):
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {text!r}, expected YYYY-MM-DD")
+
+
+def read_password(args):
+    # Never taken from argv, where other users could see it in the process list
+    return os.environ.get("SIGNANCE_PASSWORD") or getpass.getpass("Password: ", stream=sys.stderr)
+
+
+class Session:
+    """The logged-in user, kept in a small JSON file between invocations.
+
+    It records the database it belongs to, so a session for one database
+    file is not reused against another.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return None
+        if data.get("database") != str(get_pool().path):
+            return None
+        return data
+
+    def save(self, user_id, username):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"user_id": user_id, "username": username, "database": str(get_pool().path)}
+        # Readable by the owner only
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as handle:
+            json.dump(data, handle)
+        return data
+
+    def clear(self):
+        with contextlib.suppress(FileNotFoundError):
+            self.path.unlink()
+
+
+def current_user_id(args):
+    data = args.session.load()
+    if data is None:
+        raise CommandError("not logged in; run `signance login` first")
+    return data["user_id"]
+
+
+def owned(record, args, kind):
+    """Return `record` if it belongs to the logged-in user."""
+    if record is None or record.user_id != current_user_id(args):
+        raise CommandError(f"{kind} not found")
+    return record
+
+
+# Users
+
+def register_command(args):
+    success, message = controllers.UserController().register(args.username, args.email, read_password(args))
+    if not success:
+        raise CommandError(message)
+    return {"registered": args.username}
+
+
+def login_command(args):
+    user = controllers.UserController().login(args.username, read_password(args))
+    if user is None:
+        raise CommandError("invalid username or password")
+    return args.session.save(user[0], user[1])
+
+
+def logout_command(args):
+    args.session.clear()
+    return {"logged_out": True}
+
+
+def whoami_command(args):
+    data = args.session.load()
+    if data is None:
+        raise CommandError("not logged in")
+    return data
+
+
+# Transactions
+
+def transactions_list_command(args):
+    filters = {
+        "transaction_type": args.type, "category": args.category,
+        "start": args.start, "end": args.end,
+    }
+    after = None
+    if args.after:
+        # The `next` value of the previous page: ["<date>", <transaction id>]
+        try:
+            after_date, after_id = json.loads(args.after)
+            after = (str(after_date), int(after_id))
+        except (TypeError, ValueError):
+            raise CommandError("invalid --after")
+    transactions, next_cursor = controllers.TransactionController().list_transactions(
+        current_user_id(args), after=after, limit=args.limit, filters=filters
+    )
+    return {
+        "transactions": transactions,
+        "next": json.dumps(list(next_cursor)) if next_cursor else None,
+    }
+
+
+def transactions_add_command(args):
+    controller = controllers.TransactionController()
+    transaction_id = controller.create_transaction(
+        current_user_id(args), args.amount, args.category, args.type, args.description,
+        skip_duplicates=args.skip_duplicates
+    )
+    if transaction_id is None:
+        raise CommandError("transaction not created" + (" (duplicate)" if args.skip_duplicates else ""))
+    return controller.get_transaction_by_id(transaction_id)
+
+
+def transactions_update_command(args):
+    controller = controllers.TransactionController()
+    current = owned(controller.get_transaction_by_id(args.id), args, "transaction")
+    controller.update_transaction(
+        args.id,
+        args.amount if args.amount is not None else current.amount,
+        args.category or current.category,
+        args.type or current.transaction_type.value,
+        args.description if args.description is not None else current.description,
+    )
+    return controller.get_transaction_by_id(args.id)
+
+
+def transactions_delete_command(args):
+    controller = controllers.TransactionController()
+    owned(controller.get_transaction_by_id(args.id), args, "transaction")
+    controller.delete_transaction(args.id)
+    return {"deleted": args.id}
+
+
+# Budgets
+
+def budgets_list_command(args):
+    controller = controllers.BudgetController()
+    user_id = current_user_id(args)
+    return controller.get_active_budgets(user_id) if args.active else controller.get_all_budgets(user_id)
+
+
+def budgets_add_command(args):
+    budget = controllers.BudgetController().create_budget(current_user_id(args), args.category, args.amount, args.start, args.end)
+    if budget is None:
+        raise CommandError("budget not created")
+    return budget
+
+
+def budgets_update_command(args):
+    controller = controllers.BudgetController()
+    owned(controller.get_budget_by_id(args.id), args, "budget")
+    success, message = controller.update_budget(args.id, args.amount, args.start, args.end)
+    if not success:
+        raise CommandError(message)
+    return controller.get_budget_by_id(args.id)
+
+
+def budgets_delete_command(args):
+    controller = controllers.BudgetController()
+    owned(controller.get_budget_by_id(args.id), args, "budget")
+    success, message = controller.delete_budget(args.id)
+    if not success:
+        raise CommandError(message)
+    return {"deleted": args.id}
+
+
+# Savings
+
+def savings_list_command(args):
+    return controllers.SavingsController().get_all_savings(current_user_id(args))
+
+
+def savings_add_command(args):
+    saving = controllers.SavingsController().create_saving(current_user_id(args), args.name, args.target, args.deadline)
+    if saving is None:
+        raise CommandError("saving goal not created")
+    return saving
+
+
+def savings_update_command(args):
+    controller = controllers.SavingsController()
+    owned(controller.get_saving_by_id(args.id), args, "saving goal")
+    controller.update_saving(args.id, args.name, args.target, args.deadline)
+    if args.current is not None:
+        controller.update_current_amount(args.id, args.current)
+    return controller.get_saving_by_id(args.id)
+
+
+def savings_delete_command(args):
+    controller = controllers.SavingsController()
+    owned(controller.get_saving_by_id(args.id), args, "saving goal")
+    controller.delete_saving(args.id)
+    return {"deleted": args.id}
+
+
+# Bulk data and reports
+
+def import_command(args):
+    report = controllers.ImportController().import_file(
+        current_user_id(args), args.file, file_format=args.format,
+        skip_duplicates=not args.allow_duplicates, fuzzy_days=args.fuzzy_days
+    )
+    # Nothing imported or recognised as a duplicate: the file was not read
+    if report.failed and not report.imported and not report.skipped:
+        raise CommandError(f"import failed: {report.errors[0] if report.errors else report.failed}")
+    return report.to_dict()
+
+
+def export_command(args):
+    report = controllers.ExportController().export(
+        current_user_id(args), args.table, args.output, file_format=args.format,
+        start=args.start, end=args.end, category=args.category
+    )
+    if report.error:
+        raise CommandError(report.error)
+    return report.to_dict()
+
+
+def report_command(args):
+    user_id = current_user_id(args)
+    if args.kind == "dashboard":
+        snapshot = controllers.DashboardService().snapshot(user_id, args.end)
+        if snapshot is None:
+            raise CommandError("dashboard snapshot failed")
+        return {
+            "as_of": snapshot.as_of,
+            "months": snapshot.months,
+            "monthly_spending": snapshot.monthly_spending,
+            "monthly_income": snapshot.monthly_income,
+            "category_spending": dict(snapshot.category_spending),
+            "category_budgets": dict(snapshot.category_budgets),
+        }
+    # Whole months by default, which aggregate() answers from monthly_rollups
+    end = args.end or date(date.today().year, 12, 31)
+    start = args.start or date(end.year, 1, 1)
+    result = controllers.TransactionController().aggregate(
+        user_id, start, end, bucket=args.bucket, group_by=args.group_by, transaction_type=args.type
+    )
+    # Group keys are tuples; join them so they can be JSON object keys
+    return {
+        bucket: {"/".join(group) or "total": total for group, total in groups.items()}
+        for bucket, groups in result.items()
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="signance", description="Signance without the GUI; prints JSON")
+    parser.add_argument("--database", help="SQLite file to use instead of the default database")
+    parser.add_argument(
+        "--session", default=os.environ.get("SIGNANCE_SESSION", DEFAULT_SESSION_PATH),
+        help="session file written by login (default: %(default)s)"
+    )
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    types = [t.value for t in TransactionType]
+    categories = [c.value for c in Category]
+
+    register = commands.add_parser("register", help="create an account (password from SIGNANCE_PASSWORD or prompt)")
+    register.add_argument("username")
+    register.add_argument("email")
+    register.set_defaults(handler=register_command)
+
+    login = commands.add_parser("login", help="log in (password from SIGNANCE_PASSWORD or prompt)")
+    login.add_argument("username", help="username or email")
+    login.set_defaults(handler=login_command)
+
+    commands.add_parser("logout", help="forget the session").set_defaults(handler=logout_command)
+    commands.add_parser("whoami", help="show the logged-in user").set_defaults(handler=whoami_command)
+
+    transactions = commands.add_parser("transactions", help="list and edit transactions")
+    actions = transactions.add_subparsers(dest="action", required=True, metavar="action")
+    listing = actions.add_parser("list", help="one page, newest first")
+    listing.add_argument("--limit", type=int, default=50)
+    listing.add_argument("--after", help="the 'next' value of the previous page")
+    listing.add_argument("--type", choices=types)
+    listing.add_argument("--category", choices=categories)
+    listing.add_argument("--start", type=day)
+    listing.add_argument("--end", type=day)
+    listing.set_defaults(handler=transactions_list_command)
+    add = actions.add_parser("add")
+    add.add_argument("amount", type=amount)
+    add.add_argument("category", choices=categories)
+    add.add_argument("type", choices=types)
+    add.add_argument("--description")
+    add.add_argument("--skip-duplicates", action="store_true", help="do nothing if the same transaction exists today")
+    add.set_defaults(handler=transactions_add_command)
+    update = actions.add_parser("update")
+    update.add_argument("id", type=int)
+    update.add_argument("--amount", type=amount)
+    update.add_argument("--category", choices=categories)
+    update.add_argument("--type", choices=types)
+    update.add_argument("--description")
+    update.set_defaults(handler=transactions_update_command)
+    delete = actions.add_parser("delete")
+    delete.add_argument("id", type=int)
+    delete.set_defaults(handler=transactions_delete_command)
+
+    budgets = commands.add_parser("budgets", help="list and edit budgets")
+    actions = budgets.add_subparsers(dest="action", required=True, metavar="action")
+    listing = actions.add_parser("list")
+    listing.add_argument("--active", action="store_true", help="only budgets covering today")
+    listing.set_defaults(handler=budgets_list_command)
+    add = actions.add_parser("add")
+    add.add_argument("category", choices=categories)
+    add.add_argument("amount", type=amount)
+    add.add_argument("start", type=day)
+    add.add_argument("end", type=day)
+    add.set_defaults(handler=budgets_add_command)
+    update = actions.add_parser("update")
+    update.add_argument("id", type=int)
+    update.add_argument("--amount", type=amount)
+    update.add_argument("--start", type=day)
+    update.add_argument("--end", type=day)
+    update.set_defaults(handler=budgets_update_command)
+    delete = actions.add_parser("delete")
+    delete.add_argument("id", type=int)
+    delete.set_defaults(handler=budgets_delete_command)
+
+    savings = commands.add_parser("savings", help="list and edit saving goals")
+    actions = savings.add_subparsers(dest="action", required=True, metavar="action")
+    actions.add_parser("list").set_defaults(handler=savings_list_command)
+    add = actions.add_parser("add")
+    add.add_argument("name")
+    add.add_argument("target", type=amount)
+    add.add_argument("deadline", type=day)
+    add.set_defaults(handler=savings_add_command)
+    update = actions.add_parser("update")
+    update.add_argument("id", type=int)
+    update.add_argument("--name")
+    update.add_argument("--target", type=amount)
+    update.add_argument("--deadline", type=day)
+    update.add_argument("--current", type=Decimal, help="amount saved so far")
+    update.set_defaults(handler=savings_update_command)
+    delete = actions.add_parser("delete")
+    delete.add_argument("id", type=int)
+    delete.set_defaults(handler=savings_delete_command)
+
+    imports = commands.add_parser("import", help="import a CSV/OFX/QIF bank export")
+    imports.add_argument("file")
+    imports.add_argument("--format", choices=["csv", "ofx", "qfx", "qif"])
+    imports.add_argument("--allow-duplicates", action="store_true", help="import rows that are already stored")
+    imports.add_argument("--fuzzy-days", type=int, help="also skip near-duplicates up to this many days apart")
+    imports.set_defaults(handler=import_command)
+
+    export = commands.add_parser("export", help="stream data to CSV, JSONL or .npz")
+    export.add_argument("table", choices=sorted(EXPORT_TABLES))
+    export.add_argument("output", help="file to write; the extension picks the format")
+    export.add_argument("--format", choices=EXPORT_FORMATS)
+    export.add_argument("--start", type=day, help="first day")
+    export.add_argument("--end", type=day, help="last day (inclusive)")
+    export.add_argument("--category", choices=categories)
+    export.set_defaults(handler=export_command)
+
+    report = commands.add_parser("report", help="aggregate totals or the dashboard figures")
+    report.add_argument("kind", nargs="?", choices=["totals", "dashboard"], default="totals")
+    report.add_argument("--start", type=day, help="first day (default: 1 January of the end year)")
+    report.add_argument("--end", type=day, help="last day (default: 31 December this year)")
+    report.add_argument("--bucket", choices=["day", "week", "month", "year"], default="month")
+    report.add_argument("--group-by", nargs="*", choices=["type", "category"], default=["type"])
+    report.add_argument("--type", choices=types)
+    report.set_defaults(handler=report_command)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.database:
+        configure_pool(path=args.database)
+    args.session = Session(args.session)
+    # Diagnostics go to the log file and stderr; stdout is only the JSON result
+    configure_logging()
+    try:
+        initialize_database()
+        result = args.handler(args)
+        status = 0
+    except CommandError as e:
+        result, status = {"error": str(e)}, 1
+    except Exception as e:
+        # Anything else still answers in JSON; the traceback goes to the log
+        logger.exception("Command %s failed", args.command)
+        result, status = {"error": f"unexpected error: {e}"}, 1
+    json.dump(result, sys.stdout, default=json_default)
+    sys.stdout.write("\n")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
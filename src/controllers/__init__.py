@@ -1,10 +1,33 @@
 # src/controllers/__init__.py
 # Description : Module initialization
 
-from .user_controller import UserController
-# (delete the '#' after you have implemented the controllers)
-from .transaction_controller import TransactionController
-from .budget_controller import BudgetController
-from .saving_controller import SavingsController
+import importlib
 
-__all__ = ['UserController', 'TransactionController', 'BudgetController', 'SavingController']
\ No newline at end of file
+# Controllers are imported on first access (PEP 562), so the command line
+# only loads the controllers a command actually uses
+_CONTROLLER_MODULES = {
+    'UserController': '.user_controller',
+    'TransactionController': '.transaction_controller',
+    'BudgetController': '.budget_controller',
+    'SavingsController': '.saving_controller',
+    'DashboardService': '.dashboard_service',
+    'DashboardSnapshot': '.dashboard_service',
+    'ImportController': '.import_controller',
+    'ImportReport': '.import_controller',
+    'DuplicateDetector': '.duplicates',
+    'DuplicateMatch': '.duplicates',
+    'ExportController': '.export_controller',
+    'ExportReport': '.export_controller',
+    'QueryCache': '.cache',
+    'query_cache': '.cache',
+}
+
+def __getattr__(name):
+    module = _CONTROLLER_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+__all__ = list(_CONTROLLER_MODULES)
@@ -1,66 +1,115 @@
 # src/controllers/budget_controller.py
 
+from datetime import date
 from decimal import Decimal
-from datetime import datetime
 from models.budget import Budget, Category
-from database.database import get_connection
+from database.database import connection, transaction
+from .cache import query_cache, cached_read
+from database.money import to_minor_units, from_minor_units
+from database.dates import to_db_timestamp, from_db_timestamp, to_db_end_date, from_db_end_date
+from utils.tracing import trace_methods
+from utils.log import get_logger
 
+logger = get_logger(__name__)
+
+
+@trace_methods("controller")
 class BudgetController:
-    def update_budget(self, budget_id, amount=None, start_date=None, end_date=None):
-        conn = get_connection()
-        cur = conn.cursor()
+    def create_budget(self, user_id, category, amount, start_date, end_date):
         try:
-            cur.execute("SELECT * FROM budgets WHERE budget_id = ?", (budget_id,))
-            current = cur.fetchone()
-            if not current:
+            category = Category(getattr(category, "value", category))
+            amount_minor = to_minor_units(amount)
+            stored_start = to_db_timestamp(start_date)
+            # Stored as the exclusive bound, so the whole last day counts
+            stored_end = to_db_end_date(end_date)
+            with transaction() as conn:
+                budget_id = conn.execute(
+                    """INSERT INTO budgets (user_id, category, amount, start_date, end_date)
+                       VALUES (?, ?, ?, ?, ?)
+                       RETURNING budget_id""",
+                    (user_id, category.value, amount_minor, stored_start, stored_end)
+                ).fetchone()[0]
+            query_cache.bump(user_id)
+            return Budget(
+                user_id=user_id,
+                category=category,
+                amount=from_minor_units(amount_minor),
+                start_date=from_db_timestamp(stored_start),
+                end_date=from_db_end_date(stored_end),
+                budget_id=budget_id
+            )
+        except Exception as e:
+            logger.error("Error creating budget: %s", e)
+            return None
+
+    def delete_budget(self, budget_id):
+        try:
+            with transaction() as conn:
+                row = conn.execute("DELETE FROM budgets WHERE budget_id = ? RETURNING user_id", (budget_id,)).fetchone()
+            if not row:
                 return False, "Budget not found"
+            query_cache.bump(row[0])
+            return True, "Budget deleted successfully"
+        except Exception as e:
+            logger.error("Error deleting budget: %s", e)
+            return False, "Failed to delete budget"
+
+    def update_budget(self, budget_id, amount=None, start_date=None, end_date=None):
+        try:
+            with transaction() as conn:
+                cur = conn.execute("SELECT * FROM budgets WHERE budget_id = ?", (budget_id,))
+                current = cur.fetchone()
+                if not current:
+                    return False, "Budget not found"
 
-            new_amount = float(amount) if amount is not None else current[3]
-            new_start_date = start_date if start_date is not None else current[4]
-            new_end_date = end_date if end_date is not None else current[5]
+                new_amount = to_minor_units(amount) if amount is not None else current[3]
+                new_start_date = to_db_timestamp(start_date) if start_date is not None else current[4]
+                new_end_date = to_db_end_date(end_date) if end_date is not None else current[5]
 
-            cur.execute(
-                """UPDATE budgets 
-                   SET amount = ?, start_date = ?, end_date = ?
-                   WHERE budget_id = ?""",
-                (new_amount, new_start_date, new_end_date, budget_id)
-            )
-            conn.commit()
+                conn.execute(
+                    """UPDATE budgets 
+                       SET amount = ?, start_date = ?, end_date = ?
+                       WHERE budget_id = ?""",
+                    (new_amount, new_start_date, new_end_date, budget_id)
+                )
+            query_cache.bump(current[1])
             return True, "Budget updated successfully"
         except Exception as e:
-            print(f"Error updating budget: {e}")
+            logger.error("Error updating budget: %s", e)
             return False, "Failed to update budget"
-        finally:
-            cur.close()
-            conn.close()
 
     def get_budget_by_id(self, budget_id):
-        conn = get_connection()
-        cur = conn.cursor()
         try:
-            cur.execute("SELECT * FROM budgets WHERE budget_id = ?", (budget_id,))
-            row = cur.fetchone()
-            if row:
-                return Budget(
-                    user_id=row[1],
-                    category=Category(row[2]),
-                    amount=Decimal(str(row[3])),
-                    start_date=row[4],
-                    end_date=row[5],
-                    budget_id=row[0]
-                )
-            return None
+            with connection() as conn:
+                cur = conn.cursor()
+                cur.execute("SELECT * FROM budgets WHERE budget_id = ?", (budget_id,))
+                row = cur.fetchone()
+                if row:
+                    return Budget(
+                        user_id=row[1],
+                        category=Category(row[2]),
+                        amount=from_minor_units(row[3]),
+                        start_date=from_db_timestamp(row[4]),
+                        end_date=from_db_end_date(row[5]),
+                        budget_id=row[0]
+                    )
+                return None
         except Exception as e:
-            print(f"Error fetching budget: {e}")
+            logger.error("Error fetching budget: %s", e)
             return None
-        finally:
-            cur.close()
-            conn.close()
 
     def get_all_budgets(self, user_id):
-        conn = get_connection()
-        cur = conn.cursor()
         try:
+            return self._all_budgets(user_id)
+        except Exception as e:
+            # Raised through the cache, so a failed read is never cached
+            logger.error("Error fetching budgets: %s", e)
+            return []
+
+    @cached_read
+    def _all_budgets(self, user_id):
+        with connection() as conn:
+            cur = conn.cursor()
             cur.execute("""
                 SELECT * FROM budgets 
                 WHERE user_id = ? 
@@ -71,44 +120,42 @@ class BudgetController:
             budgets = [Budget(
                 user_id=row[1],
                 category=Category(row[2]),
-                amount=Decimal(str(row[3])),
-                start_date=row[4],
-                end_date=row[5],
+                amount=from_minor_units(row[3]),
+                start_date=from_db_timestamp(row[4]),
+                end_date=from_db_end_date(row[5]),
                 budget_id=row[0]
             ) for row in rows]
             return budgets
+
+    def get_active_budgets(self, user_id, on=None):
+        """Budgets whose period includes the day `on` (default today)."""
+        # Resolved before the cached call so the cache key names the day
+        try:
+            return self._active_budgets(user_id, on or date.today())
         except Exception as e:
-            print(f"Error fetching budgets: {e}")
+            logger.error("Error fetching active budgets: %s", e)
             return []
-        finally:
-            cur.close()
-            conn.close()
 
-    def get_active_budgets(self, user_id):
-        conn = get_connection()
-        cur = conn.cursor()
-        try:
-            current_date = datetime.now().strftime("%Y-%m-%d")
+    @cached_read
+    def _active_budgets(self, user_id, on):
+        with connection() as conn:
+            cur = conn.cursor()
+            # Periods are whole local days, so the day's start decides
+            current_date = to_db_timestamp(on)
             cur.execute("""
                 SELECT * FROM budgets 
                 WHERE user_id = ? 
                 AND start_date <= ? 
-                AND end_date >= ?
+                AND end_date > ?
                 ORDER BY category
             """, (user_id, current_date, current_date))
-            
+        
             rows = cur.fetchall()
             return [Budget(
                 user_id=row[1],
                 category=Category(row[2]),
-                amount=Decimal(str(row[3])),
-                start_date=row[4],
-                end_date=row[5],
+                amount=from_minor_units(row[3]),
+                start_date=from_db_timestamp(row[4]),
+                end_date=from_db_end_date(row[5]),
                 budget_id=row[0]
-            ) for row in rows]
-        except Exception as e:
-            print(f"Error fetching active budgets: {e}")
-            return []
-        finally:
-            cur.close()
-            conn.close()
\ No newline at end of file
+            ) for row in rows]
\ No newline at end of file
@@ -0,0 +1,107 @@
+# src/controllers/cache.py
+# Description : In-process cache for controller read methods
+
+import copy
+import functools
+import threading
+from collections import OrderedDict
+
+
+class QueryCache:
+    """LRU cache of controller read results, invalidated by per-user versions.
+
+    Every user has a data-version counter. Reads are cached under the version
+    that was current when they started, and write methods bump the version,
+    which drops that user's entries. A read racing with a write therefore can
+    only ever store its result under the old version, where nobody looks.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.enabled = True
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._versions = {}
+        self._lock = threading.RLock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def version(self, user_id):
+        with self._lock:
+            return self._versions.get(user_id, 0)
+
+    def bump(self, user_id):
+        """Mark a user's data as changed and drop their cached entries."""
+        with self._lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            for key in self._keys_by_user.pop(user_id, ()):
+                if self._entries.pop(key, None) is not None:
+                    self._stats["invalidations"] += 1
+
+    def get_or_compute(self, user_id, method, args, compute):
+        """Return the cached result for (user_id, method, args) or compute it."""
+        if not self.enabled:
+            return compute()
+
+        with self._lock:
+            key = (user_id, self._versions.get(user_id, 0), method, args)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return copy.deepcopy(self._entries[key])
+            self._stats["misses"] += 1
+
+        # Run the query without holding the lock
+        result = compute()
+
+        with self._lock:
+            self._entries[key] = copy.deepcopy(result)
+            self._entries.move_to_end(key)
+            self._keys_by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                old_key, _ = self._entries.popitem(last=False)
+                keys = self._keys_by_user.get(old_key[0])
+                if keys is not None:
+                    keys.discard(old_key)
+                self._stats["evictions"] += 1
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+            stats["max_entries"] = self.max_entries
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+# Shared by every controller instance in the process
+query_cache = QueryCache()
+
+
+def _freeze(value):
+    """Turn lists, sets and dicts into hashable equivalents for cache keys."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+def cached_read(method):
+    """Cache a controller read method whose first argument is the user_id."""
+    @functools.wraps(method)
+    def wrapper(self, user_id, *args, **kwargs):
+        name = f"{type(self).__name__}.{method.__name__}"
+        key_args = (_freeze(args), _freeze(kwargs))
+        return query_cache.get_or_compute(
+            user_id, name, key_args, lambda: method(self, user_id, *args, **kwargs)
+        )
+    return wrapper
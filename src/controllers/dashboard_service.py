@@ -0,0 +1,99 @@
+# src/controllers/dashboard_service.py
+# Description : Every dashboard figure from one consistent read
+
+from dataclasses import dataclass
+from datetime import date
+from models.transaction import TransactionType, Category
+from database.database import transaction
+from database.money import from_minor_units
+from database.dates import shift_month, to_db_timestamp
+from .cache import cached_read
+from utils.tracing import trace_methods
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# Months shown on the dashboard chart, ending with the as_of month
+CHART_MONTHS = 6
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Immutable dashboard figures for one user and calendar month.
+
+    All sequences are tuples so two snapshots compare (and cache) by value;
+    widgets compare the parts they render to skip redraws.
+    """
+    user_id: int
+    as_of: date
+    # 'YYYY-MM' keys of the chart months, oldest first
+    months: tuple
+    monthly_spending: tuple
+    monthly_income: tuple
+    # ((category value, amount), ...) in Category order, for the as_of month
+    category_spending: tuple
+    # Only categories that have a budget
+    category_budgets: tuple
+
+    @property
+    def total_spending(self):
+        """Expense total of the as_of month"""
+        return self.monthly_spending[-1]
+
+
+@trace_methods("controller")
+class DashboardService:
+    def snapshot(self, user_id, as_of=None):
+        """Return the DashboardSnapshot for the calendar month containing `as_of` (default today)."""
+        # Resolve the default first so the cache key names the actual month
+        try:
+            return self._snapshot(user_id, as_of or date.today())
+        except Exception as e:
+            # Raised through the cache, so a failed read is never cached
+            logger.error("Error loading dashboard snapshot: %s", e)
+            return None
+
+    @cached_read
+    def _snapshot(self, user_id, as_of):
+        first_year, first_month = shift_month(as_of.year, as_of.month, -(CHART_MONTHS - 1))
+        months = tuple(
+            "{:04d}-{:02d}".format(*shift_month(first_year, first_month, i))
+            for i in range(CHART_MONTHS)
+        )
+        current = months[-1]
+
+        totals = {(month, t.value): 0 for month in months for t in TransactionType}
+        category_totals = {c.value: 0 for c in Category}
+        budgets = {}
+        # Budgets covering the as_of day, like BudgetController.get_active_budgets
+        day = to_db_timestamp(as_of)
+        # One read transaction, so the rollups and budgets are from the same moment
+        with transaction() as conn:
+            rows = conn.execute("""
+                SELECT year_month, transaction_type, category, total
+                FROM monthly_rollups
+                WHERE user_id = ? AND year_month BETWEEN ? AND ?
+            """, (user_id, months[0], current)).fetchall()
+            # If periods overlap, the most recently started budget wins
+            budget_rows = conn.execute("""
+                SELECT category, amount FROM budgets
+                WHERE user_id = ? AND start_date <= ? AND end_date > ?
+                ORDER BY category, start_date
+            """, (user_id, day, day)).fetchall()
+
+        for year_month, transaction_type, category, total in rows:
+            totals[(year_month, transaction_type)] += total
+            if year_month == current and transaction_type == TransactionType.EXPENSE.value and category in category_totals:
+                category_totals[category] += total
+        for category, amount in budget_rows:
+            budgets[category] = amount
+
+        return DashboardSnapshot(
+            user_id=user_id,
+            as_of=as_of,
+            months=months,
+            monthly_spending=tuple(from_minor_units(totals[(month, TransactionType.EXPENSE.value)]) for month in months),
+            monthly_income=tuple(from_minor_units(totals[(month, TransactionType.INCOME.value)]) for month in months),
+            category_spending=tuple((category, from_minor_units(total)) for category, total in category_totals.items()),
+            category_budgets=tuple((category, from_minor_units(amount)) for category, amount in budgets.items()),
+        )
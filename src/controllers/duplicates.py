@@ -0,0 +1,142 @@
+# src/controllers/duplicates.py
+# Description : Bulk duplicate checks against transaction fingerprints
+
+from datetime import timedelta
+from difflib import SequenceMatcher
+from functools import lru_cache
+from database.dates import from_db_timestamp, to_db_timestamp
+from database.fingerprints import normalize_description
+
+# Descriptions at least this similar (0..1) count as the same payment in fuzzy mode
+FUZZY_DESCRIPTION_RATIO = 0.8
+
+# Column positions in the INSERT parameter tuples the detector is given:
+# (user_id, amount, category, transaction_type, description, date, fingerprint)
+AMOUNT, TRANSACTION_TYPE, DESCRIPTION, DATE, FINGERPRINT = 1, 3, 4, 5, 6
+
+CREATE_CANDIDATES = """
+    CREATE TEMP TABLE IF NOT EXISTS duplicate_candidates (
+        position INTEGER PRIMARY KEY,
+        fingerprint INTEGER NOT NULL,
+        amount INTEGER NOT NULL,
+        transaction_type TEXT NOT NULL,
+        date_from TEXT NOT NULL,
+        date_to TEXT NOT NULL
+    )
+"""
+
+EXACT_MATCHES = """
+    SELECT c.position, t.transaction_id
+    FROM duplicate_candidates c
+    JOIN transactions t ON t.user_id = ? AND t.fingerprint = c.fingerprint
+    WHERE t.transaction_id <= ?
+    ORDER BY c.position, t.transaction_id
+"""
+
+FUZZY_MATCHES = """
+    SELECT c.position, t.transaction_id, t.description
+    FROM duplicate_candidates c
+    JOIN transactions t ON t.user_id = ? AND t.date >= c.date_from AND t.date < c.date_to
+        AND t.amount = c.amount AND t.transaction_type = c.transaction_type
+    WHERE t.transaction_id <= ?
+    ORDER BY c.position, t.date, t.transaction_id
+"""
+
+
+class DuplicateMatch:
+    """An incoming row that matched a stored transaction."""
+
+    def __init__(self, row, transaction_id, fuzzy=False):
+        self.row = row
+        self.transaction_id = transaction_id
+        self.fuzzy = fuzzy
+
+    def __str__(self):
+        amount = self.row[AMOUNT] / 100
+        sign = "-" if self.row[TRANSACTION_TYPE] == "expense" else ""
+        kind = "near-duplicate" if self.fuzzy else "duplicate"
+        return (
+            f"{from_db_timestamp(self.row[DATE]):%Y-%m-%d} {sign}{amount:.2f} "
+            f"{self.row[DESCRIPTION] or ''!r}: {kind} of transaction {self.transaction_id}"
+        )
+
+
+class DuplicateDetector:
+    """Finds incoming rows that are already stored, a whole batch at a time.
+
+    The batch is written to a temp table and joined against the indexed
+    transactions.fingerprint column, so the cost is one query per batch
+    rather than one per row. Only rows that existed when the detector first
+    ran are compared, and each stored row absorbs at most one incoming row:
+    a statement that really has two identical coffees on one day imports
+    the second one if only the first was stored before.
+
+    With `fuzzy_days` set, rows without an exact match are also compared
+    with stored rows of the same amount and type up to that many days
+    apart whose descriptions are similar (numbers ignored).
+    """
+
+    def __init__(self, user_id, fuzzy_days=None):
+        self.user_id = user_id
+        self.fuzzy_days = fuzzy_days
+        self.ceiling = None
+        self.used = set()
+
+    def find(self, conn, rows):
+        """Return {index in rows: DuplicateMatch} for the duplicates in `rows`.
+
+        `conn` should be inside the write transaction that inserts the rest,
+        so nothing can slip in between the check and the insert.
+        """
+        if not rows:
+            return {}
+        if self.ceiling is None:
+            self.ceiling = conn.execute(
+                "SELECT COALESCE(MAX(transaction_id), 0) FROM transactions"
+            ).fetchone()[0]
+
+        conn.execute(CREATE_CANDIDATES)
+        conn.execute("DELETE FROM duplicate_candidates")
+        conn.executemany(
+            "INSERT INTO duplicate_candidates VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (position, row[FINGERPRINT], row[AMOUNT], row[TRANSACTION_TYPE]) + self._window(row)
+                for position, row in enumerate(rows)
+            )
+        )
+        try:
+            matches = {}
+            for position, transaction_id in conn.execute(EXACT_MATCHES, (self.user_id, self.ceiling)):
+                if position not in matches and transaction_id not in self.used:
+                    self.used.add(transaction_id)
+                    matches[position] = DuplicateMatch(rows[position], transaction_id)
+            if self.fuzzy_days is not None and len(matches) < len(rows):
+                self._match_fuzzy(conn, rows, matches)
+            return matches
+        finally:
+            conn.execute("DELETE FROM duplicate_candidates")
+
+    def _match_fuzzy(self, conn, rows, matches):
+        keys = {}
+        for position, transaction_id, description in conn.execute(FUZZY_MATCHES, (self.user_id, self.ceiling)):
+            if position in matches or transaction_id in self.used:
+                continue
+            if position not in keys:
+                keys[position] = normalize_description(rows[position][DESCRIPTION], digits=False)
+            stored = normalize_description(description, digits=False)
+            if keys[position] == stored or SequenceMatcher(None, keys[position], stored).ratio() >= FUZZY_DESCRIPTION_RATIO:
+                self.used.add(transaction_id)
+                matches[position] = DuplicateMatch(rows[position], transaction_id, fuzzy=True)
+
+    def _window(self, row):
+        """UTC bounds of the local days a fuzzy match may fall on."""
+        if self.fuzzy_days is None:
+            # Only the fuzzy join reads the window
+            return row[DATE], row[DATE]
+        return _date_window(row[DATE], self.fuzzy_days)
+
+
+@lru_cache(maxsize=4096)
+def _date_window(stored_date, days):
+    day = from_db_timestamp(stored_date).date()
+    return to_db_timestamp(day - timedelta(days=days)), to_db_timestamp(day + timedelta(days=days + 1))
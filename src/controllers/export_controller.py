@@ -0,0 +1,260 @@
+# src/controllers/export_controller.py
+# Description : Streaming export of a user's data to CSV, JSONL or NumPy .npz
+
+import csv
+import json
+import os
+import time
+from database.database import transaction
+from database.dates import period_range, to_db_timestamp, from_db_end_date
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+EXPORT_FORMATS = ("csv", "jsonl", "npz")
+DEFAULT_FETCH_SIZE = 1000
+
+
+class ExportTable:
+    """What to select for one exportable table.
+
+    `columns` are (name, kind) pairs where kind is 'int', 'money' (stored
+    minor units), 'text', 'timestamp' (stored UTC) or 'end_date' (a stored
+    exclusive end bound, exported as the last included day). `date_column` and
+    `category_column` are the columns the start/end and category filters
+    apply to.
+    """
+
+    def __init__(self, name, columns, date_column, category_column=None, order_by=None):
+        self.name = name
+        self.columns = columns
+        self.date_column = date_column
+        self.category_column = category_column
+        self.order_by = order_by or date_column
+
+
+EXPORT_TABLES = {
+    "transactions": ExportTable("transactions", [
+        ("transaction_id", "int"), ("date", "timestamp"), ("transaction_type", "text"),
+        ("category", "text"), ("amount", "money"), ("description", "text"),
+    ], date_column="date", category_column="category", order_by="date, transaction_id"),
+    "budgets": ExportTable("budgets", [
+        ("budget_id", "int"), ("category", "text"), ("amount", "money"),
+        ("start_date", "timestamp"), ("end_date", "end_date"),
+    ], date_column="start_date", category_column="category", order_by="start_date, budget_id"),
+    "savings": ExportTable("savings", [
+        ("saving_id", "int"), ("name", "text"), ("target_amount", "money"),
+        ("current_amount", "money"), ("deadline", "timestamp"), ("created_at", "timestamp"),
+    ], date_column="deadline", order_by="deadline, saving_id"),
+}
+
+
+def format_money(minor_units):
+    """'12.34' from 1234 minor units, without going through Decimal."""
+    if minor_units is None:
+        return None
+    sign = "-" if minor_units < 0 else ""
+    whole, cents = divmod(abs(minor_units), 100)
+    return f"{sign}{whole}.{cents:02d}"
+
+
+def format_timestamp(value):
+    """ISO 8601 UTC ('2024-01-31T23:00:00Z') from a stored timestamp."""
+    return None if value is None else value[:19].replace(" ", "T") + "Z"
+
+
+def last_included_day(value):
+    """Stored form of the last day before an exclusive end bound, as the controllers report it."""
+    return None if value is None else to_db_timestamp(from_db_end_date(value))
+
+
+def format_end_date(value):
+    return format_timestamp(last_included_day(value))
+
+
+_FORMATTERS = {
+    "int": None,
+    "text": None,
+    "money": format_money,
+    "timestamp": format_timestamp,
+    "end_date": format_end_date,
+}
+
+
+class ExportReport:
+    """Outcome of one export run."""
+
+    def __init__(self, path, table, file_format):
+        self.path = path
+        self.table = table
+        self.file_format = file_format
+        self.rows = 0
+        self.elapsed = 0.0
+        self.error = None
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self):
+        return {
+            'path': self.path,
+            'table': self.table,
+            'format': self.file_format,
+            'rows': self.rows,
+            'elapsed': self.elapsed,
+            'rows_per_second': self.rows_per_second,
+            'error': self.error,
+        }
+
+
+class ExportController:
+    def export(self, user_id, table, path, file_format=None, start=None, end=None, category=None,
+               fetch_size=DEFAULT_FETCH_SIZE, progress=None):
+        """Write a user's `table` ('transactions', 'budgets' or 'savings') to `path`.
+
+        Rows are pulled from the cursor `fetch_size` at a time and formatted
+        straight from the tuples, so memory stays flat however long the
+        history is. `file_format` defaults to the file extension. `start` and
+        `end` are local dates or datetimes as in list_transactions();
+        `category` only applies to transactions and budgets.
+        `progress(report)` is called after each chunk. The file is written
+        under a temporary name and only appears once it is complete.
+        """
+        spec = EXPORT_TABLES.get(table)
+        if spec is None:
+            raise ValueError(f"Unknown table {table!r}")
+        file_format = (file_format or os.path.splitext(path)[1].lstrip(".")).lower()
+        if file_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format {file_format!r}")
+        if category is not None and spec.category_column is None:
+            raise ValueError(f"{table} cannot be filtered by category")
+
+        report = ExportReport(path, table, file_format)
+        started = time.perf_counter()
+        where, params = self._filters(spec, user_id, start, end, category)
+        columns = ", ".join(name for name, _ in spec.columns)
+        partial = f"{path}.part"
+        try:
+            # One read transaction: the row count and the rows come from the same snapshot
+            with transaction() as conn:
+                cursor = conn.execute(
+                    f"SELECT {columns} FROM {spec.name} WHERE {where} ORDER BY {spec.order_by}", params
+                )
+                if file_format == "npz":
+                    self._write_npz(conn, cursor, spec, where, params, partial, fetch_size, report, started, progress)
+                else:
+                    writer = self._write_csv if file_format == "csv" else self._write_jsonl
+                    writer(cursor, spec, partial, fetch_size, report, started, progress)
+            os.replace(partial, path)
+        except Exception as e:
+            logger.error("Error exporting %s: %s", table, e)
+            report.error = str(e)
+            if os.path.exists(partial):
+                os.remove(partial)
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def _filters(self, spec, user_id, start, end, category):
+        conditions = ["user_id = ?"]
+        params = [user_id]
+        if start:
+            conditions.append(f"{spec.date_column} >= ?")
+            params.append(period_range(start, start)[0])
+        if end:
+            conditions.append(f"{spec.date_column} < ?")
+            params.append(period_range(end, end)[1])
+        if category:
+            conditions.append(f"{spec.category_column} = ?")
+            params.append(getattr(category, "value", category))
+        return " AND ".join(conditions), params
+
+    def _chunks(self, cursor, fetch_size, report, started, progress):
+        """Yield lists of rows from `cursor`, counting them into `report`."""
+        while True:
+            rows = cursor.fetchmany(fetch_size)
+            if not rows:
+                return
+            yield rows
+            report.rows += len(rows)
+            report.elapsed = time.perf_counter() - started
+            if progress is not None:
+                progress(report)
+
+    def _formatted(self, spec, rows):
+        formatters = [_FORMATTERS[kind] for _, kind in spec.columns]
+        if not any(formatters):
+            return rows
+        return [
+            tuple(value if formatter is None else formatter(value) for value, formatter in zip(row, formatters))
+            for row in rows
+        ]
+
+    def _write_csv(self, cursor, spec, path, fetch_size, report, started, progress):
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow([name for name, _ in spec.columns])
+            for rows in self._chunks(cursor, fetch_size, report, started, progress):
+                writer.writerows(self._formatted(spec, rows))
+
+    def _write_jsonl(self, cursor, spec, path, fetch_size, report, started, progress):
+        names = [name for name, _ in spec.columns]
+        with open(path, "w", encoding="utf-8") as handle:
+            for rows in self._chunks(cursor, fetch_size, report, started, progress):
+                handle.writelines(
+                    json.dumps(dict(zip(names, row)), ensure_ascii=False) + "\n"
+                    for row in self._formatted(spec, rows)
+                )
+
+    def _write_npz(self, conn, cursor, spec, where, params, path, fetch_size, report, started, progress):
+        """Write one .npy array per column into an uncompressed .npz.
+
+        Each column goes to its own temp .npy file, whose header is sized by
+        a COUNT in the same snapshot, and every chunk is appended to it as
+        raw bytes. Money columns are int64 minor units (named
+        '<column>_minor'), timestamps datetime64[s] in UTC.
+        """
+        import tempfile
+        import zipfile
+        import numpy as np
+        from numpy.lib import format as npy
+
+        text_columns = [name for name, kind in spec.columns if kind == "text"]
+        widths = ", ".join(["COUNT(*)"] + [f"MAX(length({name}))" for name in text_columns])
+        count, *lengths = conn.execute(f"SELECT {widths} FROM {spec.name} WHERE {where}", params).fetchone()
+        text_widths = dict(zip(text_columns, lengths))
+        dtypes = [
+            np.dtype(f"U{text_widths[name] or 1}") if kind == "text"
+            else np.dtype("datetime64[s]") if kind in ("timestamp", "end_date")
+            else np.dtype("int64")
+            for name, kind in spec.columns
+        ]
+        names = [f"{name}_minor" if kind == "money" else name for name, kind in spec.columns]
+
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(path))) as scratch:
+            files = [os.path.join(scratch, f"{name}.npy") for name in names]
+            handles = [open(file, "wb") for file in files]
+            try:
+                for handle, dtype in zip(handles, dtypes):
+                    npy.write_array_header_1_0(handle, {
+                        "descr": npy.dtype_to_descr(dtype), "fortran_order": False, "shape": (count,)
+                    })
+                written = 0
+                for rows in self._chunks(cursor, fetch_size, report, started, progress):
+                    # Nothing can be added inside our snapshot, but never write past the header's count
+                    rows = rows[:count - written]
+                    for handle, dtype, values, (_, kind) in zip(handles, dtypes, zip(*rows), spec.columns):
+                        if kind == "text":
+                            values = ["" if value is None else value for value in values]
+                        elif kind == "money":
+                            values = [0 if value is None else value for value in values]
+                        elif kind == "end_date":
+                            values = [last_included_day(value) for value in values]
+                        handle.write(np.array(values, dtype=dtype).tobytes())
+                    written += len(rows)
+            finally:
+                for handle in handles:
+                    handle.close()
+            with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as archive:
+                for file, name in zip(files, names):
+                    archive.write(file, arcname=f"{name}.npy")
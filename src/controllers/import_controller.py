@@ -0,0 +1,169 @@
+# src/controllers/import_controller.py
+# Description : Bulk import of bank exports into the transactions table
+
+import queue
+import threading
+import time
+from functools import lru_cache
+from itertools import islice
+from database.database import transaction
+from database.money import to_minor_units
+from database.dates import to_db_timestamp
+from database.fingerprints import transaction_fingerprint
+from utils.bank_parsers import ParseError, ProgressCounter, parse_bank_file
+from .cache import query_cache
+from .duplicates import DuplicateDetector
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+# Parsed batches waiting for the writer; bounds memory to a few batches
+PENDING_BATCHES = 2
+# Parse errors and skipped duplicates kept in the report; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+INSERT_TRANSACTION = """
+    INSERT INTO transactions (user_id, amount, category, transaction_type, description, date, fingerprint)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Statements repeat the same few dates over and over
+_stored_timestamp = lru_cache(maxsize=4096)(to_db_timestamp)
+
+
+class ImportReport:
+    """Outcome of one import run."""
+
+    def __init__(self, path):
+        self.path = path
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+        self.skipped = 0
+        self.duplicates = []
+        self.batches = 0
+        self.elapsed = 0.0
+        self.cancelled = False
+
+    @property
+    def rows_per_second(self):
+        return self.imported / self.elapsed if self.elapsed else 0.0
+
+    def add_error(self, error):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(str(error))
+
+    def add_duplicate(self, match):
+        self.skipped += 1
+        if len(self.duplicates) < MAX_REPORTED_ERRORS:
+            self.duplicates.append(str(match))
+
+    def to_dict(self):
+        return {
+            'path': self.path,
+            'imported': self.imported,
+            'failed': self.failed,
+            'errors': list(self.errors),
+            'skipped': self.skipped,
+            'duplicates': list(self.duplicates),
+            'batches': self.batches,
+            'elapsed': self.elapsed,
+            'rows_per_second': self.rows_per_second,
+            'cancelled': self.cancelled,
+        }
+
+
+class ImportController:
+    def import_file(self, user_id, path, file_format=None, batch_size=DEFAULT_BATCH_SIZE,
+                    progress=None, cancel=None, skip_duplicates=True, fuzzy_days=None,
+                    **parser_options):
+        """Stream a CSV/OFX/QIF export into the user's transactions.
+
+        Rows are parsed lazily on a helper thread and inserted with
+        executemany, one transaction per `batch_size` rows, so memory stays
+        constant however large the file is and parsing overlaps the writes.
+        `progress(report, fraction)` is called after each batch; setting the
+        `cancel` Event stops after the current batch (batches already
+        committed stay imported).
+
+        With `skip_duplicates` rows already stored (e.g. from an overlapping
+        statement) are left out and listed in the report; `fuzzy_days` also
+        skips near-duplicates up to that many days apart (see DuplicateDetector).
+        """
+        report = ImportReport(path)
+        detector = DuplicateDetector(user_id, fuzzy_days) if skip_duplicates else None
+        counter = ProgressCounter()
+        started = time.perf_counter()
+        stop = threading.Event()
+        batches = queue.Queue(maxsize=PENDING_BATCHES)
+        rows = self._rows(user_id, parse_bank_file(path, file_format, counter, **parser_options), report)
+        parser = threading.Thread(
+            target=self._produce_batches, args=(rows, batch_size, batches, stop),
+            name="signance-import-parser", daemon=True
+        )
+        parser.start()
+        try:
+            while True:
+                batch = batches.get()
+                if isinstance(batch, Exception):
+                    raise batch
+                if batch is None:
+                    break
+                with transaction("IMMEDIATE") as conn:
+                    if detector is not None:
+                        duplicates = detector.find(conn, batch)
+                        if duplicates:
+                            for position in sorted(duplicates):
+                                report.add_duplicate(duplicates[position])
+                            batch = [row for position, row in enumerate(batch) if position not in duplicates]
+                    conn.executemany(INSERT_TRANSACTION, batch)
+                report.imported += len(batch)
+                report.batches += 1
+                # Let the dashboard and lists see each committed batch
+                query_cache.bump(user_id)
+                report.elapsed = time.perf_counter() - started
+                if progress is not None:
+                    progress(report, counter.fraction)
+                if cancel is not None and cancel.is_set():
+                    report.cancelled = True
+                    break
+        except Exception as e:
+            logger.error("Error importing transactions: %s", e)
+            report.add_error(e)
+        finally:
+            stop.set()
+            # Unblock the parser if it is waiting on a full queue
+            while parser.is_alive():
+                try:
+                    batches.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def _produce_batches(self, rows, batch_size, batches, stop):
+        """Parser thread: fill `batches` with lists of rows, then None."""
+        try:
+            while not stop.is_set():
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                batches.put(batch)
+            batches.put(None)
+        except Exception as e:
+            batches.put(e)
+
+    def _rows(self, user_id, transactions, report):
+        """Turn parsed Transactions into INSERT parameter tuples."""
+        for item in transactions:
+            if isinstance(item, ParseError):
+                report.add_error(item)
+                continue
+            amount = to_minor_units(item.amount)
+            yield (
+                user_id, amount, item.category, item.transaction_type, item.description,
+                _stored_timestamp(item.date),
+                transaction_fingerprint(user_id, item.date, amount, item.transaction_type, item.description)
+            )
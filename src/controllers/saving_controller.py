@@ -1,142 +1,148 @@
 #src/controllers/saving_controller.py
 
-from datetime import datetime
 from decimal import Decimal
 from models.saving import SavingGoal
-from database.database import get_connection
+from database.database import connection, transaction
+from .cache import query_cache, cached_read
+from database.money import to_minor_units, from_minor_units
+from database.dates import to_db_timestamp, from_db_timestamp, now_db_timestamp
+from utils.tracing import trace_methods
+from utils.log import get_logger
 
+logger = get_logger(__name__)
+
+
+@trace_methods("controller")
 class SavingsController:
     def __init__(self):
         pass  # Initialization no longer pre-fetches data
 
     def create_saving(self, user_id, name, target_amount, deadline):
-        conn = get_connection()
-        cur = conn.cursor()
         try:
-            # langsung masukin ke database
-            cur.execute(
-                """
-                INSERT INTO savings (user_id, name, target_amount, current_amount, deadline, created_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-                RETURNING saving_id
-                """,
-                (user_id, name, str(target_amount), "0", deadline, datetime.now())
+            target_minor = to_minor_units(target_amount)
+            stored_deadline = to_db_timestamp(deadline)
+            created_at = now_db_timestamp()
+            with transaction() as conn:
+                cur = conn.cursor()
+                # langsung masukin ke database
+                cur.execute(
+                    """
+                    INSERT INTO savings (user_id, name, target_amount, current_amount, deadline, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    RETURNING saving_id
+                    """,
+                    (user_id, name, target_minor, 0, stored_deadline, created_at)
+                )
+                saving_id = cur.fetchone()[0]
+            query_cache.bump(user_id)
+            return SavingGoal(
+                saving_id, user_id, name, from_minor_units(target_minor), from_minor_units(0),
+                from_db_timestamp(stored_deadline), from_db_timestamp(created_at)
             )
-            saving_id = cur.fetchone()[0]
-            conn.commit()
-            return SavingGoal(saving_id, user_id, name, target_amount, 0, deadline, datetime.now())
         except Exception as e:
-            print(f"Error creating saving: {str(e)}")
-            conn.rollback()
-        finally:
-            cur.close()
-            conn.close()
+            logger.error("Error creating saving: %s", e)
 
     def update_saving(self, saving_id, name=None, target_amount=None, deadline=None):
         """Update a saving goal in the database."""
-        conn = get_connection()
-        cur = conn.cursor()
         try:
-            updates = []
-            params = []
-            if name:
-                updates.append("name = ?")
-                params.append(name)
-            if target_amount:
-                updates.append("target_amount = ?")
-                params.append(str(target_amount))
-            if deadline:
-                updates.append("deadline = ?")
-                params.append(deadline)
-            if not updates:
-                return None  # no updates
+            with transaction() as conn:
+                cur = conn.cursor()
+                updates = []
+                params = []
+                if name:
+                    updates.append("name = ?")
+                    params.append(name)
+                if target_amount:
+                    updates.append("target_amount = ?")
+                    params.append(to_minor_units(target_amount))
+                if deadline:
+                    updates.append("deadline = ?")
+                    params.append(to_db_timestamp(deadline))
+                if not updates:
+                    return None  # no updates
 
-            params.append(saving_id)
-            query = f"UPDATE savings SET {', '.join(updates)} WHERE saving_id = ?"
-            cur.execute(query, tuple(params))
-            conn.commit()
+                params.append(saving_id)
+                query = f"UPDATE savings SET {', '.join(updates)} WHERE saving_id = ? RETURNING user_id"
+                row = cur.execute(query, tuple(params)).fetchone()
+            if row:
+                query_cache.bump(row[0])
             # Fetch the updated saving
             return self.get_saving_by_id(saving_id)
         except Exception as e:
-            print(f"Error updating saving: {str(e)}")
-            conn.rollback()
-        finally:
-            cur.close()
-            conn.close()
+            logger.error("Error updating saving: %s", e)
 
     def delete_saving(self, saving_id):
         """Delete a saving goal from the database."""
-        conn = get_connection()
-        cur = conn.cursor()
         try:
-            cur.execute("DELETE FROM savings WHERE saving_id = ?", (saving_id,))
-            conn.commit()
+            with transaction() as conn:
+                cur = conn.cursor()
+                row = cur.execute("DELETE FROM savings WHERE saving_id = ? RETURNING user_id", (saving_id,)).fetchone()
+            if row:
+                query_cache.bump(row[0])
         except Exception as e:
-            print(f"Error deleting saving: {str(e)}")
-            conn.rollback()
-        finally:
-            cur.close()
-            conn.close()
+            logger.error("Error deleting saving: %s", e)
 
     def get_saving_by_id(self, saving_id):
         """Fetch a single saving goal by its ID."""
-        conn = get_connection()
-        cur = conn.cursor()
         try:
-            cur.execute(
-                """
-                SELECT saving_id, user_id, name, target_amount, current_amount, deadline, created_at
-                FROM savings
-                WHERE saving_id = ?
-                """,
-                (saving_id,)
-            )
-            row = cur.fetchone()
-            if row:
-                return SavingGoal(
-                    saving_id=row[0],
-                    user_id=row[1],
-                    name=row[2],
-                    target_amount=Decimal(row[3]),
-                    current_amount=Decimal(row[4]),
-                    deadline=row[5],
-                    created_at=row[6]
+            with connection() as conn:
+                cur = conn.cursor()
+                cur.execute(
+                    """
+                    SELECT saving_id, user_id, name, target_amount, current_amount, deadline, created_at
+                    FROM savings
+                    WHERE saving_id = ?
+                    """,
+                    (saving_id,)
                 )
-            return None
+                row = cur.fetchone()
+                if row:
+                    return SavingGoal(
+                        saving_id=row[0],
+                        user_id=row[1],
+                        name=row[2],
+                        target_amount=from_minor_units(row[3]),
+                        current_amount=from_minor_units(row[4]),
+                        deadline=from_db_timestamp(row[5]),
+                        created_at=from_db_timestamp(row[6])
+                    )
+                return None
         except Exception as e:
-            print(f"Error fetching saving by ID: {str(e)}")
-        finally:
-            cur.close()
-            conn.close()
+            logger.error("Error fetching saving by ID: %s", e)
 
     def update_current_amount(self, saving_id, current_amount):
-        """Update the current amount of a specific savings goal."""
+        """Update the current amount of a specific savings goal. Returns True if it was updated."""
         try:
-            current_amount = str(current_amount)
             # Update the current amount in the database
             query = """
                 UPDATE savings
                 SET current_amount = ?
                 WHERE saving_id = ?
+                RETURNING user_id
             """
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute(query, (current_amount, saving_id))
-            conn.commit()
+            with transaction() as conn:
+                row = conn.execute(query, (to_minor_units(current_amount), saving_id)).fetchone()
+            if row:
+                query_cache.bump(row[0])
 
-            print(f"Current amount for savings goal {saving_id} updated to {current_amount}.")
+            logger.debug("Current amount for savings goal %s updated to %s", saving_id, current_amount)
+            return row is not None
         except Exception as e:
-            print(f"Error updating current amount: {e}")
-            conn.rollback()
-        finally:
-            cursor.close()
-            conn.close()
+            logger.error("Error updating current amount: %s", e)
+            return False
 
     def get_all_savings(self, user_id):
         """Fetch all savings for a specific user."""
-        conn = get_connection()
-        cur = conn.cursor()
         try:
+            return self._all_savings(user_id)
+        except Exception as e:
+            # Raised through the cache, so a failed read is never cached
+            logger.error("Error fetching all savings: %s", e)
+
+    @cached_read
+    def _all_savings(self, user_id):
+        with connection() as conn:
+            cur = conn.cursor()
             cur.execute(
                 """
                 SELECT saving_id, user_id, name, target_amount, current_amount, deadline, created_at
@@ -151,15 +157,10 @@ class SavingsController:
                     saving_id=row[0],
                     user_id=row[1],
                     name=row[2],
-                    target_amount=Decimal(row[3]),
-                    current_amount=Decimal(row[4]),
-                    deadline=row[5],
-                    created_at=row[6]
+                    target_amount=from_minor_units(row[3]),
+                    current_amount=from_minor_units(row[4]),
+                    deadline=from_db_timestamp(row[5]),
+                    created_at=from_db_timestamp(row[6])
                 )
                 for row in rows
             ]
-        except Exception as e:
-            print(f"Error fetching all savings: {str(e)}")
-        finally:
-            cur.close()
-            conn.close()
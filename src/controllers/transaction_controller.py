@@ -1,267 +1,423 @@
 #src/controllers/transaction_controller.py
 
-from models.transaction import Transaction, TransactionType
+from models.transaction import Transaction, TransactionType, Category
 from decimal import Decimal
-from datetime import datetime
-from database.database import get_connection
+from datetime import date, datetime
+from itertools import product
+import warnings
+from database.database import connection, transaction
+from .cache import query_cache, cached_read
+from .duplicates import DuplicateDetector
+from database.money import to_minor_units, from_minor_units
+from database.fingerprints import stored_fingerprint
+from database.dates import now_db_timestamp, to_db_timestamp, from_db_timestamp, period_range, shift_month, bucket_keys
+from utils.tracing import trace_methods
+from utils.log import get_logger
 
+logger = get_logger(__name__)
+
+# SQL expressions turning a stored UTC timestamp into a local bucket key
+BUCKET_EXPRESSIONS = {
+    "day": "strftime('%Y-%m-%d', date, 'localtime')",
+    "week": "date(date, 'localtime', 'weekday 0', '-6 days')",
+    "month": "strftime('%Y-%m', date, 'localtime')",
+    "year": "strftime('%Y', date, 'localtime')",
+}
+
+GROUP_COLUMNS = {"type": "transaction_type", "category": "category"}
+
+# Known values per group, used to fill gaps in aggregate() results
+GROUP_VALUES = {
+    "type": [t.value for t in TransactionType],
+    "category": [c.value for c in Category],
+}
+
+# Buckets that can be answered from monthly_rollups, by year_month prefix length
+ROLLUP_BUCKET_LENGTHS = {"month": 7, "year": 4}
+
+
+def _whole_month_bounds(start_ts, end_ts):
+    """Return ('YYYY-MM', 'YYYY-MM') bounds if the period is whole local months."""
+    first, stop = from_db_timestamp(start_ts), from_db_timestamp(end_ts)
+    for moment in (first, stop):
+        if (moment.day, moment.hour, moment.minute, moment.second) != (1, 0, 0, 0):
+            return None
+    return f"{first:%Y-%m}", f"{stop:%Y-%m}"
+
+
+@trace_methods("controller")
 class TransactionController:
     def __init__(self):
-        # Initialize the connection to the database
-        self.conn = get_connection()
-        self.cursor = self.conn.cursor()
+        # Connections are checked out of the shared pool per call, so one
+        # controller instance can be used from any thread
+        pass
+
+    def create_transaction(self, user_id, amount, category, transaction_type, description=None,
+                           skip_duplicates=False, fuzzy_days=None):
+        """Insert a new transaction into the database.
 
-    def create_transaction(self, user_id, amount, category, transaction_type, description=None):
-        """Insert a new transaction into the database."""
+        Returns the new transaction_id, or None if it failed or, with
+        `skip_duplicates`, if the same transaction is already stored today
+        (`fuzzy_days` widens that to near-duplicates, as for imports).
+        """
         try:
             query = """
-            INSERT INTO transactions (user_id, amount, category, transaction_type, description, date)
-            VALUES (?, ?, ?, ?, ?, ?)
+            INSERT INTO transactions (user_id, amount, category, transaction_type, description, date, fingerprint)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
             """
-            current_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            # Convert Decimal to float
-            self.cursor.execute(query, (user_id, float(Decimal(amount)), category, transaction_type, description, current_date))
-            self.conn.commit()
+            current_date = now_db_timestamp()
+            transaction_type = getattr(transaction_type, "value", transaction_type)
+            # Amounts are stored as integer minor units
+            minor_units = to_minor_units(amount)
+            row = (
+                user_id, minor_units, category, transaction_type, description, current_date,
+                stored_fingerprint(user_id, current_date, minor_units, transaction_type, description)
+            )
+            with transaction("IMMEDIATE" if skip_duplicates else "DEFERRED") as conn:
+                if skip_duplicates:
+                    duplicates = DuplicateDetector(user_id, fuzzy_days).find(conn, [row])
+                    if duplicates:
+                        logger.info("Skipped duplicate transaction: %s", duplicates[0])
+                        return None
+                transaction_id = conn.execute(query, row).lastrowid
+            query_cache.bump(user_id)
+            return transaction_id
         except Exception as e:
-            print(f"Error creating transaction: {e}")
+            logger.error("Error creating transaction: %s", e)
+            return None
 
     def update_transaction(self, transaction_id, amount, category, transaction_type, description=None):
-        """Update an existing transaction."""
+        """Update an existing transaction. Returns True if it was updated."""
         try:
             query = """
             UPDATE transactions
             SET amount = ?, category = ?, transaction_type = ?, description = ?
             WHERE transaction_id = ?
+            RETURNING user_id, date
             """
-            # Convert Decimal to float
-            self.cursor.execute(query, (float(Decimal(amount)), category, transaction_type, description, transaction_id))
-            self.conn.commit()
+            # Amounts are stored as integer minor units
+            transaction_type = getattr(transaction_type, "value", transaction_type)
+            minor_units = to_minor_units(amount)
+            with transaction() as conn:
+                row = conn.execute(query, (minor_units, category, transaction_type, description, transaction_id)).fetchone()
+                if row:
+                    # Keep the duplicate-detection fingerprint in step with the new values
+                    conn.execute(
+                        "UPDATE transactions SET fingerprint = ? WHERE transaction_id = ?",
+                        (stored_fingerprint(row[0], row[1], minor_units, transaction_type, description), transaction_id)
+                    )
+            if row:
+                query_cache.bump(row[0])
+            return row is not None
         except Exception as e:
-            print(f"Error updating transaction: {e}")
+            logger.error("Error updating transaction: %s", e)
+            return False
 
     def delete_transaction(self, transaction_id):
         """Delete a transaction by its ID."""
         try:
-            query = "DELETE FROM transactions WHERE transaction_id = ?"
-            self.cursor.execute(query, (transaction_id,))
-            self.conn.commit()
+            query = "DELETE FROM transactions WHERE transaction_id = ? RETURNING user_id"
+            with transaction() as conn:
+                row = conn.execute(query, (transaction_id,)).fetchone()
+            if row:
+                query_cache.bump(row[0])
         except Exception as e:
-            print(f"Error deleting transaction: {e}")
+            logger.error("Error deleting transaction: %s", e)
+
+    def list_transactions(self, user_id, after=None, limit=200, filters=None):
+        """Fetch one page of a user's transactions, newest first.
+
+        Pages are ordered by (date DESC, transaction_id DESC) and continue
+        strictly after the `after` cursor, so each page is an index seek no
+        matter how deep into the history it is. `filters` may contain
+        'transaction_type', 'category', 'start' and 'end' (local dates or
+        datetimes, as in aggregate()).
+
+        Returns (transactions, next_cursor); next_cursor is None on the last
+        page, otherwise pass it back as `after` to get the next page.
+        """
+        filters = filters or {}
+        conditions = ["user_id = ?"]
+        params = [user_id]
+        if filters.get("transaction_type"):
+            conditions.append("transaction_type = ?")
+            params.append(getattr(filters["transaction_type"], "value", filters["transaction_type"]))
+        if filters.get("category"):
+            conditions.append("category = ?")
+            params.append(getattr(filters["category"], "value", filters["category"]))
+        if filters.get("start"):
+            conditions.append("date >= ?")
+            params.append(period_range(filters["start"], filters["start"])[0])
+        if filters.get("end"):
+            conditions.append("date < ?")
+            params.append(period_range(filters["end"], filters["end"])[1])
+        if after is not None:
+            after_date, after_id = after
+            if not isinstance(after_date, str):
+                after_date = to_db_timestamp(after_date)
+            conditions.append("(date, transaction_id) < (?, ?)")
+            params.extend([after_date, after_id])
+
+        query = f"""
+        SELECT transaction_id, user_id, amount, category, transaction_type, description, date
+        FROM transactions
+        WHERE {' AND '.join(conditions)}
+        ORDER BY date DESC, transaction_id DESC
+        LIMIT ?
+        """
+        # Fetch one extra row to know whether another page exists
+        params.append(limit + 1)
+        try:
+            with connection() as conn:
+                rows = conn.execute(query, params).fetchall()
+        except Exception as e:
+            logger.error("Error listing transactions: %s", e)
+            return [], None
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = (rows[-1][6], rows[-1][0])
+        transactions = [
+            Transaction(
+                user_id=row[1],
+                amount=from_minor_units(row[2]),
+                category=row[3],
+                transaction_type=TransactionType(row[4]),
+                description=row[5],
+                transaction_id=row[0],
+                date=from_db_timestamp(row[6])
+            )
+            for row in rows
+        ]
+        return transactions, next_cursor
 
     def get_all_transactions(self):
-        """Fetch all transactions from the database."""
+        """Fetch all transactions from the database.
+
+        Deprecated: unbounded across every user; use list_transactions().
+        """
+        warnings.warn(
+            "get_all_transactions() is deprecated; use list_transactions()",
+            DeprecationWarning, stacklevel=2
+        )
         try:
             query = "SELECT * FROM transactions"
-            self.cursor.execute(query)
-            rows = self.cursor.fetchall()
+            with connection() as conn:
+                rows = conn.execute(query).fetchall()
             transactions = []
             for row in rows:
                 transaction = Transaction(
                     user_id=row[1],
-                    amount=row[2],
+                    amount=from_minor_units(row[2]),
                     category=row[3],
                     transaction_type=TransactionType(row[4]),
                     description=row[5],
                     transaction_id=row[0],
-                    date=row[6]
+                    date=from_db_timestamp(row[6])
                 )
                 transactions.append(transaction)
             return transactions
         except Exception as e:
-            print(f"Error fetching all transactions: {e}")
+            logger.error("Error fetching all transactions: %s", e)
             return []
             
     def get_transactions_by_user_id(self, user_id):
-        """Fetch all transactions for a specific user."""
+        """Fetch all transactions for a specific user.
+
+        Deprecated: loads the whole history; use list_transactions().
+        """
+        warnings.warn(
+            "get_transactions_by_user_id() is deprecated; use list_transactions()",
+            DeprecationWarning, stacklevel=2
+        )
         try:
             query = "SELECT * FROM transactions WHERE user_id = ?"
-            self.cursor.execute(query, (user_id,))
-            rows = self.cursor.fetchall()
+            with connection() as conn:
+                rows = conn.execute(query, (user_id,)).fetchall()
             transactions = []
             for row in rows:
                 transaction = Transaction(
                     user_id=row[1],
-                    amount=row[2],
+                    amount=from_minor_units(row[2]),
                     category=row[3],
                     transaction_type=TransactionType(row[4]),
                     description=row[5],
                     transaction_id=row[0],
-                    date=row[6]
+                    date=from_db_timestamp(row[6])
                 )
                 transactions.append(transaction)
             return transactions
         except Exception as e:
-            print(f"Error fetching transactions by user ID: {e}")
+            logger.error("Error fetching transactions by user ID: %s", e)
             return []
 
     def get_transaction_by_id(self, transaction_id):
         """Fetch a transaction by its ID."""
         try:
             query = "SELECT * FROM transactions WHERE transaction_id = ?"
-            self.cursor.execute(query, (transaction_id,))
-            row = self.cursor.fetchone()
+            with connection() as conn:
+                row = conn.execute(query, (transaction_id,)).fetchone()
             if row:
                 return Transaction(
                     user_id=row[1],
-                    amount=row[2],
+                    amount=from_minor_units(row[2]),
                     category=row[3],
                     transaction_type=TransactionType(row[4]),
                     description=row[5],
                     transaction_id=row[0],
-                    date=row[6]
+                    date=from_db_timestamp(row[6])
                 )
             return None
         except Exception as e:
-            print(f"Error fetching transaction by ID: {e}")
+            logger.error("Error fetching transaction by ID: %s", e)
             return None
 
-    def calculate_monthly_spending(self, user_id):
-        """Calculate total spending for the current month."""
-        print(user_id)
-        if not user_id:
-            return Decimal(0)
-        
-        print(user_id)
-        try:
-            current_month = datetime.now().month
-            current_year = datetime.now().year
-            query = """
-            SELECT amount
+    @cached_read
+    def aggregate(self, user_id, start, end, bucket="month", group_by=("type", "category"), transaction_type=None):
+        """Sum transaction amounts per time bucket with a single GROUP BY query.
+
+        `start` and `end` are local dates or datetimes; a date `end` includes
+        that whole day, a datetime `end` is exclusive. `bucket` is one of
+        'day', 'week' (starting Monday), 'month' or 'year' and `group_by` any
+        of 'type' and 'category'. `transaction_type` optionally restricts the
+        sum to 'income' or 'expense'.
+
+        Returns {bucket_key: {group_key: Decimal}} where every bucket in the
+        period and every known group combination is present (missing ones
+        are zero). Bucket keys are 'YYYY-MM-DD' (day, week start), 'YYYY-MM'
+        or 'YYYY'; group keys are tuples in `group_by` order.
+
+        Month and year buckets over whole local months are answered from
+        monthly_rollups, so their cost does not grow with the history size.
+        """
+        if bucket not in BUCKET_EXPRESSIONS:
+            raise ValueError(f"Unknown bucket {bucket!r}")
+        group_by = list(group_by or [])
+        for group in group_by:
+            if group not in GROUP_COLUMNS:
+                raise ValueError(f"Unknown group {group!r}")
+
+        start_ts, end_ts = period_range(start, end)
+        group_columns = [GROUP_COLUMNS[group] for group in group_by]
+        group_clause = ", ".join(["bucket"] + group_columns)
+        params = [user_id]
+        if transaction_type is not None:
+            params.append(getattr(transaction_type, "value", transaction_type))
+
+        month_bounds = _whole_month_bounds(start_ts, end_ts)
+        if bucket in ROLLUP_BUCKET_LENGTHS and month_bounds:
+            # Whole months: read the pre-aggregated monthly_rollups rows
+            select_columns = ", ".join([f"substr(year_month, 1, {ROLLUP_BUCKET_LENGTHS[bucket]}) AS bucket"] + group_columns)
+            type_filter = "AND transaction_type = ?" if transaction_type is not None else ""
+            query = f"""
+            SELECT {select_columns}, SUM(total)
+            FROM monthly_rollups
+            WHERE user_id = ? {type_filter} AND year_month >= ? AND year_month < ?
+            GROUP BY {group_clause}
+            """
+            params.extend(month_bounds)
+        else:
+            select_columns = ", ".join([f"{BUCKET_EXPRESSIONS[bucket]} AS bucket"] + group_columns)
+            type_filter = "AND transaction_type = ?" if transaction_type is not None else ""
+            query = f"""
+            SELECT {select_columns}, SUM(amount)
             FROM transactions
-            WHERE user_id = ? AND transaction_type = ? AND 
-                  strftime('%m', date) = ? AND strftime('%Y', date) = ?
+            WHERE user_id = ? {type_filter} AND date >= ? AND date < ?
+            GROUP BY {group_clause}
             """
-            self.cursor.execute(query, (user_id, "expense", f"{current_month:02d}", str(current_year)))
-            rows = self.cursor.fetchall()
-            
-            total_spending = sum(Decimal(row[0]) for row in rows)
-            print(total_spending)
-            return total_spending
+            params.extend([start_ts, end_ts])
+        with connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        # Dense result: every bucket and every known group, zero by default
+        group_keys = list(product(*(GROUP_VALUES[group] for group in group_by)))
+        result = {
+            key: {group_key: from_minor_units(0) for group_key in group_keys}
+            for key in bucket_keys(start_ts, end_ts, bucket)
+        }
+        for row in rows:
+            groups = result.setdefault(row[0], {group_key: from_minor_units(0) for group_key in group_keys})
+            groups[tuple(row[1:-1])] = from_minor_units(row[-1])
+        return result
+
+    def _monthly_totals(self, user_id, months, transaction_type, as_of):
+        """Totals for the `months` months ending with the as_of month, most recent first."""
+        first_year, first_month = shift_month(as_of.year, as_of.month, -(months - 1))
+        next_year, next_month = shift_month(as_of.year, as_of.month, 1)
+        buckets = self.aggregate(
+            user_id, datetime(first_year, first_month, 1), datetime(next_year, next_month, 1),
+            bucket="month", group_by=(), transaction_type=transaction_type
+        )
+        return [totals[()] for totals in reversed(list(buckets.values()))]
+
+    # The month readers resolve as_of before the cached call, so the cache
+    # key names the month and a month rollover cannot return stale totals
+
+    def calculate_monthly_spending(self, user_id, as_of=None):
+        """Calculate total spending for the month containing `as_of` (default today)."""
+        try:
+            return self._monthly_spending(user_id, as_of or date.today())
         except Exception as e:
-            print(f"Error calculating monthly spending: {e}")
+            # Raised through the cache, so a failed read is never cached
+            logger.error("Error calculating monthly spending: %s", e)
             return Decimal(0)
 
-    def calculate_monthly_category_spending(self, user_id):
-        """Calculate total spending for the current month in each category."""
+    @cached_read
+    def _monthly_spending(self, user_id, as_of):
         if not user_id:
-            return [0] * 5  # If no user ID is provided, return 0 for all categories
-        
-        # Categories for spending
-        categories = ["food", "transport", "entertainment", "education", "other"]
-        category_spending = {category: Decimal(0) for category in categories}
+            return Decimal(0)
         
+        total_spending = self._monthly_totals(user_id, 1, TransactionType.EXPENSE, as_of)[0]
+        logger.debug("Monthly spending for user %s: %s", user_id, total_spending)
+        return total_spending
+
+    def calculate_monthly_category_spending(self, user_id, as_of=None):
+        """Calculate total spending in each category for the month containing `as_of` (default today)."""
         try:
-            current_month = datetime.now().month
-            current_year = datetime.now().year
-
-            # Loop through categories and calculate total spending for each
-            for category in categories:
-                query = """
-                SELECT amount
-                FROM transactions
-                WHERE user_id = ? AND category = ? AND transaction_type = ? AND 
-                      strftime('%m', date) = ? AND strftime('%Y', date) = ?
-                """
-                self.cursor.execute(query, (user_id, category, "expense", f"{current_month:02d}", str(current_year)))
-                rows = self.cursor.fetchall()
-                
-                total_category_spending = sum(Decimal(row[0]) for row in rows)
-                category_spending[category] = total_category_spending
-
-            # Return the category spending as a list of integers
-            return [int(category_spending[category]) for category in categories]
-        
+            return self._monthly_category_spending(user_id, as_of or date.today())
         except Exception as e:
-            print(f"Error calculating monthly category spending: {e}")
-            return [0] * 5  # Return 0 for all categories if an error occurs
-        
-    def calculate_last_six_months_spending(self, user_id):
-        """Calculate total spending for the past 6 months, returning a list of amounts for each month."""
+            logger.error("Error calculating monthly category spending: %s", e)
+            return [0] * len(GROUP_VALUES["category"])  # Return 0 for all categories if an error occurs
+
+    @cached_read
+    def _monthly_category_spending(self, user_id, as_of):
+        categories = GROUP_VALUES["category"]
         if not user_id:
-            return [Decimal(0)] * 6  # Return 0 for each month if no user_id is provided
+            return [0] * len(categories)  # If no user ID is provided, return 0 for all categories
+        
+        next_year, next_month = shift_month(as_of.year, as_of.month, 1)
+        buckets = self.aggregate(
+            user_id, datetime(as_of.year, as_of.month, 1), datetime(next_year, next_month, 1),
+            bucket="month", group_by=("category",), transaction_type=TransactionType.EXPENSE
+        )
+        category_spending = next(iter(buckets.values()))
 
-        try:
-            # Get the current date and initialize the list of spending for the last 6 months
-            current_month = datetime.now().month
-            current_year = datetime.now().year
-            month_spending = []
-
-            # Loop through the past 6 months
-            for i in range(6):
-                # Calculate the month and year for the current iteration
-                month = (current_month - i - 1) % 12 + 1  # Wrap around if going back to previous years
-                year = current_year if current_month - i > 0 else current_year - 1
-
-                # Format the month and year for the query
-                month_str = f"{month:02d}"
-                year_str = str(year)
-
-                # Query to get total spending for that month
-                query = """
-                SELECT amount
-                FROM transactions
-                WHERE user_id = ? AND transaction_type = ? AND 
-                      strftime('%m', date) = ? AND strftime('%Y', date) = ?
-                """
-                self.cursor.execute(query, (user_id, "expense", month_str, year_str))
-                rows = self.cursor.fetchall()
-
-                # Sum the amounts for that month
-                total_spending = sum(Decimal(row[0]) for row in rows)
-                month_spending.append(total_spending)
-
-            # Return the list of total spending for the last 6 months
-            return month_spending
+        # Return the category spending as a list of integers, in Category order
+        return [int(category_spending[(category,)]) for category in categories]
+        
+    def calculate_last_six_months_spending(self, user_id, as_of=None):
+        """Calculate total spending for the 6 months up to `as_of` (default today), one amount per month."""
+        return self._last_six_months_totals(user_id, TransactionType.EXPENSE, as_of)
+
+    def calculate_last_six_months_income(self, user_id, as_of=None):
+        """Calculate total income for the 6 months up to `as_of` (default today), one amount per month."""
+        return self._last_six_months_totals(user_id, TransactionType.INCOME, as_of)
 
+    def _last_six_months_totals(self, user_id, transaction_type, as_of):
+        try:
+            return self._last_six_months(user_id, transaction_type, as_of or date.today())
         except Exception as e:
-            print(f"Error calculating spending for the last 6 months: {e}")
+            logger.error("Error calculating %s for the last 6 months: %s", transaction_type.value, e)
             return [Decimal(0)] * 6  # Return 0 for each month if an error occurs
-        
-    def calculate_last_six_months_income(self, user_id):
-        """Calculate total spending for the past 6 months, returning a list of amounts for each month."""
+
+    @cached_read
+    def _last_six_months(self, user_id, transaction_type, as_of):
         if not user_id:
             return [Decimal(0)] * 6  # Return 0 for each month if no user_id is provided
 
-        try:
-            # Get the current date and initialize the list of spending for the last 6 months
-            current_month = datetime.now().month
-            current_year = datetime.now().year
-            month_spending = []
-
-            # Loop through the past 6 months
-            for i in range(6):
-                # Calculate the month and year for the current iteration
-                month = (current_month - i - 1) % 12 + 1  # Wrap around if going back to previous years
-                year = current_year if current_month - i > 0 else current_year - 1
-
-                # Format the month and year for the query
-                month_str = f"{month:02d}"
-                year_str = str(year)
-
-                # Query to get total spending for that month
-                query = """
-                SELECT amount
-                FROM transactions
-                WHERE user_id = ? AND transaction_type = ? AND 
-                      strftime('%m', date) = ? AND strftime('%Y', date) = ?
-                """
-                self.cursor.execute(query, (user_id, "income", month_str, year_str))
-                rows = self.cursor.fetchall()
-
-                # Sum the amounts for that month
-                total_spending = sum(Decimal(row[0]) for row in rows)
-                month_spending.append(total_spending)
-
-            # Return the list of total spending for the last 6 months
-            return month_spending
-
-        except Exception as e:
-            print(f"Error calculating spending for the last 6 months: {e}")
-            return [Decimal(0)] * 6  # Return 0 for each month if an error occurs
+        return self._monthly_totals(user_id, 6, transaction_type, as_of)
 
     def close(self):
-        """Close the database connection and cursor when done."""
-        if self.cursor:
-            self.cursor.close()
-        if self.conn:
-            self.conn.close()
+        """Kept for compatibility; pooled connections are released after every call."""
+        pass
@@ -1,6 +1,18 @@
 # src/database/__init__.py
 # Description : Module initialization
 
-from .database import initialize_database, get_connection
+from .database import (
+    initialize_database, get_connection, get_pool, configure_pool,
+    connection, transaction, pool_stats, ConnectionPool, PoolTimeoutError
+)
+from .money import to_minor_units, from_minor_units
+from .dates import to_db_timestamp, from_db_timestamp, now_db_timestamp, month_range, period_range
+from .instrumentation import monitor as query_monitor
 
-__all__ = ['initialize_database', 'get_connection']
+__all__ = [
+    'initialize_database', 'get_connection', 'get_pool', 'configure_pool',
+    'connection', 'transaction', 'pool_stats', 'ConnectionPool', 'PoolTimeoutError',
+    'to_minor_units', 'from_minor_units',
+    'to_db_timestamp', 'from_db_timestamp', 'now_db_timestamp', 'month_range', 'period_range',
+    'query_monitor'
+]
@@ -1,69 +1,270 @@
 # src/database/database.py
 
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
-DATABASE_PATH = Path("src/database/signance.db")
+from . import instrumentation
 
-def get_connection():
-    DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    return sqlite3.connect(DATABASE_PATH)
+# Resolved from this file so scripts work from any working directory
+DATABASE_PATH = Path(__file__).resolve().parent / "signance.db"
 
-def initialize_database():
-    conn = get_connection()
-    cur = conn.cursor()
-    
-    # Create users table
-    cur.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            user_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            email TEXT UNIQUE NOT NULL,
-            password_hash TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-
-    # Create transactions table
-    cur.execute('''
-        CREATE TABLE IF NOT EXISTS transactions (
-            transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            amount DECIMAL(10,2) NOT NULL,
-            category TEXT NOT NULL,
-            transaction_type TEXT NOT NULL,
-            description TEXT,
-            date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (user_id)
-        )
-    ''')
-    
-    # Create budgets table
-    cur.execute('''
-        CREATE TABLE IF NOT EXISTS budgets (
-            budget_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            category TEXT NOT NULL,
-            amount DECIMAL(10,2) NOT NULL,
-            start_date TIMESTAMP NOT NULL,
-            end_date TIMESTAMP NOT NULL,
-            FOREIGN KEY (user_id) REFERENCES users (user_id)
+# Default number of connections kept open by the pool
+DEFAULT_POOL_SIZE = 4
+
+# PRAGMAs applied once to every connection when it is opened
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "foreign_keys": "ON",
+    "busy_timeout": 5000,
+    "temp_store": "MEMORY",
+}
+
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """Raised when no pooled connection becomes free before the timeout."""
+
+
+class ConnectionPool:
+    """A bounded pool of SQLite connections shared between threads.
+
+    A thread that already holds a connection gets the same one back on nested
+    checkouts, so a controller method calling another controller method never
+    needs a second connection. Connections are only used by one thread at a
+    time, but may move to another thread once they are back in the pool.
+    """
+
+    def __init__(self, path=DATABASE_PATH, pool_size=DEFAULT_POOL_SIZE, pragmas=None, timeout=30.0):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        self.path = Path(path)
+        self.pool_size = pool_size
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.timeout = timeout
+
+        self._idle = []
+        self._all = []
+        # Slots reserved by threads opening a connection outside the lock
+        self._opening = 0
+        # Bumped by recycle(), so connections opened before it are retired too
+        self._generation = 0
+        # Connections to close instead of pooling when they are released
+        self._retired = set()
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._stats = {
+            "checkouts": 0,
+            "reused": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+            "created": 0,
+        }
+
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _connect(self):
+        """Open a new connection and apply the configured PRAGMAs."""
+        conn = sqlite3.connect(
+            str(self.path),
+            timeout=self.timeout,
+            check_same_thread=False,
+            isolation_level=None,  # transactions are managed by transaction()
+            factory=instrumentation.connection_factory(),
         )
-    ''')
-    
-    # Create savings table
-    cur.execute('''
-        CREATE TABLE IF NOT EXISTS savings (
-            saving_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            name TEXT NOT NULL,
-            target_amount DECIMAL(10,2) NOT NULL,
-            current_amount DECIMAL(10,2) DEFAULT 0,
-            deadline TIMESTAMP NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (user_id) REFERENCES users (user_id)
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def acquire(self):
+        """Check a connection out of the pool for the current thread."""
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            self._local.depth += 1
+            with self._cond:
+                self._stats["reused"] += 1
+            return held
+
+        with self._cond:
+            self._stats["checkouts"] += 1
+            if not self._idle and len(self._all) + self._opening >= self.pool_size:
+                self._stats["waits"] += 1
+                started = time.perf_counter()
+                deadline = started + self.timeout
+                while not self._idle and len(self._all) + self._opening >= self.pool_size:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        self._stats["wait_time"] += time.perf_counter() - started
+                        raise PoolTimeoutError("Timed out waiting for a database connection")
+                    self._cond.wait(remaining)
+                self._stats["wait_time"] += time.perf_counter() - started
+
+            if self._idle:
+                conn = self._idle.pop()
+            else:
+                # Reserve the slot; opening the file and the PRAGMAs run unlocked
+                conn = None
+                self._opening += 1
+                generation = self._generation
+
+        if conn is None:
+            try:
+                conn = self._connect()
+            except BaseException:
+                with self._cond:
+                    self._opening -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._opening -= 1
+                self._all.append(conn)
+                self._stats["created"] += 1
+                if generation != self._generation:
+                    self._retired.add(conn)
+
+        self._local.conn = conn
+        self._local.depth = 1
+        return conn
+
+    def release(self, conn):
+        """Return a connection checked out with acquire()."""
+        if getattr(self._local, "conn", None) is not conn:
+            raise RuntimeError("Connection was not checked out by this thread")
+
+        self._local.depth -= 1
+        if self._local.depth:
+            return
+
+        self._local.conn = None
+        if conn.in_transaction:
+            # Never hand a half-finished transaction to the next caller
+            conn.rollback()
+        with self._cond:
+            if conn in self._retired:
+                self._retired.discard(conn)
+                self._all.remove(conn)
+                conn.close()
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager yielding a pooled connection."""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def transaction(self, mode="DEFERRED"):
+        """Context manager running its body in a single transaction.
+
+        The outermost transaction commits on success and rolls back on error;
+        nested transaction() blocks on the same thread join the outer one.
+        """
+        conn = self.acquire()
+        try:
+            if conn.in_transaction:
+                yield conn
+                return
+            conn.execute(f"BEGIN {mode}")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+        finally:
+            self.release(conn)
+
+    def stats(self):
+        """Return a snapshot of the pool counters."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats["open"] = len(self._all)
+            stats["idle"] = len(self._idle)
+            stats["pool_size"] = self.pool_size
+        return stats
+
+    def recycle(self):
+        """Reopen every connection, e.g. after instrumentation was switched.
+
+        Idle connections are closed now and checked-out ones when they are
+        released, so later checkouts always get a fresh connection.
+        """
+        self.close()
+        with self._cond:
+            self._retired.update(self._all)
+            self._generation += 1
+
+    def close(self):
+        """Close every connection that is currently back in the pool."""
+        with self._cond:
+            for conn in self._idle:
+                conn.close()
+                self._all.remove(conn)
+            self._idle.clear()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DATABASE_PATH)
+    return _pool
+
+
+def configure_pool(path=None, pool_size=None, pragmas=None, timeout=None):
+    """Replace the process-wide pool, e.g. to point at another database file."""
+    global _pool
+    with _pool_lock:
+        old = _pool
+        _pool = ConnectionPool(
+            path if path is not None else (old.path if old else DATABASE_PATH),
+            pool_size if pool_size is not None else (old.pool_size if old else DEFAULT_POOL_SIZE),
+            pragmas if pragmas is not None else (old.pragmas if old else None),
+            timeout if timeout is not None else (old.timeout if old else 30.0),
         )
-    ''')
-    
-    conn.commit()
-    conn.close()
+    if old is not None:
+        old.close()
+    return _pool
+
+
+def connection():
+    """Shortcut for get_pool().connection()."""
+    return get_pool().connection()
+
+
+def transaction(mode="DEFERRED"):
+    """Shortcut for get_pool().transaction()."""
+    return get_pool().transaction(mode)
+
+
+def pool_stats():
+    return get_pool().stats()
+
+
+def get_connection():
+    """Open a standalone connection outside the pool.
+
+    Kept for scripts that manage their own connection; application code
+    should use connection() or transaction() instead.
+    """
+    return get_pool()._connect()
+
+
+def initialize_database():
+    """Bring the schema up to date; a no-op when it is already current."""
+    from .migrations import migrate
+    return migrate()
@@ -0,0 +1,126 @@
+# src/database/dates.py
+# Description : Canonical timestamp storage and half-open date ranges
+
+from datetime import date, datetime, timedelta, timezone
+
+# Every stored timestamp is UTC in this exact form (the same one SQLite uses
+# for CURRENT_TIMESTAMP), so plain string comparison orders them correctly
+# and range predicates can be served by an index.
+DB_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _as_datetime(value):
+    """Coerce a datetime, date or ISO-8601 string to a datetime."""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    raise TypeError(f"Cannot convert {type(value).__name__} to a timestamp")
+
+
+def to_db_timestamp(value):
+    """Convert a local datetime/date (or aware datetime) to the stored UTC form.
+
+    Naive values are interpreted as local time, which is what the UI and the
+    legacy rows hold.
+    """
+    if value is None:
+        return None
+    moment = _as_datetime(value)
+    return moment.astimezone(timezone.utc).strftime(DB_TIMESTAMP_FORMAT)
+
+
+def from_db_timestamp(value):
+    """Convert a stored UTC timestamp to a naive local datetime."""
+    if value is None or isinstance(value, datetime):
+        return value
+    moment = datetime.strptime(value[:19], DB_TIMESTAMP_FORMAT).replace(tzinfo=timezone.utc)
+    return moment.astimezone().replace(tzinfo=None)
+
+
+def now_db_timestamp():
+    return datetime.now(timezone.utc).strftime(DB_TIMESTAMP_FORMAT)
+
+
+def shift_month(year, month, delta):
+    """Return the (year, month) that is `delta` months away, crossing years."""
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
+def month_range(year, month):
+    """Half-open [start, end) stored-timestamp bounds of a local calendar month."""
+    next_year, next_month = shift_month(year, month, 1)
+    return (
+        to_db_timestamp(datetime(year, month, 1)),
+        to_db_timestamp(datetime(next_year, next_month, 1)),
+    )
+
+
+def period_range(start, end):
+    """Half-open [start, end) stored-timestamp bounds of an arbitrary period.
+
+    A plain date as `end` includes that whole day; a datetime is exclusive.
+    """
+    if isinstance(end, date) and not isinstance(end, datetime):
+        end = datetime(end.year, end.month, end.day) + timedelta(days=1)
+    return to_db_timestamp(start), to_db_timestamp(end)
+
+
+def to_db_end_date(value):
+    """Stored exclusive bound of a period whose last included day is `value`.
+
+    Budgets are whole days: a datetime counts by its local date, so the
+    bound is the following local midnight, as period_range() uses.
+    """
+    if value is None:
+        return None
+    day = _as_datetime(value).date()
+    return period_range(day, day)[1]
+
+
+def from_db_end_date(value):
+    """Last included local day (at midnight) of a stored exclusive end bound."""
+    if value is None:
+        return None
+    return from_db_timestamp(value) - timedelta(days=1)
+
+
+def bucket_keys(start, end, bucket):
+    """List the local bucket keys covering stored timestamps in [start, end).
+
+    Keys match the SQL bucket expressions used by the aggregates:
+    'YYYY-MM-DD' for days and weeks (the Monday), 'YYYY-MM' and 'YYYY'.
+    """
+    first = from_db_timestamp(start)
+    last = from_db_timestamp(end) - timedelta(seconds=1)
+    if last < first:
+        return []
+
+    if bucket == "day":
+        day, stop = first.date(), last.date()
+        keys = []
+        while day <= stop:
+            keys.append(day.isoformat())
+            day += timedelta(days=1)
+        return keys
+    if bucket == "week":
+        day = first.date() - timedelta(days=first.weekday())
+        stop = last.date()
+        keys = []
+        while day <= stop:
+            keys.append(day.isoformat())
+            day += timedelta(weeks=1)
+        return keys
+    if bucket == "month":
+        year, month = first.year, first.month
+        keys = []
+        while (year, month) <= (last.year, last.month):
+            keys.append(f"{year:04d}-{month:02d}")
+            year, month = shift_month(year, month, 1)
+        return keys
+    if bucket == "year":
+        return [f"{year:04d}" for year in range(first.year, last.year + 1)]
+    raise ValueError(f"Unknown bucket {bucket!r}")
@@ -0,0 +1,41 @@
+# src/database/fingerprints.py
+# Description : Normalized transaction fingerprints for duplicate detection
+
+import hashlib
+import re
+from .dates import from_db_timestamp
+
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+_DIGITS = re.compile(r"\d+")
+
+
+def normalize_description(text, digits=True):
+    """Lower-case `text` and collapse punctuation and whitespace to single spaces.
+
+    With `digits=False` numbers are dropped too, which makes reference and
+    card numbers that differ between two exports of the same payment equal.
+    """
+    text = (text or "").lower()
+    if not digits:
+        text = _DIGITS.sub(" ", text)
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def transaction_fingerprint(user_id, day, amount, transaction_type, description):
+    """Return the 64-bit fingerprint of a transaction as a signed integer.
+
+    `day` is the local calendar date and `amount` the stored minor units;
+    expenses count as negative so an income and an expense of the same
+    amount never collide. The value fits SQLite's INTEGER column.
+    """
+    signed = -amount if transaction_type == "expense" else amount
+    key = f"{user_id}|{day:%Y-%m-%d}|{signed}|{normalize_description(description)}"
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def stored_fingerprint(user_id, date, amount, transaction_type, description):
+    """Fingerprint of a stored row, whose `date` is a UTC timestamp string."""
+    if date is None or amount is None:
+        return None
+    return transaction_fingerprint(user_id, from_db_timestamp(date).date(), amount, transaction_type, description)
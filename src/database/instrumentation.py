@@ -0,0 +1,431 @@
+# src/database/instrumentation.py
+# Description : Per-statement timing, caller tags and a slow-query log
+
+import atexit
+import functools
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# SIGNANCE_SQL_PROFILE=1 turns instrumentation on for the whole process and
+# prints the statement report to stderr at exit
+ENV_ENABLED = "SIGNANCE_SQL_PROFILE"
+ENV_SLOW_MS = "SIGNANCE_SLOW_QUERY_MS"
+ENV_SLOW_LOG = "SIGNANCE_SLOW_QUERY_LOG"
+
+DEFAULT_SLOW_MS = 50.0
+DEFAULT_SLOW_LOG = os.path.join(os.path.expanduser("~"), ".signance", "slow_queries.jsonl")
+
+# Latencies kept per statement shape for the percentiles
+SAMPLES_PER_STATEMENT = 2048
+
+# Frames in these modules are plumbing, not the code that asked for the query
+_PLUMBING = {__name__, "database.database", "contextlib"}
+
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=1024)
+def statement_shape(sql):
+    """Normalise SQL so statements differing only in literals group together.
+
+    Whitespace is collapsed, literals become ? and lists of placeholders
+    become (?...), so 'IN (?, ?)' and 'IN (?, ?, ?)' share a shape.
+    """
+    shape = _LITERALS.sub("?", _SPACE.sub(" ", sql).strip())
+    return _LISTS.sub("(?...)", shape)
+
+
+def _caller():
+    """'Class.method' (or 'module.function') of the code running the query."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module not in _PLUMBING:
+            name = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+            return name if "." in name else f"{module}.{name}"
+        frame = frame.f_back
+    return "?"
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class StatementStats:
+    """Counters for one statement shape."""
+
+    __slots__ = ("shape", "count", "total", "execute_time", "fetch_time", "rows", "max", "samples", "callers")
+
+    def __init__(self, shape):
+        self.shape = shape
+        self.count = 0
+        self.total = 0.0
+        self.execute_time = 0.0
+        self.fetch_time = 0.0
+        self.rows = 0
+        self.max = 0.0
+        self.samples = deque(maxlen=SAMPLES_PER_STATEMENT)
+        self.callers = Counter()
+
+    def to_dict(self):
+        ordered = sorted(self.samples)
+        return {
+            "statement": self.shape,
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.count * 1000,
+            "p50_ms": _percentile(ordered, 0.50) * 1000,
+            "p95_ms": _percentile(ordered, 0.95) * 1000,
+            "p99_ms": _percentile(ordered, 0.99) * 1000,
+            "max_ms": self.max * 1000,
+            "execute_ms": self.execute_time * 1000,
+            "fetch_ms": self.fetch_time * 1000,
+            "rows": self.rows,
+            "callers": dict(self.callers.most_common()),
+        }
+
+
+class QueryMonitor:
+    """Aggregates statement timings and writes the slow-query log.
+
+    A statement's time is its execute plus every fetch until the cursor is
+    exhausted, re-executed, closed or dropped. Statements at or above
+    `slow_ms` are appended to `slow_log` as JSON lines with their query plan;
+    `conn` is None when the statement was only finished by garbage
+    collection, and no plan is worked out then. Only statement shapes are
+    logged, never parameter values.
+    """
+
+    def __init__(self, slow_ms=DEFAULT_SLOW_MS, slow_log=DEFAULT_SLOW_LOG):
+        self.enabled = False
+        # Called with (statement, caller, started, execute_time, fetch_time, rows)
+        # for every statement, whether or not statistics are enabled
+        self.listeners = ()
+        self.slow_ms = slow_ms
+        self.slow_log = slow_log
+        self._lock = threading.Lock()
+        self._statements = {}
+        self._plans = {}
+
+    @property
+    def active(self):
+        """Whether connections need to be instrumented at all."""
+        return self.enabled or bool(self.listeners)
+
+    def record(self, conn, sql, parameters, caller, started, execute_time, fetch_time, rows):
+        shape = statement_shape(sql)
+        for listener in self.listeners:
+            listener(shape, caller, started, execute_time, fetch_time, rows)
+        if not self.enabled:
+            return
+        elapsed = execute_time + fetch_time
+        with self._lock:
+            stats = self._statements.get(shape)
+            if stats is None:
+                stats = self._statements[shape] = StatementStats(shape)
+            stats.count += 1
+            stats.total += elapsed
+            stats.execute_time += execute_time
+            stats.fetch_time += fetch_time
+            stats.rows += rows
+            stats.samples.append(elapsed)
+            stats.callers[caller] += 1
+            if elapsed > stats.max:
+                stats.max = elapsed
+        if self.slow_ms is not None and elapsed * 1000 >= self.slow_ms:
+            self._log_slow(conn, sql, parameters, shape, caller, execute_time, fetch_time, rows)
+
+    def _plan(self, conn, sql, parameters, shape):
+        """EXPLAIN QUERY PLAN lines, worked out once per statement shape."""
+        plan = self._plans.get(shape)
+        if plan is None:
+            if conn is None:
+                # Not on the thread that owns the connection, cannot EXPLAIN
+                return ["unavailable: cursor was not read to the end"]
+            plan = []
+            if sql.lstrip()[:7].upper().startswith(_EXPLAINABLE):
+                try:
+                    # The base class method, so the EXPLAIN is not timed itself
+                    rows = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, parameters).fetchall()
+                    depth = {0: -1}
+                    for node, parent, _, detail in rows:
+                        depth[node] = depth.get(parent, -1) + 1
+                        plan.append("  " * depth[node] + detail)
+                except sqlite3.Error as e:
+                    plan = [f"unavailable: {e}"]
+            self._plans[shape] = plan
+        return plan
+
+    def _log_slow(self, conn, sql, parameters, shape, caller, execute_time, fetch_time, rows):
+        entry = {
+            "time": datetime.now().isoformat(timespec="milliseconds"),
+            "ms": round((execute_time + fetch_time) * 1000, 3),
+            "execute_ms": round(execute_time * 1000, 3),
+            "fetch_ms": round(fetch_time * 1000, 3),
+            "rows": rows,
+            "caller": caller,
+            "thread": threading.current_thread().name,
+            "statement": shape,
+            "plan": self._plan(conn, sql, parameters, shape),
+        }
+        try:
+            with self._lock:
+                os.makedirs(os.path.dirname(os.path.abspath(self.slow_log)), exist_ok=True)
+                with open(self.slow_log, "a", encoding="utf-8") as handle:
+                    handle.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            logger.error("Error writing slow query log: %s", e)
+
+    def snapshot(self):
+        """Per-shape statistics, most total time first."""
+        with self._lock:
+            stats = [statement.to_dict() for statement in self._statements.values()]
+        return sorted(stats, key=lambda entry: entry["total_ms"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self._plans.clear()
+
+    def format_report(self, limit=20):
+        """A plain-text table of the statements that took the most time."""
+        stats = self.snapshot()
+        lines = [
+            f"SQL statements: {sum(entry['count'] for entry in stats):,} executed, "
+            f"{len(stats)} distinct, {sum(entry['total_ms'] for entry in stats):,.1f} ms in total",
+            f"{'count':>8} {'total ms':>10} {'p50':>8} {'p95':>8} {'p99':>8} {'rows':>9}  statement / callers",
+        ]
+        for entry in stats[:limit]:
+            statement = entry["statement"]
+            lines.append(
+                f"{entry['count']:>8,} {entry['total_ms']:>10.1f} {entry['p50_ms']:>8.3f} {entry['p95_ms']:>8.3f} "
+                f"{entry['p99_ms']:>8.3f} {entry['rows']:>9,}  {statement[:100]}{'...' if len(statement) > 100 else ''}"
+            )
+            callers = ", ".join(f"{caller} x{count}" for caller, count in list(entry["callers"].items())[:3])
+            lines.append(f"{'':>57}  <- {callers}")
+        return "\n".join(lines)
+
+
+monitor = QueryMonitor()
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that reports each statement to the monitor once it is done.
+
+    Statements without result rows are done when execute() returns; queries
+    when fetchall() or the first fetchone() returns, when fetchmany() or
+    iteration runs out of rows, or on close(). All of that happens on the
+    thread using the connection. A query that is dropped unfinished is
+    recorded by __del__ without touching the connection, which may run on
+    any thread.
+    """
+
+    _sql = None
+
+    def _start(self, sql, parameters, caller, started, execute_time):
+        self._sql = sql
+        self._parameters = parameters
+        self._caller = caller
+        self._started = started
+        self._execute_time = execute_time
+        self._fetch_time = 0.0
+        self._rows = 0
+
+    def _finish(self, conn):
+        sql = self._sql
+        if sql is None:
+            return
+        self._sql = None
+        monitor.record(
+            conn, sql, self._parameters, self._caller,
+            self._started, self._execute_time, self._fetch_time, self._rows
+        )
+
+    def execute(self, sql, parameters=()):
+        self._finish(self.connection)
+        caller = _caller()
+        started = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        except BaseException:
+            self._start(sql, parameters, caller, started, time.perf_counter() - started)
+            self._finish(self.connection)
+            raise
+        self._start(sql, parameters, caller, started, time.perf_counter() - started)
+        if self.description is None:
+            self._finish(self.connection)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish(self.connection)
+        caller = _caller()
+        # Explain with the first row when the rows are already in a list
+        first = seq_of_parameters[0] if isinstance(seq_of_parameters, (list, tuple)) and seq_of_parameters else ()
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._start(sql, first, caller, started, time.perf_counter() - started)
+            self._finish(self.connection)
+
+    def executescript(self, script):
+        self._finish(self.connection)
+        caller = _caller()
+        started = time.perf_counter()
+        try:
+            return super().executescript(script)
+        finally:
+            self._start(script, (), caller, started, time.perf_counter() - started)
+            self._finish(self.connection)
+
+    def fetchone(self):
+        if self._sql is None:
+            return super().fetchone()
+        # Single-row reads drop the cursor afterwards, so the first row ends it
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetch_time += time.perf_counter() - started
+        self._rows += row is not None
+        self._finish(self.connection)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetch_time += time.perf_counter() - started
+        self._rows += len(rows)
+        if len(rows) < size:
+            self._finish(self.connection)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetch_time += time.perf_counter() - started
+        self._rows += len(rows)
+        self._finish(self.connection)
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetch_time += time.perf_counter() - started
+            self._finish(self.connection)
+            raise
+        self._fetch_time += time.perf_counter() - started
+        self._rows += 1
+        return row
+
+    def close(self):
+        self._finish(self.connection)
+        super().close()
+
+    def __del__(self):
+        self._finish(None)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose statements, commits and rollbacks are all timed.
+
+    sqlite3.Connection.execute() does not go through cursor(), so each
+    shortcut is routed through an InstrumentedCursor explicitly.
+    """
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, script):
+        return self.cursor().executescript(script)
+
+    def commit(self):
+        self._timed("COMMIT", super().commit)
+
+    def rollback(self):
+        self._timed("ROLLBACK", super().rollback)
+
+    def _timed(self, name, fn):
+        caller = _caller()
+        started = time.perf_counter()
+        try:
+            fn()
+        finally:
+            monitor.record(self, name, (), caller, started, time.perf_counter() - started, 0.0, 0)
+
+
+def connection_factory():
+    """The class the pool opens connections with: plain sqlite3 unless
+    statistics or a listener are on, so otherwise nothing is paid per statement."""
+    return InstrumentedConnection if monitor.active else sqlite3.Connection
+
+
+def enable(slow_ms=None, slow_log=None):
+    """Instrument every connection opened from now on; pooled connections
+    are reopened so the current pool is covered too."""
+    if slow_ms is not None:
+        monitor.slow_ms = slow_ms
+    if slow_log is not None:
+        monitor.slow_log = slow_log
+    monitor.enabled = True
+    _recycle_pool()
+
+
+def disable():
+    monitor.enabled = False
+    _recycle_pool()
+
+
+def add_listener(listener):
+    """Also call `listener` for every statement, e.g. to trace them."""
+    if listener not in monitor.listeners:
+        monitor.listeners = monitor.listeners + (listener,)
+        _recycle_pool()
+
+
+def remove_listener(listener):
+    if listener in monitor.listeners:
+        monitor.listeners = tuple(entry for entry in monitor.listeners if entry is not listener)
+        _recycle_pool()
+
+
+def _recycle_pool():
+    # Reopen pooled connections so they pick up connection_factory() again
+    from .database import get_pool
+    get_pool().recycle()
+
+
+def is_enabled():
+    return monitor.enabled
+
+
+def _report_at_exit():
+    if monitor.snapshot():
+        print(monitor.format_report(), file=sys.stderr)
+
+
+if os.environ.get(ENV_ENABLED, "").lower() in ("1", "true", "yes", "on"):
+    monitor.enabled = True
+    monitor.slow_ms = float(os.environ.get(ENV_SLOW_MS, DEFAULT_SLOW_MS))
+    monitor.slow_log = os.environ.get(ENV_SLOW_LOG, DEFAULT_SLOW_LOG)
+    atexit.register(_report_at_exit)
@@ -0,0 +1,420 @@
+# src/database/migrations.py
+# Description : Versioned schema migrations
+
+from datetime import datetime
+
+from .database import connection, transaction
+from .dates import to_db_timestamp, from_db_timestamp, to_db_end_date
+from .rollups import ROLLUP_TRIGGERS, rebuild_rollups
+from .fingerprints import stored_fingerprint
+
+
+class Migration:
+    """A single schema step.
+
+    `steps` is a list of SQL statements, or a callable taking the connection
+    for data migrations. `plan_checks` lists (query, params, index names)
+    tuples: after the migration is applied, EXPLAIN QUERY PLAN of each query
+    must mention one of the given indexes (or PRIMARY KEY). An optional
+    fourth element lists plan fragments that must not appear, such as
+    'TEMP B-TREE' for queries whose ORDER BY has to come from the index.
+    """
+
+    def __init__(self, version, description, steps, plan_checks=()):
+        self.version = version
+        self.description = description
+        self.steps = steps
+        self.plan_checks = list(plan_checks)
+
+    def apply(self, conn):
+        if callable(self.steps):
+            self.steps(conn)
+        else:
+            for statement in self.steps:
+                conn.execute(statement)
+
+
+def rebuild_table(conn, table, create_sql, select_sql):
+    """Recreate `table` from `create_sql`, copying rows through `select_sql`.
+
+    SQLite cannot change a column type in place, so the table is rebuilt
+    under a temporary name and renamed back. Indexes, triggers and the
+    AUTOINCREMENT counter are carried over.
+    """
+    indexes = [row[0] for row in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type IN ('index', 'trigger') AND tbl_name = ? AND sql IS NOT NULL",
+        (table,)
+    )]
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+    sequence = row[0] if row else 0
+
+    conn.execute(create_sql.format(table=f"{table}_new"))
+    conn.execute(f"INSERT INTO {table}_new {select_sql}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+    for index_sql in indexes:
+        conn.execute(index_sql)
+    conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (sequence, table))
+
+
+def _store_minor_units(conn):
+    """Rebuild the money columns as INTEGER minor units (1/100)."""
+    rebuild_table(conn, "transactions", '''
+        CREATE TABLE {table} (
+            transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            amount INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            transaction_type TEXT NOT NULL,
+            description TEXT,
+            date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (user_id)
+        )
+    ''', '''
+        SELECT transaction_id, user_id, CAST(ROUND(amount * 100) AS INTEGER),
+               category, transaction_type, description, date
+        FROM transactions
+    ''')
+    rebuild_table(conn, "budgets", '''
+        CREATE TABLE {table} (
+            budget_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            amount INTEGER NOT NULL,
+            start_date TIMESTAMP NOT NULL,
+            end_date TIMESTAMP NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users (user_id)
+        )
+    ''', '''
+        SELECT budget_id, user_id, category, CAST(ROUND(amount * 100) AS INTEGER),
+               start_date, end_date
+        FROM budgets
+    ''')
+    rebuild_table(conn, "savings", '''
+        CREATE TABLE {table} (
+            saving_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            target_amount INTEGER NOT NULL,
+            current_amount INTEGER NOT NULL DEFAULT 0,
+            deadline TIMESTAMP NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (user_id)
+        )
+    ''', '''
+        SELECT saving_id, user_id, name, CAST(ROUND(target_amount * 100) AS INTEGER),
+               CAST(ROUND(COALESCE(current_amount, 0) * 100) AS INTEGER), deadline, created_at
+        FROM savings
+    ''')
+
+
+def _legacy_local_to_utc(value):
+    """Convert a legacy local-time string to the canonical UTC timestamp."""
+    if value is None:
+        return None
+    try:
+        return to_db_timestamp(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _normalize_timestamps(conn):
+    """Rewrite app-written timestamps as canonical UTC 'YYYY-MM-DD HH:MM:SS'.
+
+    The old code stored local time in three different shapes (with and
+    without microseconds, and bare dates). users.created_at is left alone
+    because it has always come from CURRENT_TIMESTAMP, which is already UTC.
+    """
+    conn.create_function("signance_to_utc", 1, _legacy_local_to_utc, deterministic=True)
+    conn.execute("UPDATE transactions SET date = signance_to_utc(date)")
+    conn.execute("UPDATE budgets SET start_date = signance_to_utc(start_date), end_date = signance_to_utc(end_date)")
+    conn.execute("UPDATE savings SET deadline = signance_to_utc(deadline), created_at = signance_to_utc(created_at)")
+
+
+def _create_monthly_rollups(conn):
+    """Create monthly_rollups, its maintenance triggers, and fill it."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS monthly_rollups (
+            user_id INTEGER NOT NULL,
+            year_month TEXT NOT NULL,
+            transaction_type TEXT NOT NULL,
+            category TEXT NOT NULL,
+            total INTEGER NOT NULL DEFAULT 0,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, year_month, transaction_type, category)
+        ) WITHOUT ROWID
+    ''')
+    for statement in ROLLUP_TRIGGERS:
+        conn.execute(statement)
+    rebuild_rollups(conn)
+
+
+def _add_fingerprints(conn):
+    """Add transactions.fingerprint, fill it for existing rows and index it."""
+    conn.execute("ALTER TABLE transactions ADD COLUMN fingerprint INTEGER")
+    conn.create_function("signance_fingerprint", 5, stored_fingerprint, deterministic=True)
+    conn.execute('''
+        UPDATE transactions
+        SET fingerprint = signance_fingerprint(user_id, date, amount, transaction_type, description)
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_transactions_user_fingerprint ON transactions (user_id, fingerprint)")
+
+
+def _legacy_end_to_exclusive(value):
+    """Turn a stored budget end (some moment on its last day) into the next local midnight."""
+    if value is None:
+        return None
+    try:
+        return to_db_end_date(from_db_timestamp(value))
+    except (TypeError, ValueError):
+        return value
+
+
+def _exclusive_budget_ends(conn):
+    """Store budget end dates as exclusive bounds, like period_range().
+
+    Migration 4 kept the end as midnight at the start of the last day, so
+    an `end_date >= now` check dropped budgets on that day. The old code
+    compared calendar dates and counted the whole day.
+    """
+    conn.create_function("signance_end_bound", 1, _legacy_end_to_exclusive, deterministic=True)
+    conn.execute("UPDATE budgets SET end_date = signance_end_bound(end_date)")
+
+
+MIGRATIONS = [
+    Migration(1, "Create base tables", [
+        '''
+        CREATE TABLE IF NOT EXISTS users (
+            user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS transactions (
+            transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            amount DECIMAL(10,2) NOT NULL,
+            category TEXT NOT NULL,
+            transaction_type TEXT NOT NULL,
+            description TEXT,
+            date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (user_id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS budgets (
+            budget_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            amount DECIMAL(10,2) NOT NULL,
+            start_date TIMESTAMP NOT NULL,
+            end_date TIMESTAMP NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users (user_id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS savings (
+            saving_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            target_amount DECIMAL(10,2) NOT NULL,
+            current_amount DECIMAL(10,2) DEFAULT 0,
+            deadline TIMESTAMP NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (user_id)
+        )
+        ''',
+    ]),
+    Migration(2, "Add indexes for per-user lookups", [
+        "CREATE INDEX IF NOT EXISTS idx_transactions_user_type_date ON transactions (user_id, transaction_type, date)",
+        "CREATE INDEX IF NOT EXISTS idx_transactions_user_category_date ON transactions (user_id, category, date)",
+        "CREATE INDEX IF NOT EXISTS idx_budgets_user_period ON budgets (user_id, start_date, end_date)",
+        "CREATE INDEX IF NOT EXISTS idx_savings_user ON savings (user_id)",
+    ], plan_checks=[
+        # TransactionController.calculate_monthly_spending and the six-month sums
+        ("""SELECT amount FROM transactions
+            WHERE user_id = ? AND transaction_type = ? AND
+                  strftime('%m', date) = ? AND strftime('%Y', date) = ?""",
+         (1, "expense", "01", "2025"),
+         ("idx_transactions_user_type_date", "idx_transactions_user_category_date")),
+        # TransactionController.calculate_monthly_category_spending
+        ("""SELECT amount FROM transactions
+            WHERE user_id = ? AND category = ? AND transaction_type = ? AND
+                  strftime('%m', date) = ? AND strftime('%Y', date) = ?""",
+         (1, "foods", "expense", "01", "2025"),
+         ("idx_transactions_user_category_date", "idx_transactions_user_type_date")),
+        # TransactionController.get_transactions_by_user_id
+        ("SELECT * FROM transactions WHERE user_id = ?", (1,),
+         ("idx_transactions_user_type_date", "idx_transactions_user_category_date",
+          "idx_transactions_user_date", "idx_transactions_user_fingerprint")),
+        # BudgetController.get_all_budgets / get_active_budgets
+        ("SELECT * FROM budgets WHERE user_id = ? ORDER BY category", (1,),
+         ("idx_budgets_user_period",)),
+        ("""SELECT * FROM budgets WHERE user_id = ? AND start_date <= ? AND end_date >= ?
+            ORDER BY category""", (1, "2025-01-01", "2025-01-01"),
+         ("idx_budgets_user_period",)),
+        # SavingsController.get_all_savings
+        ("""SELECT saving_id, user_id, name, target_amount, current_amount, deadline, created_at
+            FROM savings WHERE user_id = ?""", (1,),
+         ("idx_savings_user",)),
+    ]),
+    Migration(3, "Store amounts as integer minor units", _store_minor_units, plan_checks=[
+        # Aggregates are a single SUM over the index range
+        ("""SELECT COALESCE(SUM(amount), 0) FROM transactions
+            WHERE user_id = ? AND transaction_type = ? AND
+                  strftime('%m', date) = ? AND strftime('%Y', date) = ?""",
+         (1, "expense", "01", "2025"),
+         ("idx_transactions_user_type_date",)),
+        ("""SELECT COALESCE(SUM(amount), 0) FROM transactions
+            WHERE user_id = ? AND category = ? AND transaction_type = ? AND
+                  strftime('%m', date) = ? AND strftime('%Y', date) = ?""",
+         (1, "foods", "expense", "01", "2025"),
+         ("idx_transactions_user_category_date", "idx_transactions_user_type_date")),
+    ]),
+    Migration(4, "Normalize timestamps to UTC", _normalize_timestamps, plan_checks=[
+        # Month filters are half-open ranges served by the index
+        ("""SELECT COALESCE(SUM(amount), 0) FROM transactions
+            WHERE user_id = ? AND transaction_type = ? AND date >= ? AND date < ?""",
+         (1, "expense", "2025-01-01 00:00:00", "2025-02-01 00:00:00"),
+         ("idx_transactions_user_type_date (user_id=? AND transaction_type=? AND date>? AND date<?)",)),
+        ("""SELECT COALESCE(SUM(amount), 0) FROM transactions
+            WHERE user_id = ? AND category = ? AND transaction_type = ? AND date >= ? AND date < ?""",
+         (1, "foods", "expense", "2025-01-01 00:00:00", "2025-02-01 00:00:00"),
+         ("idx_transactions_user_category_date (user_id=? AND category=? AND date>? AND date<?)",
+          "idx_transactions_user_type_date (user_id=? AND transaction_type=? AND date>? AND date<?)")),
+        # BudgetController.get_active_budgets
+        ("""SELECT * FROM budgets WHERE user_id = ? AND start_date <= ? AND end_date >= ?
+            ORDER BY category""", (1, "2025-01-01 00:00:00", "2025-01-01 00:00:00"),
+         ("idx_budgets_user_period (user_id=? AND start_date<?)",)),
+    ]),
+    Migration(5, "Add per-user date index for bucketed aggregates", [
+        "CREATE INDEX IF NOT EXISTS idx_transactions_user_date ON transactions (user_id, date)",
+    ], plan_checks=[
+        # TransactionController.aggregate without a type filter
+        ("""SELECT strftime('%Y-%m', date, 'localtime') AS bucket, transaction_type, category, SUM(amount)
+            FROM transactions
+            WHERE user_id = ? AND date >= ? AND date < ?
+            GROUP BY bucket, transaction_type, category""",
+         (1, "2025-01-01 00:00:00", "2025-07-01 00:00:00"),
+         ("idx_transactions_user_date (user_id=? AND date>? AND date<?)",)),
+        # TransactionController.aggregate with a type filter
+        ("""SELECT strftime('%Y-%m', date, 'localtime') AS bucket, SUM(amount)
+            FROM transactions
+            WHERE user_id = ? AND transaction_type = ? AND date >= ? AND date < ?
+            GROUP BY bucket""",
+         (1, "expense", "2025-01-01 00:00:00", "2025-07-01 00:00:00"),
+         ("idx_transactions_user_type_date (user_id=? AND transaction_type=? AND date>? AND date<?)",)),
+        # TransactionController.list_transactions: the keyset seek and the
+        # (date DESC, transaction_id DESC) order both come from the index
+        ("""SELECT * FROM transactions
+            WHERE user_id = ? AND (date, transaction_id) < (?, ?)
+            ORDER BY date DESC, transaction_id DESC LIMIT ?""",
+         (1, "2025-01-01 00:00:00", 100, 200),
+         ("idx_transactions_user_date (user_id=? AND date<?)",), ("TEMP B-TREE",)),
+        ("""SELECT * FROM transactions
+            WHERE user_id = ? AND category = ? AND (date, transaction_id) < (?, ?)
+            ORDER BY date DESC, transaction_id DESC LIMIT ?""",
+         (1, "foods", "2025-01-01 00:00:00", 100, 200),
+         ("idx_transactions_user_category_date (user_id=? AND category=? AND date<?)",), ("TEMP B-TREE",)),
+    ]),
+    Migration(6, "Add monthly rollups maintained by triggers", _create_monthly_rollups, plan_checks=[
+        # TransactionController.aggregate over whole months
+        ("""SELECT substr(year_month, 1, 7) AS bucket, transaction_type, category, SUM(total)
+            FROM monthly_rollups
+            WHERE user_id = ? AND year_month >= ? AND year_month < ?
+            GROUP BY bucket, transaction_type, category""",
+         (1, "2025-01", "2025-07"),
+         ("PRIMARY KEY (user_id=? AND year_month>? AND year_month<?)",)),
+    ]),
+    Migration(7, "Add indexed transaction fingerprints for duplicate detection", _add_fingerprints, plan_checks=[
+        # DuplicateDetector exact matches: one index probe per fingerprint
+        ("SELECT transaction_id FROM transactions WHERE user_id = ? AND fingerprint = ?",
+         (1, 0),
+         ("idx_transactions_user_fingerprint (user_id=? AND fingerprint=?)",)),
+    ]),
+    Migration(8, "Store budget end dates as exclusive bounds", _exclusive_budget_ends, plan_checks=[
+        # BudgetController.get_active_budgets
+        ("""SELECT * FROM budgets WHERE user_id = ? AND start_date <= ? AND end_date > ?
+            ORDER BY category""", (1, "2025-01-01 00:00:00", "2025-01-01 00:00:00"),
+         ("idx_budgets_user_period (user_id=? AND start_date<?)",)),
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(conn):
+    """Return the highest applied migration version, or 0 for a fresh database."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+    ).fetchone()
+    if not row:
+        return 0
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def migrate():
+    """Apply every pending migration and return the versions that were applied.
+
+    When the schema is already current this costs a single lookup.
+    """
+    with connection() as conn:
+        if get_schema_version(conn) >= LATEST_VERSION:
+            return []
+
+    applied = []
+    with transaction("IMMEDIATE") as conn:
+        # Re-read under the write lock in case another process migrated first
+        version = get_schema_version(conn)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TIMESTAMP NOT NULL
+            )
+        ''')
+        for migration in MIGRATIONS:
+            if migration.version <= version:
+                continue
+            migration.apply(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (migration.version, migration.description, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
+            applied.append(migration.version)
+    return applied
+
+
+def explain(conn, query, params=()):
+    """Return the EXPLAIN QUERY PLAN detail lines for a query."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+
+
+def verify_query_plans(migrations=None):
+    """Check that the controller queries use the indexes their migrations added.
+
+    Returns a list of (version, query, plan) tuples for every check that did
+    not hit one of its expected indexes; an empty list means all is well.
+    """
+    failures = []
+    with connection() as conn:
+        for migration in migrations or MIGRATIONS:
+            for check in migration.plan_checks:
+                query, params, indexes = check[:3]
+                forbidden = check[3] if len(check) > 3 else ()
+                plan = explain(conn, query, params)
+                uses_index = any(name in line for line in plan for name in indexes)
+                if not uses_index or any(text in line for line in plan for text in forbidden):
+                    failures.append((migration.version, " ".join(query.split()), plan))
+    return failures
+
+
+if __name__ == "__main__":
+    print(f"Applied migrations: {migrate() or 'none'}")
+    problems = verify_query_plans()
+    for version, query, plan in problems:
+        print(f"[migration {version}] index not used: {query}\n    plan: {plan}")
+    print("Query plans OK" if not problems else f"{len(problems)} query plan check(s) failed")
@@ -0,0 +1,26 @@
+# src/database/money.py
+# Description : Conversion between Decimal amounts and stored minor units
+
+from decimal import Decimal, ROUND_HALF_UP
+
+# Amounts are stored as INTEGER counts of 1/100 of the currency unit
+MINOR_UNIT_DIGITS = 2
+MINOR_UNITS = 10 ** MINOR_UNIT_DIGITS
+_QUANTUM = Decimal(1).scaleb(-MINOR_UNIT_DIGITS)
+
+
+def to_minor_units(amount) -> int:
+    """Convert an amount (Decimal, int, float or numeric string) to minor units."""
+    if amount is None:
+        return 0
+    if not isinstance(amount, Decimal):
+        # str() first so floats like 0.1 do not drag in binary noise
+        amount = Decimal(str(amount))
+    return int(amount.quantize(_QUANTUM, rounding=ROUND_HALF_UP) * MINOR_UNITS)
+
+
+def from_minor_units(value) -> Decimal:
+    """Convert a stored minor-unit integer back to a Decimal amount."""
+    if value is None:
+        return Decimal(0).quantize(_QUANTUM)
+    return Decimal(int(value)).scaleb(-MINOR_UNIT_DIGITS)
@@ -0,0 +1,73 @@
+# src/database/rollups.py
+# Description : Per-user monthly totals kept current by triggers
+
+from .database import transaction
+
+# Local calendar month of a stored UTC timestamp, as 'YYYY-MM'
+_YEAR_MONTH = "strftime('%Y-%m', {row}.date, 'localtime')"
+
+_ADD_ROW = '''
+    INSERT INTO monthly_rollups (user_id, year_month, transaction_type, category, total, count)
+    VALUES (NEW.user_id, {year_month}, NEW.transaction_type, NEW.category, NEW.amount, 1)
+    ON CONFLICT (user_id, year_month, transaction_type, category)
+    DO UPDATE SET total = total + excluded.total, count = count + 1;
+'''.format(year_month=_YEAR_MONTH.format(row="NEW"))
+
+_REMOVE_ROW = '''
+    UPDATE monthly_rollups
+    SET total = total - OLD.amount, count = count - 1
+    WHERE user_id = OLD.user_id AND year_month = {year_month}
+      AND transaction_type = OLD.transaction_type AND category = OLD.category;
+    DELETE FROM monthly_rollups
+    WHERE user_id = OLD.user_id AND year_month = {year_month}
+      AND transaction_type = OLD.transaction_type AND category = OLD.category
+      AND count <= 0;
+'''.format(year_month=_YEAR_MONTH.format(row="OLD"))
+
+# Every write path (controllers, bulk imports, manual SQL) goes through these
+ROLLUP_TRIGGERS = [
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_insert
+    AFTER INSERT ON transactions
+    BEGIN {_ADD_ROW} END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_delete
+    AFTER DELETE ON transactions
+    BEGIN {_REMOVE_ROW} END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_update
+    AFTER UPDATE OF user_id, amount, category, transaction_type, date ON transactions
+    BEGIN {_REMOVE_ROW} {_ADD_ROW} END
+    ''',
+]
+
+
+def rebuild_rollups(conn=None, user_id=None):
+    """Recompute monthly_rollups from the raw transactions.
+
+    Use it to repair the table, e.g. after the machine's timezone changed or
+    rows were edited with the triggers disabled. Pass `user_id` to rebuild a
+    single user.
+    """
+    if conn is None:
+        with transaction("IMMEDIATE") as conn:
+            return rebuild_rollups(conn, user_id)
+
+    where = "" if user_id is None else "WHERE user_id = ?"
+    params = () if user_id is None else (user_id,)
+    conn.execute(f"DELETE FROM monthly_rollups {where}", params)
+    conn.execute(f'''
+        INSERT INTO monthly_rollups (user_id, year_month, transaction_type, category, total, count)
+        SELECT user_id, {_YEAR_MONTH.format(row="transactions")}, transaction_type, category,
+               SUM(amount), COUNT(*)
+        FROM transactions
+        {where}
+        GROUP BY 1, 2, 3, 4
+    ''', params)
+    return conn.execute(f"SELECT COUNT(*) FROM monthly_rollups {where}", params).fetchone()[0]
+
+
+if __name__ == "__main__":
+    print(f"Rebuilt {rebuild_rollups()} monthly rollup rows")
@@ -1,23 +1,124 @@
 #src/main.py
 
+import time
+STARTED_AT = time.perf_counter()
+
+import argparse
+import importlib
 import sys
+from PyQt5.QtCore import QObject, QEvent, QTimer
 from PyQt5.QtWidgets import QApplication
 from views.main_window import MainWindow
-from database.database import initialize_database 
+from views.components import get_runner
+from database.database import initialize_database
+from utils.log import configure_logging, get_logger
+
+IMPORTS_DONE_AT = time.perf_counter()
+
+logger = get_logger(__name__)
+
+# Loaded in the background once the login screen is up, so the first
+# navigation after login does not pay for them
+WARM_UP_MODULES = [
+    "bcrypt",
+    "controllers.user_controller",
+    "controllers.transaction_controller",
+    "controllers.budget_controller",
+    "controllers.saving_controller",
+    "controllers.dashboard_service",
+    "matplotlib.figure",
+    "matplotlib.backends.backend_qt5agg",
+    "views.pages.dashboard_page",
+    "views.pages.transaction_page",
+    "views.pages.budget_page",
+    "views.pages.saving_page",
+]
+
+# Modules that must not be imported before the first paint
+HEAVY_MODULES = ["matplotlib", "bcrypt", "numpy", "views.pages.dashboard_page"]
+
+
+def warm_up():
+    # The log writer thread and logging.handlers are not needed for the
+    # first paint; until now warnings go to stderr
+    configure_logging()
+    for name in WARM_UP_MODULES:
+        importlib.import_module(name)
+
+
+class FirstPaintWatcher(QObject):
+    """Calls `callback` once, right after the watched widget first paints."""
+
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            # Let this paint finish before running the callback
+            QTimer.singleShot(0, self.callback)
+        return False
+
+
+def report_startup(times, heavy_modules):
+    print("Startup profile")
+    print(f"  imports          : {(times['imports'] - STARTED_AT) * 1000:8.1f} ms")
+    print(f"  database ready   : {(times['database'] - STARTED_AT) * 1000:8.1f} ms")
+    print(f"  window created   : {(times['window'] - STARTED_AT) * 1000:8.1f} ms")
+    print(f"  first paint      : {(times['first_paint'] - STARTED_AT) * 1000:8.1f} ms")
+    print(f"  warm-up finished : {(times['warm_up'] - STARTED_AT) * 1000:8.1f} ms")
+    print(f"  modules loaded   : {times['modules']} before first paint")
+    print(f"  heavy imports before first paint: {', '.join(heavy_modules) or 'none'}")
+
 
 def main():
+    parser = argparse.ArgumentParser(prog="signance")
+    parser.add_argument(
+        "--startup-profile", action="store_true",
+        help="print import time and time to first paint, then exit"
+    )
+    args, qt_args = parser.parse_known_args()
+    times = {"imports": IMPORTS_DONE_AT}
+
     # Initialize database
-    initialize_database() 
-    
-    # Inisialisasi aplikasich
-    app = QApplication(sys.argv)
-    
+    initialize_database()
+    times["database"] = time.perf_counter()
+
+    # Inisialisasi aplikasi
+    app = QApplication(sys.argv[:1] + qt_args)
+    app.aboutToQuit.connect(get_runner().shutdown)
+
     # Menginisialisasi dan menampilkan main window
     window = MainWindow()
+    times["window"] = time.perf_counter()
+
+    def on_warmed_up(error=None):
+        times["warm_up"] = time.perf_counter()
+        if isinstance(error, Exception):
+            logger.warning("Warm-up failed: %s", error)
+        logger.info(
+            "First paint after %.1f ms, warm-up finished after %.1f ms",
+            (times["first_paint"] - STARTED_AT) * 1000, (times["warm_up"] - STARTED_AT) * 1000
+        )
+        if args.startup_profile:
+            report_startup(times, heavy_modules)
+            app.quit()
+
+    heavy_modules = []
+
+    def on_first_paint():
+        times["first_paint"] = time.perf_counter()
+        times["modules"] = len(sys.modules)
+        heavy_modules.extend(name for name in HEAVY_MODULES if name in sys.modules)
+        get_runner().submit(app, warm_up, on_result=on_warmed_up, on_error=on_warmed_up)
+
+    window.first_paint_watcher = FirstPaintWatcher(window, on_first_paint)
     window.show()
-    
-    # Run 
+
+    # Run
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
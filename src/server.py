@@ -0,0 +1,570 @@
+#src/server.py
+# Description : Local HTTP/JSON API over the controllers, standard library only
+
+import argparse
+import asyncio
+import json
+import re
+import secrets
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qsl
+from database.database import configure_pool, initialize_database
+from database.money import from_minor_units, to_minor_units
+import controllers
+from models.transaction import TransactionType, Category
+from utils.helpers import json_default
+from utils.log import configure_logging, get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 8
+# Requests allowed to wait for a worker; beyond this the server answers 503
+QUEUE_PER_WORKER = 16
+SESSION_TTL = 12 * 60 * 60
+MAX_BODY_BYTES = 1024 * 1024
+MAX_HEADER_BYTES = 16 * 1024
+# Largest amount accepted, so sums of many rows stay far inside SQLite's 64-bit integers
+MAX_AMOUNT = Decimal(10) ** 12
+
+TRANSACTION_TYPES = {t.value for t in TransactionType}
+CATEGORIES = {c.value for c in Category}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(message or HTTPStatus(status).phrase)
+        self.status = status
+
+
+class Request:
+    def __init__(self, method, path, query, headers, body):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+        self.params = {}
+        self.user_id = None
+        self.token = None
+
+    def json(self):
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise HTTPError(400, "body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "body must be a JSON object")
+        return data
+
+
+class Sessions:
+    """Bearer tokens of logged-in users, kept in memory with a sliding expiry."""
+
+    def __init__(self, ttl=SESSION_TTL):
+        self.ttl = ttl
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def create(self, user_id, username):
+        token = secrets.token_urlsafe(32)
+        with self._lock:
+            self._tokens[token] = [user_id, username, time.monotonic() + self.ttl]
+        return token
+
+    def user(self, token):
+        """Return [user_id, username, expiry] for a live token, else None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._tokens.get(token)
+            if entry is None:
+                return None
+            if entry[2] < now:
+                del self._tokens[token]
+                return None
+            entry[2] = now + self.ttl
+            return entry
+
+    def drop(self, token):
+        with self._lock:
+            self._tokens.pop(token, None)
+
+
+# Request body and query helpers; bad input is a 400
+
+def encode(body):
+    return json.dumps(body, default=json_default).encode("utf-8")
+
+
+def field(data, name, convert=str, required=True, default=None):
+    value = data.get(name)
+    if value is None or value == "":
+        if required:
+            raise HTTPError(400, f"{name} is required")
+        return default
+    try:
+        return convert(value)
+    except (TypeError, ValueError, InvalidOperation):
+        raise HTTPError(400, f"invalid {name}")
+
+
+def _amount(value):
+    amount = Decimal(str(value))
+    if not amount.is_finite() or abs(amount) > MAX_AMOUNT:
+        raise ValueError("amount out of range")
+    # Rounded as it will be stored, so 0.001 is checked as 0.00
+    return from_minor_units(to_minor_units(amount))
+
+
+def positive_amount(value):
+    amount = _amount(value)
+    if amount <= 0:
+        raise ValueError("amount must be positive")
+    return amount
+
+
+def non_negative_amount(value):
+    amount = _amount(value)
+    if amount < 0:
+        raise ValueError("amount must not be negative")
+    return amount
+
+
+def text(value):
+    if not isinstance(value, str):
+        raise ValueError("not a string")
+    return value
+
+
+def iso_date(value):
+    return date.fromisoformat(str(value))
+
+
+def choice(values):
+    def convert(value):
+        value = str(value)
+        if value not in values:
+            raise ValueError(value)
+        return value
+    return convert
+
+
+def owned(record, request, kind):
+    if record is None or record.user_id != request.user_id:
+        raise HTTPError(404, f"{kind} not found")
+    return record
+
+
+class Api:
+    """Route table and handlers.
+
+    Handlers are plain functions run on the worker pool, so they can call
+    the blocking controllers (SQLite, bcrypt) directly. They return the
+    JSON body, or (status, body); call() encodes it on the same thread.
+    """
+
+    def __init__(self, sessions):
+        self.sessions = sessions
+        self.users = controllers.UserController()
+        self.transactions = controllers.TransactionController()
+        self.budgets = controllers.BudgetController()
+        self.savings = controllers.SavingsController()
+        self.dashboard = controllers.DashboardService()
+        # (method, compiled path, handler, needs a session)
+        self.routes = [
+            ("POST", "/register", self.register, False),
+            ("POST", "/login", self.login, False),
+            ("POST", "/logout", self.logout, True),
+            ("GET", "/me", self.me, True),
+            ("GET", "/transactions", self.list_transactions, True),
+            ("POST", "/transactions", self.create_transaction, True),
+            ("GET", "/transactions/{id}", self.get_transaction, True),
+            ("PUT", "/transactions/{id}", self.update_transaction, True),
+            ("DELETE", "/transactions/{id}", self.delete_transaction, True),
+            ("GET", "/budgets", self.list_budgets, True),
+            ("POST", "/budgets", self.create_budget, True),
+            ("GET", "/budgets/{id}", self.get_budget, True),
+            ("PUT", "/budgets/{id}", self.update_budget, True),
+            ("DELETE", "/budgets/{id}", self.delete_budget, True),
+            ("GET", "/savings", self.list_savings, True),
+            ("POST", "/savings", self.create_saving, True),
+            ("GET", "/savings/{id}", self.get_saving, True),
+            ("PUT", "/savings/{id}", self.update_saving, True),
+            ("DELETE", "/savings/{id}", self.delete_saving, True),
+            ("GET", "/reports/totals", self.report_totals, True),
+            ("GET", "/reports/dashboard", self.report_dashboard, True),
+        ]
+        self.routes = [
+            (method, re.compile("^" + re.sub(r"\{(\w+)\}", r"(?P<\1>\\d+)", path) + "$"), handler, private)
+            for method, path, handler, private in self.routes
+        ]
+
+    def resolve(self, method, path):
+        """Return (handler, path params, needs a session) or raise 404/405."""
+        allowed = []
+        for route_method, pattern, handler, private in self.routes:
+            match = pattern.match(path)
+            if match:
+                if route_method == method:
+                    return handler, {name: int(value) for name, value in match.groupdict().items()}, private
+                allowed.append(route_method)
+        raise HTTPError(405 if allowed else 404)
+
+    def call(self, handler, request):
+        """Run `handler` and encode its result; runs on a worker thread."""
+        try:
+            result = handler(request)
+            status, body = result if isinstance(result, tuple) else (200, result)
+        except HTTPError as e:
+            status, body = e.status, {"error": str(e)}
+        except Exception as e:
+            logger.exception("Error handling %s %s", request.method, request.path)
+            status, body = 500, {"error": "internal error"}
+        return status, encode(body)
+
+    # Users
+
+    def register(self, request):
+        data = request.json()
+        success, message = self.users.register(
+            field(data, "username"), field(data, "email"), field(data, "password")
+        )
+        if not success:
+            raise HTTPError(409, message)
+        return 201, {"registered": data["username"]}
+
+    def login(self, request):
+        data = request.json()
+        user = self.users.login(field(data, "username"), field(data, "password"))
+        if user is None:
+            raise HTTPError(401, "invalid username or password")
+        return {"user_id": user[0], "username": user[1], "token": self.sessions.create(user[0], user[1])}
+
+    def logout(self, request):
+        self.sessions.drop(request.token)
+        return {"logged_out": True}
+
+    def me(self, request):
+        return {"user_id": request.user_id}
+
+    # Transactions
+
+    def list_transactions(self, request):
+        query = request.query
+        filters = {
+            "transaction_type": field(query, "type", choice(TRANSACTION_TYPES), required=False),
+            "category": field(query, "category", choice(CATEGORIES), required=False),
+            "start": field(query, "start", iso_date, required=False),
+            "end": field(query, "end", iso_date, required=False),
+        }
+        after = None
+        if query.get("after"):
+            try:
+                after_date, after_id = json.loads(query["after"])
+                after = (str(after_date), int(after_id))
+            except (TypeError, ValueError):
+                raise HTTPError(400, "invalid after")
+        limit = min(field(query, "limit", int, required=False, default=50), 1000)
+        transactions, next_cursor = self.transactions.list_transactions(
+            request.user_id, after=after, limit=max(limit, 1), filters=filters
+        )
+        return {"transactions": transactions, "next": json.dumps(list(next_cursor)) if next_cursor else None}
+
+    def create_transaction(self, request):
+        data = request.json()
+        transaction_id = self.transactions.create_transaction(
+            request.user_id,
+            field(data, "amount", positive_amount),
+            field(data, "category", choice(CATEGORIES)),
+            field(data, "transaction_type", choice(TRANSACTION_TYPES)),
+            field(data, "description", required=False),
+            skip_duplicates=bool(data.get("skip_duplicates")),
+        )
+        if transaction_id is None:
+            raise HTTPError(409 if data.get("skip_duplicates") else 500, "transaction not created")
+        return 201, self.transactions.get_transaction_by_id(transaction_id)
+
+    def get_transaction(self, request):
+        return owned(self.transactions.get_transaction_by_id(request.params["id"]), request, "transaction")
+
+    def update_transaction(self, request):
+        current = self.get_transaction(request)
+        data = request.json()
+        updated = self.transactions.update_transaction(
+            current.transaction_id,
+            field(data, "amount", positive_amount, required=False, default=current.amount),
+            field(data, "category", choice(CATEGORIES), required=False, default=current.category),
+            field(data, "transaction_type", choice(TRANSACTION_TYPES), required=False,
+                  default=current.transaction_type.value),
+            # null or "" clears the description
+            field(data, "description", text, required=False) if "description" in data else current.description,
+        )
+        if not updated:
+            raise HTTPError(500, "transaction not updated")
+        return self.transactions.get_transaction_by_id(current.transaction_id)
+
+    def delete_transaction(self, request):
+        current = self.get_transaction(request)
+        self.transactions.delete_transaction(current.transaction_id)
+        return {"deleted": current.transaction_id}
+
+    # Budgets
+
+    def list_budgets(self, request):
+        if request.query.get("active") in ("1", "true"):
+            return self.budgets.get_active_budgets(request.user_id)
+        return self.budgets.get_all_budgets(request.user_id)
+
+    def create_budget(self, request):
+        data = request.json()
+        category, amount = field(data, "category", choice(CATEGORIES)), field(data, "amount", positive_amount)
+        start_date, end_date = field(data, "start_date", iso_date), field(data, "end_date", iso_date)
+        if start_date > end_date:
+            raise HTTPError(400, "start_date is after end_date")
+        budget = self.budgets.create_budget(request.user_id, category, amount, start_date, end_date)
+        if budget is None:
+            raise HTTPError(500, "budget not created")
+        return 201, budget
+
+    def get_budget(self, request):
+        return owned(self.budgets.get_budget_by_id(request.params["id"]), request, "budget")
+
+    def update_budget(self, request):
+        current = self.get_budget(request)
+        data = request.json()
+        amount = field(data, "amount", positive_amount, required=False)
+        start_date = field(data, "start_date", iso_date, required=False)
+        end_date = field(data, "end_date", iso_date, required=False)
+        if (start_date or current.start_date.date()) > (end_date or current.end_date.date()):
+            raise HTTPError(400, "start_date is after end_date")
+        success, message = self.budgets.update_budget(current.budget_id, amount, start_date, end_date)
+        if not success:
+            raise HTTPError(500, message)
+        return self.budgets.get_budget_by_id(current.budget_id)
+
+    def delete_budget(self, request):
+        current = self.get_budget(request)
+        success, message = self.budgets.delete_budget(current.budget_id)
+        if not success:
+            raise HTTPError(500, message)
+        return {"deleted": current.budget_id}
+
+    # Savings
+
+    def list_savings(self, request):
+        return self.savings.get_all_savings(request.user_id)
+
+    def create_saving(self, request):
+        data = request.json()
+        saving = self.savings.create_saving(
+            request.user_id, field(data, "name"),
+            field(data, "target_amount", positive_amount), field(data, "deadline", iso_date)
+        )
+        if saving is None:
+            raise HTTPError(500, "saving goal not created")
+        return 201, saving
+
+    def get_saving(self, request):
+        return owned(self.savings.get_saving_by_id(request.params["id"]), request, "saving goal")
+
+    def update_saving(self, request):
+        current = self.get_saving(request)
+        data = request.json()
+        # Everything is validated before anything is written
+        changes = (
+            field(data, "name", text, required=False),
+            field(data, "target_amount", positive_amount, required=False),
+            field(data, "deadline", iso_date, required=False),
+        )
+        current_amount = field(data, "current_amount", non_negative_amount, required=False)
+        if any(change is not None for change in changes) and self.savings.update_saving(current.saving_id, *changes) is None:
+            raise HTTPError(500, "saving goal not updated")
+        if current_amount is not None and not self.savings.update_current_amount(current.saving_id, current_amount):
+            raise HTTPError(500, "saving goal not updated")
+        return self.savings.get_saving_by_id(current.saving_id)
+
+    def delete_saving(self, request):
+        current = self.get_saving(request)
+        self.savings.delete_saving(current.saving_id)
+        return {"deleted": current.saving_id}
+
+    # Reports
+
+    def report_totals(self, request):
+        query = request.query
+        # Whole months by default, which aggregate() answers from monthly_rollups
+        end = field(query, "end", iso_date, required=False, default=date(date.today().year, 12, 31))
+        start = field(query, "start", iso_date, required=False, default=date(end.year, 1, 1))
+        group_by = [group for group in query.get("group_by", "type").split(",") if group]
+        try:
+            result = self.transactions.aggregate(
+                request.user_id, start, end, bucket=query.get("bucket", "month"), group_by=group_by,
+                transaction_type=field(query, "type", choice(TRANSACTION_TYPES), required=False)
+            )
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        return {
+            bucket: {"/".join(group) or "total": total for group, total in groups.items()}
+            for bucket, groups in result.items()
+        }
+
+    def report_dashboard(self, request):
+        snapshot = self.dashboard.snapshot(
+            request.user_id, field(request.query, "as_of", iso_date, required=False)
+        )
+        if snapshot is None:
+            raise HTTPError(500, "dashboard snapshot failed")
+        return {
+            "as_of": snapshot.as_of,
+            "months": snapshot.months,
+            "monthly_spending": snapshot.monthly_spending,
+            "monthly_income": snapshot.monthly_income,
+            "category_spending": dict(snapshot.category_spending),
+            "category_budgets": dict(snapshot.category_budgets),
+        }
+
+
+class Server:
+    """HTTP/1.1 with keep-alive on asyncio streams.
+
+    Parsing, routing and token checks run on the event loop; every handler
+    runs, and its response is encoded, on a fixed pool of `workers`
+    threads, one pooled SQLite connection each.
+    At most `workers * QUEUE_PER_WORKER` requests wait for a thread, further
+    ones get 503 instead of piling up.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS):
+        self.sessions = Sessions()
+        self.api = Api(self.sessions)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="signance-api")
+        self.slots = asyncio.BoundedSemaphore(workers * QUEUE_PER_WORKER)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self.read_request(reader)
+                except HTTPError as e:
+                    await self.respond(writer, e.status, encode({"error": str(e)}), keep_alive=False)
+                    break
+                if request is None:
+                    break
+                status, payload = await self.dispatch(request)
+                keep_alive = request.headers.get("connection", "").lower() != "close"
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader):
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return None
+            raise HTTPError(400, "incomplete request")
+        except asyncio.LimitOverrunError:
+            raise HTTPError(431)
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(400, "invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413)
+        body = await reader.readexactly(length) if length else b""
+        url = urlsplit(target)
+        return Request(method.upper(), url.path.rstrip("/") or "/", dict(parse_qsl(url.query)), headers, body)
+
+    async def dispatch(self, request):
+        """Return (status, encoded body) for `request`."""
+        try:
+            handler, request.params, private = self.api.resolve(request.method, request.path)
+            if private:
+                scheme, _, token = request.headers.get("authorization", "").partition(" ")
+                entry = self.sessions.user(token) if scheme.lower() == "bearer" else None
+                if entry is None:
+                    raise HTTPError(401, "missing or expired session token")
+                request.user_id, request.token = entry[0], token
+            if self.slots.locked():
+                raise HTTPError(503, "server busy")
+            async with self.slots:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self.executor, self.api.call, handler, request
+                )
+        except HTTPError as e:
+            return e.status, encode({"error": str(e)})
+
+    async def respond(self, writer, status, payload, keep_alive=True):
+        writer.write(
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + payload
+        )
+        await writer.drain()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+        if ready is not None:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="signance-server", description="Local HTTP/JSON API for Signance")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="interface to bind (default: %(default)s, local only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="threads for SQLite and bcrypt work")
+    parser.add_argument("--database", help="SQLite file to use instead of the default database")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    # One pooled connection per worker thread
+    configure_pool(path=args.database, pool_size=args.workers)
+    initialize_database()
+    server = Server(args.workers)
+
+    def ready(listener):
+        host, port = listener.sockets[0].getsockname()[:2]
+        logger.info("Listening on http://%s:%s", host, port)
+        # benchmarks/load_test.py reads the address from this line
+        print(f"Signance API listening on http://{host}:{port}", flush=True)
+
+    try:
+        asyncio.run(server.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,32 @@
 # src/utils/__init__.py
 # Description : Module initialization
 
-from .helpers import format_currency, validate_email, hash_password, decrypt_password
+import importlib
 
-__all__ = ['format_currency', 'validate_email', 'hash_password', 'decrypt_password']
\ No newline at end of file
+# Helpers are imported on first access (PEP 562), so importing utils.log
+# from the database layer does not load the parsers and the tracer
+_UTILITY_MODULES = {
+    'format_currency': '.helpers',
+    'validate_email': '.helpers',
+    'hash_password': '.helpers',
+    'decrypt_password': '.helpers',
+    'json_default': '.helpers',
+    'ParseError': '.bank_parsers',
+    'parse_bank_file': '.bank_parsers',
+    'tracer': '.tracing',
+    'span': '.tracing',
+    'traced': '.tracing',
+    'trace_methods': '.tracing',
+    'get_logger': '.log',
+    'configure_logging': '.log',
+}
+
+def __getattr__(name):
+    module = _UTILITY_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+__all__ = list(_UTILITY_MODULES)
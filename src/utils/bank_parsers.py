@@ -0,0 +1,346 @@
+# src/utils/bank_parsers.py
+# Description : Streaming parsers for CSV, OFX and QIF bank exports
+
+import csv
+import os
+import re
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from models.transaction import Transaction, TransactionType, Category
+
+DEFAULT_CATEGORY = Category.OTHER.value
+CATEGORY_VALUES = {c.value for c in Category}
+
+# Header names recognised in CSV exports, compared case-insensitively
+CSV_COLUMNS = {
+    "date": ["date", "transaction date", "posted date", "posting date", "booking date", "value date"],
+    "amount": ["amount", "transaction amount", "value"],
+    "debit": ["debit", "withdrawal", "money out", "paid out"],
+    "credit": ["credit", "deposit", "money in", "paid in"],
+    "description": ["description", "memo", "payee", "name", "details", "narrative", "reference"],
+    "category": ["category"],
+    "type": ["type", "transaction type"],
+}
+
+DATE_FORMATS = [
+    "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y/%m/%d", "%d/%m/%Y", "%m/%d/%Y",
+    "%d-%m-%Y", "%d.%m.%Y", "%Y%m%d", "%m/%d/%y", "%d/%m/%y",
+]
+# datetime.fromisoformat, tried before DATE_FORMATS
+ISO_FORMAT = "iso"
+# Formats that read dates such as 01/02/2024 differently
+AMBIGUOUS_FORMATS = [{"%d/%m/%Y", "%m/%d/%Y"}, {"%d/%m/%y", "%m/%d/%y"}]
+# CSV rows held back waiting for an unambiguous date, so memory stays bounded
+MAX_HELD_ROWS = 200
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)")
+
+
+class ParseError(ValueError):
+    """A row that could not be turned into a transaction."""
+
+    def __init__(self, message, line=None):
+        super().__init__(message if line is None else f"line {line}: {message}")
+        self.line = line
+
+
+class ProgressCounter:
+    """Characters consumed so far, for progress reporting while streaming."""
+
+    def __init__(self, total=0):
+        self.total = total
+        self.read = 0
+
+    @property
+    def fraction(self):
+        return min(1.0, self.read / self.total) if self.total else 0.0
+
+
+def _counted_lines(handle, counter):
+    for line in handle:
+        counter.read += len(line)
+        yield line
+
+
+def parse_amount(text):
+    """Parse '1,234.56', '(12.00)', '-12', 'Rp 5.000,00' style amounts to a Decimal."""
+    cleaned = re.sub(r"[^\d,.\-()+]", "", text or "")
+    if not cleaned:
+        raise ParseError(f"missing amount {text!r}")
+    negative = cleaned.startswith("(") and cleaned.endswith(")") or cleaned.startswith("-")
+    cleaned = cleaned.strip("()+-")
+    # The last separator is the decimal one when it is followed by 1-2 digits
+    last = max(cleaned.rfind(","), cleaned.rfind("."))
+    if last != -1 and len(cleaned) - last - 1 in (1, 2):
+        cleaned = cleaned[:last].replace(",", "").replace(".", "") + "." + cleaned[last + 1:]
+    else:
+        cleaned = cleaned.replace(",", "").replace(".", "")
+    try:
+        amount = Decimal(cleaned)
+    except InvalidOperation:
+        raise ParseError(f"invalid amount {text!r}")
+    return -amount if negative else amount
+
+
+class DateParser:
+    """Parse the dates of one bank export, all with the same format.
+
+    Without a date_format, every format that has parsed all dates so far
+    stays a candidate, and the parser settles on one as soon as no
+    day-first/month-first pair is left. Until then a date such as
+    01/02/2024 is ambiguous: is_ambiguous() reports it so callers can hold
+    the row back, and calling the parser on it raises ParseError rather
+    than guess. After settling, every date is parsed with a single attempt.
+    """
+
+    def __init__(self, date_format=None):
+        self.formats = [date_format] if date_format else [ISO_FORMAT] + DATE_FORMATS
+        self._settle()
+
+    @property
+    def settled(self):
+        """True once no remaining candidates could read a date two ways."""
+        return len(self.formats) == 1
+
+    def _settle(self):
+        candidates = set(self.formats)
+        if not any(pair <= candidates for pair in AMBIGUOUS_FORMATS):
+            del self.formats[1:]
+
+    def _values(self, text):
+        """{format: value} for every candidate format that parses `text`."""
+        values = {}
+        for fmt in self.formats:
+            try:
+                values[fmt] = datetime.fromisoformat(text) if fmt == ISO_FORMAT else datetime.strptime(text, fmt)
+            except ValueError:
+                continue
+        if values and len(values) < len(self.formats):
+            self.formats = [fmt for fmt in self.formats if fmt in values]
+            self._settle()
+        return values
+
+    def is_ambiguous(self, text):
+        """Narrow the candidates with `text`; True if they still read it differently."""
+        text = (text or "").strip()
+        return bool(text) and len(set(self._values(text).values())) > 1
+
+    def __call__(self, text):
+        text = (text or "").strip()
+        if not text:
+            raise ParseError("missing date")
+        values = set(self._values(text).values())
+        if not values:
+            raise ParseError(f"unrecognised date {text!r}")
+        if len(values) > 1:
+            raise ParseError(f"ambiguous date {text!r}: day/month order unknown, pass date_format")
+        return values.pop()
+
+
+def parse_date(text, date_format=None):
+    """Parse one bank date with `date_format`, or any common format that reads it one way."""
+    return DateParser(date_format)(text)
+
+
+def normalize_category(value):
+    value = (value or "").strip().lower()
+    if value in CATEGORY_VALUES:
+        return value
+    if value == "food":
+        return Category.FOODS.value
+    return DEFAULT_CATEGORY
+
+
+def make_transaction(date, amount, description, category=None, transaction_type=None):
+    """Map parsed fields to a Transaction; the sign of `amount` decides the type if none is given."""
+    if transaction_type is None:
+        transaction_type = TransactionType.EXPENSE.value if amount < 0 else TransactionType.INCOME.value
+    return Transaction(
+        user_id=None,
+        amount=abs(amount),
+        category=normalize_category(category),
+        transaction_type=transaction_type,
+        description=(description or "").strip() or None,
+        date=date,
+    )
+
+
+def _find_column(fieldnames, names):
+    lowered = {name.strip().lower(): name for name in fieldnames if name}
+    for name in names:
+        if name in lowered:
+            return lowered[name]
+    return None
+
+
+def parse_csv(handle, mapping=None, date_format=None, delimiter=None):
+    """Yield Transactions from a CSV export.
+
+    `mapping` may name the columns explicitly, e.g. {"date": "Booked",
+    "amount": "EUR"}; anything it leaves out is looked up in CSV_COLUMNS.
+    """
+    lines = iter(handle)
+    if delimiter is None:
+        # Sniff the delimiter from the header line
+        sample = next(lines, "")
+        delimiter = max(",;\t|", key=sample.count)
+        lines = _prepend(sample, lines)
+    reader = csv.reader(lines, delimiter=delimiter)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    mapping = dict(mapping or {})
+    columns = {}
+    for field, names in CSV_COLUMNS.items():
+        column = mapping.get(field) or _find_column(header, names)
+        columns[field] = header.index(column) if column in header else None
+    if columns["date"] is None:
+        raise ParseError("no date column found", line=1)
+    if columns["amount"] is None and columns["debit"] is None and columns["credit"] is None:
+        raise ParseError("no amount, debit or credit column found", line=1)
+
+    parse_row_date = DateParser(date_format)
+
+    def cell(row, field):
+        index = columns[field]
+        return row[index] if index is not None and index < len(row) else ""
+
+    def build(line, row):
+        try:
+            if columns["amount"] is not None:
+                amount = parse_amount(cell(row, "amount"))
+            else:
+                debit, credit = cell(row, "debit").strip(), cell(row, "credit").strip()
+                amount = parse_amount(credit) if credit else -abs(parse_amount(debit))
+            transaction_type = cell(row, "type").strip().lower() or None
+            if transaction_type not in (None, TransactionType.INCOME.value, TransactionType.EXPENSE.value):
+                transaction_type = None
+            return make_transaction(
+                parse_row_date(cell(row, "date")), amount,
+                cell(row, "description"), cell(row, "category"), transaction_type
+            )
+        except ParseError as e:
+            return ParseError(str(e), line=line)
+
+    # Rows held back until a date shows the file's day/month order, so every
+    # row is read with the same format. After MAX_HELD_ROWS they are let go,
+    # and those with ambiguous dates become errors.
+    pending = []
+    for line, row in enumerate(reader, start=2):
+        if not any(row):
+            continue
+        ambiguous = not parse_row_date.settled and parse_row_date.is_ambiguous(cell(row, "date"))
+        if not pending and not ambiguous:
+            yield build(line, row)
+            continue
+        pending.append((line, row))
+        if parse_row_date.settled or len(pending) >= MAX_HELD_ROWS:
+            yield from (build(*held) for held in pending)
+            pending.clear()
+    # The file never settled it: rows with ambiguous dates become errors
+    yield from (build(*held) for held in pending)
+
+
+def _prepend(first, lines):
+    yield first
+    yield from lines
+
+
+def _parse_ofx_date(text):
+    # YYYYMMDD[HHMMSS[.XXX]][[+-]TZ[:NAME]]; the local date is what matters
+    digits = re.match(r"\d{8}(\d{6})?", text.strip())
+    if not digits:
+        raise ParseError(f"invalid OFX date {text!r}")
+    value = digits.group(0)
+    return datetime.strptime(value, "%Y%m%d%H%M%S" if len(value) == 14 else "%Y%m%d")
+
+
+def parse_ofx(handle):
+    """Yield Transactions from an OFX (SGML or XML) statement, one STMTTRN at a time."""
+    record = None
+    for line, text in enumerate(handle, start=1):
+        for closing, tag, value in _OFX_TAG.findall(text):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if closing:
+                    if record is not None:
+                        yield _ofx_transaction(record, line)
+                    record = None
+                else:
+                    record = {}
+            elif record is not None and not closing:
+                record[tag] = value.strip()
+    if record:
+        yield _ofx_transaction(record, None)
+
+
+def _ofx_transaction(record, line):
+    try:
+        description = " - ".join(part for part in (record.get("NAME"), record.get("MEMO")) if part)
+        return make_transaction(
+            _parse_ofx_date(record.get("DTPOSTED", "")), parse_amount(record.get("TRNAMT")), description
+        )
+    except ParseError as e:
+        return ParseError(str(e), line=line)
+
+
+def _parse_qif_date(text, parse):
+    # QIF dates look like 01/31/2024, 1/31'24 or 31/01/2024 depending on the bank
+    text = text.strip().replace("'", "/").replace(" ", "0")
+    parts = text.split("/")
+    if len(parts) == 3 and len(parts[2]) == 2:
+        parts[2] = "20" + parts[2]
+        text = "/".join(parts)
+    return parse(text)
+
+
+def parse_qif(handle, date_format=None):
+    """Yield Transactions from a QIF export; records end with a '^' line."""
+    parse_record_date = DateParser(date_format or "%m/%d/%Y")
+    record = {}
+    start = 1
+    for line, text in enumerate(handle, start=1):
+        text = text.rstrip("\r\n")
+        if not text or text.startswith("!"):
+            continue
+        code, value = text[0], text[1:]
+        if code == "^":
+            if record:
+                try:
+                    description = " - ".join(part for part in (record.get("P"), record.get("M")) if part)
+                    yield make_transaction(
+                        _parse_qif_date(record.get("D", ""), parse_record_date),
+                        parse_amount(record.get("T") or record.get("U")),
+                        description, record.get("L")
+                    )
+                except ParseError as e:
+                    yield ParseError(str(e), line=start)
+            record = {}
+            start = line + 1
+        else:
+            record.setdefault(code, value)
+
+
+PARSERS = {"csv": parse_csv, "ofx": parse_ofx, "qfx": parse_ofx, "qif": parse_qif}
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension not in PARSERS:
+        raise ParseError(f"unsupported file type {extension!r}")
+    return extension
+
+
+def parse_bank_file(path, file_format=None, counter=None, **options):
+    """Stream Transactions (or ParseError items for bad rows) from a bank export.
+
+    Memory use is constant: the file is read line by line. Pass a
+    ProgressCounter to follow how much of the file has been consumed.
+    """
+    parser = PARSERS[file_format or detect_format(path)]
+    if counter is not None:
+        counter.total = os.path.getsize(path)
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as handle:
+        lines = _counted_lines(handle, counter) if counter is not None else handle
+        yield from parser(lines, **options)
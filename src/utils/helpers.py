@@ -1,6 +1,8 @@
 #src/utils/helpers.py
-import bcrypt
 import re
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
 
 def format_currency(amount: float) -> str:
     return f'${amount:,.2f}'
@@ -9,9 +11,23 @@ def validate_email(email: str) -> bool:
     return re.match(r"[^@]+@[^@]+\.[^@]+", email) is not None
 
 def hash_password(password: str) -> str:
-    print(f"Hashing password: {password}")
-
+    # bcrypt is only needed at login/registration, keep it off the startup path
+    import bcrypt
     return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
 def decrypt_password(password_input: str, password_hash: str) -> bool:
+    import bcrypt
     return bcrypt.checkpw(password_input.encode(), password_hash.encode())
+
+
+def json_default(value):
+    """json.dumps default for the Decimal, date, Enum and model values controllers return."""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
@@ -0,0 +1,116 @@
+# src/utils/log.py
+# Description : Leveled per-module loggers written to rotating files from a background thread
+
+import atexit
+import logging
+import os
+import re
+import sys
+
+# SIGNANCE_LOG_LEVEL sets the level (DEBUG, INFO, WARNING, ...) and
+# SIGNANCE_LOG_DIR where signance.log and its rotated copies are kept
+ENV_LEVEL = "SIGNANCE_LOG_LEVEL"
+ENV_DIR = "SIGNANCE_LOG_DIR"
+
+ROOT = "signance"
+DEFAULT_LEVEL = "INFO"
+DEFAULT_LOG_DIR = os.path.join(os.path.expanduser("~"), ".signance", "logs")
+LOG_FILE = "signance.log"
+MAX_BYTES = 2 * 2 ** 20
+BACKUP_COUNT = 5
+FORMAT = "%(asctime)s %(levelname)-7s %(threadName)s %(name)s: %(message)s"
+
+# Masks credentials that reach a message anyway, e.g. inside an exception text
+_SECRETS = [
+    (re.compile(r"\$2[abxy]?\$\d{2}\$[./A-Za-z0-9]{53}"), "<password hash>"),
+    (re.compile(r"(?i)(?<![a-z])(password|passwd|token|secret)(\w*[\"']?\s*[:=]\s*[\"']?)[^\s,;\"'}]+"), r"\1\2<redacted>"),
+]
+
+_listener = None
+
+
+def get_logger(name):
+    """Logger for a module, e.g. get_logger(__name__).
+
+    Messages take %-style arguments (logger.debug("total %s", value)) so
+    nothing is formatted for a level that is switched off.
+    """
+    return logging.getLogger(f"{ROOT}.{name}")
+
+
+def redact(text):
+    for pattern, replacement in _SECRETS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def _queue_handler_class():
+    from logging.handlers import QueueHandler
+
+    class RedactingQueueHandler(QueueHandler):
+        """Formats on the calling thread, masks secrets, hands off to the queue."""
+
+        def prepare(self, record):
+            record = super().prepare(record)
+            record.msg = record.message = redact(record.msg)
+            return record
+    return RedactingQueueHandler
+
+
+def configure_logging(level=None, log_dir=None, console_level=logging.WARNING):
+    """Send every Signance logger through a queue to a rotating log file.
+
+    Callers only put records on an unbounded queue; a QueueListener thread
+    does the file (and console) writes. Warnings and errors also go to
+    stderr, never stdout, so command output stays clean. Calling it again
+    reconfigures. Returns the log file path, or None if it is not writable.
+    """
+    global _listener
+    import queue
+    from logging.handlers import QueueListener, RotatingFileHandler
+
+    level = level or os.environ.get(ENV_LEVEL) or DEFAULT_LEVEL
+    log_dir = log_dir or os.environ.get(ENV_DIR) or DEFAULT_LOG_DIR
+    shutdown_logging()
+
+    formatter = logging.Formatter(FORMAT)
+    console = logging.StreamHandler(sys.stderr)
+    console.setLevel(console_level)
+    console.setFormatter(formatter)
+    handlers = [console]
+    path = os.path.join(log_dir, LOG_FILE)
+    try:
+        os.makedirs(log_dir, exist_ok=True)
+        file_handler = RotatingFileHandler(path, maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT, encoding="utf-8")
+    except OSError as e:
+        path = None
+        print(f"Logging to stderr only, cannot write {log_dir}: {e}", file=sys.stderr)
+    else:
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+    records = queue.SimpleQueue()
+    logger = logging.getLogger(ROOT)
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.handlers = [_queue_handler_class()(records)]
+    logger.propagate = False
+
+    _listener = QueueListener(records, *handlers, respect_handler_level=True)
+    _listener.start()
+    return path
+
+
+def shutdown_logging():
+    """Write out what is queued and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        logger = logging.getLogger(ROOT)
+        logger.handlers = []
+        logger.propagate = True
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
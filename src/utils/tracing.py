@@ -0,0 +1,214 @@
+# src/utils/tracing.py
+# Description : Nested timing spans kept in a ring buffer, saved as Chrome/Perfetto traces
+
+import atexit
+import functools
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+import types
+from collections import deque
+from contextlib import nullcontext
+from datetime import datetime
+
+# SIGNANCE_TRACE=1 records from startup and saves the trace at exit, to
+# SIGNANCE_TRACE_FILE or a new file in DEFAULT_TRACE_DIR
+ENV_ENABLED = "SIGNANCE_TRACE"
+ENV_FILE = "SIGNANCE_TRACE_FILE"
+
+DEFAULT_TRACE_DIR = os.path.join(os.path.expanduser("~"), ".signance", "traces")
+# Oldest events are dropped once this many are buffered
+DEFAULT_CAPACITY = 100000
+
+# Returned by span() while tracing is off, so a disabled span costs one check
+_NO_SPAN = nullcontext()
+
+
+class Tracer:
+    """Collects trace events from any thread.
+
+    Spans become Chrome "complete" events on the thread that ran them; the
+    viewer nests them by time, so nothing has to track a span stack. Events
+    are tuples in a bounded deque (appends are thread-safe) and are only
+    turned into JSON by dump().
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.enabled = False
+        self._events = deque(maxlen=capacity)
+        self._threads = {}
+        self._flow_ids = itertools.count(1)
+
+    def _tid(self):
+        tid = threading.get_native_id()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        return tid
+
+    def complete(self, name, category, start, end, args=None):
+        """Record a span from perf_counter() `start` to `end` on this thread."""
+        self._events.append(("X", name, category, start, end - start, self._tid(), args, None))
+
+    def instant(self, name, category="app", args=None):
+        self._events.append(("i", name, category, time.perf_counter(), 0.0, self._tid(), args, None))
+
+    def flow_start(self, name, category="task"):
+        """Start an arrow from the current span; returns the id for flow_end()."""
+        flow_id = next(self._flow_ids)
+        self._events.append(("s", name, category, time.perf_counter(), 0.0, self._tid(), None, flow_id))
+        return flow_id
+
+    def flow_end(self, flow_id, name, category="task"):
+        """End the arrow at the span enclosing this point, possibly on another thread."""
+        self._events.append(("f", name, category, time.perf_counter(), 0.0, self._tid(), None, flow_id))
+
+    def clear(self):
+        self._events.clear()
+
+    def __len__(self):
+        return len(self._events)
+
+    def to_chrome(self):
+        """The buffered events in Chrome trace event format."""
+        pid = os.getpid()
+        trace = [{"ph": "M", "name": "process_name", "pid": pid, "tid": 0, "args": {"name": "Signance"}}]
+        trace.extend(
+            {"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(self._threads.items())
+        )
+        for phase, name, category, start, duration, tid, args, flow_id in list(self._events):
+            event = {"ph": phase, "name": name, "cat": category, "ts": start * 1e6, "pid": pid, "tid": tid}
+            if phase == "X":
+                event["dur"] = duration * 1e6
+            elif phase == "i":
+                event["s"] = "t"
+            else:
+                event["id"] = flow_id
+                if phase == "f":
+                    event["bp"] = "e"
+            if args:
+                event["args"] = args
+            trace.append(event)
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def dump(self, path=None):
+        """Write the trace as JSON for chrome://tracing or ui.perfetto.dev; returns the path."""
+        if path is None:
+            os.makedirs(DEFAULT_TRACE_DIR, exist_ok=True)
+            path = os.path.join(DEFAULT_TRACE_DIR, f"trace-{datetime.now():%Y%m%d-%H%M%S}.json")
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.to_chrome(), handle)
+        return path
+
+
+tracer = Tracer()
+
+
+class _Span:
+    __slots__ = ("name", "category", "args", "start")
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        tracer.complete(self.name, self.category, self.start, time.perf_counter(), self.args)
+        return False
+
+
+def span(name, category="app", **args):
+    """Context manager timing its body as one span; `args` show in the viewer."""
+    if not tracer.enabled:
+        return _NO_SPAN
+    return _Span(name, category, args or None)
+
+
+def traced(fn=None, *, name=None, category="app"):
+    """Decorator recording each call as a span named after the function."""
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                tracer.complete(label, category, start, time.perf_counter())
+        return wrapper
+    return decorate(fn) if fn is not None else decorate
+
+
+def trace_methods(category):
+    """Class decorator applying traced() to every public method."""
+    def decorate(cls):
+        for attribute, value in list(vars(cls).items()):
+            if not attribute.startswith("_") and isinstance(value, types.FunctionType):
+                setattr(cls, attribute, traced(value, name=f"{cls.__name__}.{attribute}", category=category))
+        return cls
+    return decorate
+
+
+def carry(fn, name, category="task"):
+    """Wrap `fn` for another thread: the call becomes a span there, with an
+    arrow from the span that handed it over."""
+    if not tracer.enabled:
+        return fn
+    flow_id = tracer.flow_start(name, category)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        tracer.flow_end(flow_id, name, category)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            tracer.complete(name, category, start, time.perf_counter())
+    return wrapper
+
+
+def _sql_span(statement, caller, started, execute_time, fetch_time, rows):
+    tracer.complete(
+        statement[:60], "sql", started, started + execute_time + fetch_time,
+        {"statement": statement, "caller": caller, "rows": rows,
+         "execute_ms": execute_time * 1000, "fetch_ms": fetch_time * 1000}
+    )
+
+
+def enable():
+    """Start recording, SQL statements included."""
+    from database import instrumentation
+    tracer.enabled = True
+    instrumentation.add_listener(_sql_span)
+
+
+def disable():
+    """Stop recording; what was recorded stays until clear() or dump()."""
+    from database import instrumentation
+    tracer.enabled = False
+    instrumentation.remove_listener(_sql_span)
+
+
+def is_enabled():
+    return tracer.enabled
+
+
+def _dump_at_exit():
+    if len(tracer):
+        path = tracer.dump(os.environ.get(ENV_FILE) or None)
+        print(f"Trace written to {path}", file=sys.stderr)
+
+
+if os.environ.get(ENV_ENABLED, "").lower() in ("1", "true", "yes", "on"):
+    enable()
+    atexit.register(_dump_at_exit)
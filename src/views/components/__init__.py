@@ -0,0 +1,7 @@
+# src/views/components/__init__.py
+# Description : Module initialization
+
+from .task_runner import TaskRunner, get_runner
+from .page_registry import PageRegistry
+
+__all__ = ['TaskRunner', 'get_runner', 'PageRegistry']
@@ -0,0 +1,58 @@
+# src/views/components/page_registry.py
+# Description : Builds pages on first navigation and tears them down again
+
+from utils.tracing import span
+from .task_runner import get_runner
+
+
+class PageRegistry:
+    """Named page factories backed by a QStackedWidget.
+
+    A page is built the first time get() asks for it and added to the stack.
+    Session pages (the ones that belong to a logged-in user) are removed from
+    the stack and deleted by dispose_session(), so nothing of the previous
+    user survives a logout.
+    """
+
+    def __init__(self, stack):
+        self.stack = stack
+        self._factories = {}
+        self._session = set()
+        self._pages = {}
+
+    def register(self, name, factory, session=False):
+        """Register `factory()` as the builder of page `name`."""
+        self._factories[name] = factory
+        if session:
+            self._session.add(name)
+
+    def get(self, name):
+        """Return page `name`, building it on first use."""
+        page = self._pages.get(name)
+        if page is None:
+            with span("PageRegistry.build", "ui", page=name):
+                page = self._factories[name]()
+            self._pages[name] = page
+            self.stack.addWidget(page)
+        return page
+
+    def is_built(self, name):
+        return name in self._pages
+
+    def built_pages(self):
+        return dict(self._pages)
+
+    def dispose(self, name):
+        """Drop page `name` from the stack and delete it."""
+        page = self._pages.pop(name, None)
+        if page is None:
+            return
+        get_runner().cancel(page)
+        self.stack.removeWidget(page)
+        page.setParent(None)
+        page.deleteLater()
+
+    def dispose_session(self):
+        for name in list(self._pages):
+            if name in self._session:
+                self.dispose(name)
@@ -0,0 +1,117 @@
+# src/views/components/task_runner.py
+# Description : Runs controller calls on worker threads and hands results back to the UI thread
+
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, pyqtSignal
+from utils.tracing import carry, span
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+
+
+class TaskRunner(QObject):
+    """Thread pool whose results are delivered to callbacks on the UI thread.
+
+    Every task belongs to an owner (usually the page or widget that asked for
+    it) and a key. Only the latest task for an (owner, key) pair may deliver
+    its result, and `cancel(owner)` drops everything the owner still has in
+    flight, so a page that was left or refreshed never sees stale data.
+    """
+
+    _done = pyqtSignal(object)
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, parent=None):
+        super().__init__(parent)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="signance-task")
+        # future -> (slot, on_result, on_error); only touched on the UI thread
+        self._pending = {}
+        self._latest = {}
+        self._watched = set()
+        # Emitted from worker threads, so Qt queues it onto this object's thread
+        self._done.connect(self._deliver)
+
+    def submit(self, owner, fn, *args, key=None, on_result=None, on_error=None, **kwargs):
+        """Run fn(*args, **kwargs) in the pool and return its Future.
+
+        `on_result` / `on_error` are called on the UI thread unless the task
+        was cancelled or superseded by a newer one with the same owner and key.
+        """
+        slot = (id(owner), key)
+        previous = self._latest.get(slot)
+        if previous is not None:
+            previous.cancel()
+            self._pending.pop(previous, None)
+
+        self._watch(owner)
+        # With tracing on, the worker's span is linked to the one submitting it
+        task = carry(fn, getattr(fn, "__qualname__", "task"))
+        future = self._executor.submit(task, *args, **kwargs)
+        self._pending[future] = (slot, on_result, on_error)
+        self._latest[slot] = future
+        future.add_done_callback(self._done.emit)
+        return future
+
+    def cancel(self, owner):
+        """Cancel or discard every task the owner still has in flight."""
+        self._cancel_owner(id(owner))
+
+    def is_busy(self, owner, key=None):
+        return (id(owner), key) in self._latest
+
+    def is_idle(self):
+        """True when no task is waiting to deliver a result."""
+        return not self._latest
+
+    def shutdown(self, wait=False):
+        self._pending.clear()
+        self._latest.clear()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _watch(self, owner):
+        # Drop results for widgets Qt has already deleted
+        owner_id = id(owner)
+        if owner_id in self._watched or not isinstance(owner, QObject):
+            return
+        self._watched.add(owner_id)
+        owner.destroyed.connect(lambda _=None, owner_id=owner_id: self._forget(owner_id))
+
+    def _forget(self, owner_id):
+        self._watched.discard(owner_id)
+        self._cancel_owner(owner_id)
+
+    def _cancel_owner(self, owner_id):
+        for slot in [slot for slot in self._latest if slot[0] == owner_id]:
+            future = self._latest.pop(slot)
+            future.cancel()
+            self._pending.pop(future, None)
+
+    def _deliver(self, future):
+        entry = self._pending.pop(future, None)
+        if entry is None or future.cancelled():
+            return
+        slot, on_result, on_error = entry
+        if self._latest.get(slot) is future:
+            del self._latest[slot]
+
+        error = future.exception()
+        with span("TaskRunner.deliver", "ui", key=str(slot[1])):
+            if error is not None:
+                if on_error is not None:
+                    on_error(error)
+                else:
+                    logger.error("Error in background task: %s", error)
+            elif on_result is not None:
+                on_result(future.result())
+
+
+_runner = None
+
+
+def get_runner():
+    """Return the process-wide TaskRunner, creating it on first use."""
+    global _runner
+    if _runner is None:
+        _runner = TaskRunner()
+    return _runner
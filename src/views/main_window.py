@@ -1,17 +1,27 @@
 #src/views/main_window.py
 # Description : Main window for the application
 
-from PyQt5.QtGui import QIcon
+from PyQt5.QtGui import QIcon, QKeySequence
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QStackedWidget, QSizePolicy, QLabel
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QStackedWidget, QSizePolicy, QLabel,
+    QMenu, QMessageBox, QShortcut
 )
-from .pages import LoginPage, DashboardPage, TransactionPage, BudgetPage, SavingsPage, RegisterPage
-from controllers import BudgetController, UserController, TransactionController, SavingsController
+from utils import tracing
+from . import pages
+from .components import get_runner, PageRegistry
 
-budget_controller = BudgetController()
-transaction_controller = TransactionController()
-saving_controller = SavingsController() 
-user_controller = UserController()
+# Opens the developer menu (tracing); deliberately not shown anywhere in the UI
+DEVELOPER_MENU_SHORTCUT = "Ctrl+Shift+D"
+
+# Shared controllers, created on first use rather than at import
+_controllers = {}
+
+def get_controller(name):
+    """Return the shared controller class `name` from the controllers package."""
+    if name not in _controllers:
+        import controllers
+        _controllers[name] = getattr(controllers, name)()
+    return _controllers[name]
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -36,27 +46,21 @@ class MainWindow(QMainWindow):
         self.sidebar.setContentsMargins(0, 0, 0, 0)
         self.sidebar.setSpacing(10)
 
-        # Pages
-        self.pages = {
-            "Transactions": None,  # Initially set to None, will be updated after login
-            "Dashboard": None,  # Initially set to None, will be updated after login
-            "Savings": None,  # Initially set to None, will be updated after login
-            "Budget": None,  # Initially set to None, will be updated after login
-            "Login": LoginPage(self),
-            "Register": RegisterPage(self)
-        }
-
-        # Connect LoginPage signal
-        login_page = self.pages["Login"]
-        login_page.login_successful.connect(self.on_login_successful)
-
         # Content area
         self.content_area = QStackedWidget()
 
-        # Add all pages to the content area initially
-        for page_widget in self.pages.values():
-            if page_widget:
-                self.content_area.addWidget(page_widget)
+        # Pages are built on first navigation; the session pages are
+        # disposed again on logout
+        self.pages = PageRegistry(self.content_area)
+        self.pages.register("Login", self.create_login_page)
+        self.pages.register("Register", lambda: pages.RegisterPage(self))
+        self.pages.register("Dashboard", lambda: pages.DashboardPage(
+            self.user_id, get_controller("UserController"), get_controller("TransactionController"),
+            get_controller("BudgetController"), lambda: self.switch_page("Savings")
+        ), session=True)
+        self.pages.register("Transactions", lambda: pages.TransactionPage(self.user_id, get_controller("TransactionController")), session=True)
+        self.pages.register("Savings", lambda: pages.SavingsPage(self.user_id, get_controller("SavingsController")), session=True)
+        self.pages.register("Budget", lambda: pages.BudgetPage(self.user_id, get_controller("BudgetController")), session=True)
 
         # Add sidebar and content area to the main layout
         self.sidebar_widget = QWidget()
@@ -73,6 +77,39 @@ class MainWindow(QMainWindow):
         # Make content area expand to fill available space
         self.content_area.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
+        self.developer_shortcut = QShortcut(QKeySequence(DEVELOPER_MENU_SHORTCUT), self)
+        self.developer_shortcut.activated.connect(self.show_developer_menu)
+
+    def show_developer_menu(self):
+        """Hidden menu to record a trace of what the app is doing and save it."""
+        menu = QMenu(self)
+        record = menu.addAction("Record trace")
+        record.setCheckable(True)
+        record.setChecked(tracing.is_enabled())
+        save = menu.addAction(f"Save trace ({len(tracing.tracer):,} events)...")
+        save.setEnabled(len(tracing.tracer) > 0)
+        clear = menu.addAction("Clear trace")
+
+        chosen = menu.exec_(self.mapToGlobal(self.rect().center()))
+        if chosen is record:
+            if record.isChecked():
+                tracing.enable()
+            else:
+                tracing.disable()
+        elif chosen is save:
+            try:
+                path = tracing.tracer.dump()
+                QMessageBox.information(self, "Trace Saved", f"Open {path} in ui.perfetto.dev or chrome://tracing.")
+            except OSError as e:
+                QMessageBox.warning(self, "Trace Not Saved", str(e))
+        elif chosen is clear:
+            tracing.tracer.clear()
+
+    def create_login_page(self):
+        login_page = pages.LoginPage(self)
+        login_page.login_successful.connect(self.on_login_successful)
+        return login_page
+
     def update_sidebar(self):
         """Update sidebar buttons based on login state."""
         # Clear the existing sidebar
@@ -109,9 +146,15 @@ class MainWindow(QMainWindow):
             logout_btn.clicked.connect(self.logout)
             self.sidebar.addWidget(logout_btn)
 
+    @tracing.traced(category="ui")
     def switch_page(self, page_name):
-        page_widget = self.pages[page_name]
-        
+        page_widget = self.pages.get(page_name)
+
+        # Whatever the page we are leaving still has in flight is stale now
+        previous = self.content_area.currentWidget()
+        if previous is not None and previous is not page_widget:
+            get_runner().cancel(previous)
+
         if page_name == "Dashboard":
             page_widget.update_dashboard()
 
@@ -128,26 +171,32 @@ class MainWindow(QMainWindow):
         self.user_name = ""  # Clear user name on logout
         self.update_sidebar()
         self.switch_page("Login")
+        # Drop the previous user's pages; the next login builds fresh ones
+        self.pages.dispose_session()
+        self.user_id = None
 
     def on_login_successful(self, username_or_email):
         """Handle successful login."""
-        user_controller = UserController()
-        user = user_controller.get_user_by_username_or_email(username_or_email)
+        # Keep the login form busy while the account is looked up off the UI thread
+        self.pages.get("Login").set_loading(True)
+        get_runner().submit(
+            self, get_controller("UserController").get_user_by_username_or_email, username_or_email,
+            key="login", on_result=self.on_user_loaded, on_error=self.on_user_load_failed
+        )
+
+    def on_user_load_failed(self, error):
+        self.pages.get("Login").set_loading(False)
+        QMessageBox.warning(self, "Error", f"Could not load the account: {error}")
+
+    def on_user_loaded(self, user):
+        if user is None:
+            self.on_user_load_failed("user not found")
+            return
+        self.pages.get("Login").set_loading(False)
         self.logged_in = True
         self.user_id = user[0]
         self.user_name = user[1]  # Update the user name
         self.update_sidebar()
 
-        # Now initialize the pages with the correct user_id and other controllers
-        self.pages["Transactions"] = TransactionPage(self.user_id, transaction_controller)
-        self.pages["Dashboard"] = DashboardPage(self.user_id, user_controller, transaction_controller, budget_controller, lambda: self.switch_page("Savings"))
-        self.pages["Savings"] = SavingsPage(self.user_id, saving_controller)
-        self.pages["Budget"] = BudgetPage(self.user_id, budget_controller)
-
-        # Add the pages to the content area
-        for page_widget in self.pages.values():
-            if page_widget:
-                self.content_area.addWidget(page_widget)
-
-        # Switch to the Dashboard page after login
+        # Switch to the Dashboard page after login; other pages are built when first opened
         self.switch_page("Dashboard")
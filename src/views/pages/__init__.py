@@ -1,11 +1,25 @@
-# src/views/components/__init__.py
+# src/views/pages/__init__.py
 # Description : Module initialization
 
-from .login_page import LoginPage
-from .dashboard_page import DashboardPage
-from .transaction_page import TransactionPage
-from .budget_page import BudgetPage
-from .saving_page import SavingsPage
-from .register_page import RegisterPage
+import importlib
 
-__all__ = ['main_window', 'LoginPage', 'DashboardPage', 'TransactionPage', 'BudgetPage', 'SavingsPage', 'RegisterPage']
+# Pages are imported on first access (PEP 562), so showing the login screen
+# does not load matplotlib or the other pages' modules
+_PAGE_MODULES = {
+    'LoginPage': '.login_page',
+    'DashboardPage': '.dashboard_page',
+    'TransactionPage': '.transaction_page',
+    'BudgetPage': '.budget_page',
+    'SavingsPage': '.saving_page',
+    'RegisterPage': '.register_page',
+}
+
+def __getattr__(name):
+    module = _PAGE_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+__all__ = list(_PAGE_MODULES)
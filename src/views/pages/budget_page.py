@@ -9,12 +9,20 @@ from PyQt5.QtGui import QIcon
 from decimal import Decimal
 from datetime import datetime
 from models.budget import Category
+from views.components.task_runner import get_runner
+from utils.tracing import traced
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
 
 class BudgetPage(QWidget):
     def __init__(self, user_id, controller, parent=None):
         super().__init__(parent)
         self.user_id = user_id
         self.controller = controller
+        # Budgets shown in the table, row for row
+        self.budgets = []
         self.init_ui()
 
     def init_ui(self):
@@ -48,15 +56,33 @@ class BudgetPage(QWidget):
         
         self.layout.addWidget(self.table_widget)
 
+        # Shown while the first load is running or when it failed
+        self.status_label = QLabel("Loading budgets...")
+        self.status_label.setAlignment(Qt.AlignCenter)
+        self.layout.addWidget(self.status_label)
+
         # Connect table item double click
         self.table_widget.itemDoubleClicked.connect(self.show_budget_detail)
         
         # Initial refresh to load data
         self.refresh_budget_list()
 
+    @traced(category="ui")
     def refresh_budget_list(self):
+        """Reload the budgets in the background; the table keeps its rows until they arrive."""
+        if not self.budgets:
+            self.status_label.setText("Loading budgets...")
+            self.status_label.show()
+        get_runner().submit(
+            self, self.controller.get_all_budgets, self.user_id, key="budgets",
+            on_result=self.show_budgets, on_error=self.show_load_error
+        )
+
+    @traced(category="ui")
+    def show_budgets(self, budgets):
+        self.budgets = budgets
+        self.status_label.hide()
         self.table_widget.setRowCount(0)
-        budgets = self.controller.get_all_budgets(self.user_id)
         
         for row, budget in enumerate(budgets):
             self.table_widget.insertRow(row)
@@ -82,13 +108,18 @@ class BudgetPage(QWidget):
                 end_date_item = QTableWidgetItem(end_date_str)
                 self.table_widget.setItem(row, 3, end_date_item)
             except Exception as e:
-                print(f"Error processing budget: {e}")
+                logger.warning("Error processing budget: %s", e)
+
+    def show_load_error(self, error):
+        logger.error("Error loading budgets: %s", error)
+        self.status_label.setText("Could not load budgets")
+        self.status_label.show()
 
     def show_budget_detail(self, item):
         row = item.row()
-        budgets = self.controller.get_all_budgets(self.user_id)
-        if row < len(budgets):
-            budget = budgets[row]
+        # The rows on screen are the budgets from the last load
+        if row < len(self.budgets):
+            budget = self.budgets[row]
             dialog = BudgetForm(
                 user_id=self.user_id,
                 controller=self.controller,
@@ -105,6 +136,10 @@ class BudgetPage(QWidget):
         if not date_str:
             return None
 
+        # Controllers already hand out datetimes
+        if isinstance(date_str, datetime):
+            return date_str
+
         date_str = date_str.split(".")[0]
 
         date_formats = [
@@ -119,7 +154,7 @@ class BudgetPage(QWidget):
                 continue
 
         # Log a warning if no format matches
-        print(f"Unable to parse date: {date_str}")
+        logger.warning("Unable to parse date: %r", date_str)
         return None
 
 class BudgetForm(QDialog):
@@ -153,7 +188,7 @@ class BudgetForm(QDialog):
                 end_date = self._parse_date(budget.end_date)
                 self.end_date_input.setDate(QDate(end_date.year, end_date.month, end_date.day))
             except Exception as e:
-                print(f"Error parsing dates: {e}")
+                logger.warning("Error parsing dates: %s", e)
                 # Fallback to current date if parsing fails
                 self.start_date_input.setDate(QDate.currentDate())
                 self.end_date_input.setDate(QDate.currentDate())
@@ -173,9 +208,9 @@ class BudgetForm(QDialog):
         # Buttons
         button_layout = QHBoxLayout()
         
-        save_button = QPushButton("Save")
-        save_button.clicked.connect(self.save_budget)
-        button_layout.addWidget(save_button)
+        self.save_button = QPushButton("Save")
+        self.save_button.clicked.connect(self.save_budget)
+        button_layout.addWidget(self.save_button)
 
         cancel_button = QPushButton("Cancel")
         cancel_button.clicked.connect(self.reject)
@@ -190,6 +225,10 @@ class BudgetForm(QDialog):
         if not date_str:
             return None
 
+        # Controllers already hand out datetimes
+        if isinstance(date_str, datetime):
+            return date_str
+
         date_str = date_str.split(".")[0]
 
         date_formats = [
@@ -204,7 +243,7 @@ class BudgetForm(QDialog):
                 continue
 
         # Log a warning if no format matches
-        print(f"Unable to parse date: {date_str}")
+        logger.warning("Unable to parse date: %r", date_str)
         return None
 
 
@@ -220,18 +259,28 @@ class BudgetForm(QDialog):
 
         if amount > 0 and start_date < end_date:
             # Only update allowed
-            success, message = self.controller.update_budget(
-                self.budget.budget_id, amount=amount, 
-                start_date=start_date, end_date=end_date
+            self.set_saving(True)
+            get_runner().submit(
+                self, self.controller.update_budget,
+                self.budget.budget_id, amount=amount, start_date=start_date, end_date=end_date,
+                key="save", on_result=self.on_saved,
+                on_error=lambda _: self.on_saved((False, "Failed to update budget"))
             )
-
-            if success:
-                self.accept()
-            else:
-                QMessageBox.warning(self, "Error", message)
         else:
             QMessageBox.warning(self, "Error", "Please provide valid inputs.")
 
+    def on_saved(self, result):
+        success, message = result
+        self.set_saving(False)
+        if success:
+            self.accept()
+        else:
+            QMessageBox.warning(self, "Error", message)
+
+    def set_saving(self, saving):
+        self.save_button.setEnabled(not saving)
+        self.save_button.setText("Saving..." if saving else "Save")
+
 class BudgetDetailDialog(QDialog):
     def __init__(self, budget, controller, parent=None):
         super().__init__(parent)
@@ -259,9 +308,9 @@ class BudgetDetailDialog(QDialog):
         self.start_date_input = QDateEdit()
         self.end_date_input = QDateEdit()
 
-        # Convert string dates to QDate
-        start_date = datetime.strptime(budget.start_date, "%Y-%m-%d %H:%M:%S.%f")
-        end_date = datetime.strptime(budget.end_date, "%Y-%m-%d %H:%M:%S.%f")
+        # Budget dates are local datetimes
+        start_date = budget.start_date
+        end_date = budget.end_date
 
         self.start_date_input.setDate(QDate(start_date.year, start_date.month, start_date.day))
         self.end_date_input.setDate(QDate(end_date.year, end_date.month, end_date.day))
@@ -284,9 +333,9 @@ class BudgetDetailDialog(QDialog):
         # Buttons
         button_layout = QHBoxLayout()
 
-        update_dates_button = QPushButton("Update Dates")
-        update_dates_button.clicked.connect(self.update_budget_dates)
-        button_layout.addWidget(update_dates_button)
+        self.update_dates_button = QPushButton("Update Dates")
+        self.update_dates_button.clicked.connect(self.update_budget_dates)
+        button_layout.addWidget(self.update_dates_button)
 
         update_button = QPushButton("Update Budget")
         update_button.clicked.connect(self.update_budget)
@@ -303,22 +352,27 @@ class BudgetDetailDialog(QDialog):
         end_date = self.end_date_input.date().toPyDate()
 
         if start_date < end_date:
-            success, message = self.controller.update_budget(
-                self.budget.budget_id, 
-                start_date=start_date, 
-                end_date=end_date
+            self.update_dates_button.setEnabled(False)
+            get_runner().submit(
+                self, self.controller.update_budget,
+                self.budget.budget_id, start_date=start_date, end_date=end_date,
+                key="dates", on_result=self.on_dates_updated,
+                on_error=lambda _: self.on_dates_updated((False, "Failed to update budget"))
             )
-
-            if success:
-                QMessageBox.information(self, "Success", "Budget dates updated successfully.")
-                if self.parent_page:
-                    self.parent_page.refresh_budget_list()
-                self.accept()
-            else:
-                QMessageBox.warning(self, "Error", message)
         else:
             QMessageBox.warning(self, "Error", "Start date must be before end date.")
 
+    def on_dates_updated(self, result):
+        success, message = result
+        self.update_dates_button.setEnabled(True)
+        if success:
+            QMessageBox.information(self, "Success", "Budget dates updated successfully.")
+            if self.parent_page:
+                self.parent_page.refresh_budget_list()
+            self.accept()
+        else:
+            QMessageBox.warning(self, "Error", message)
+
     def update_budget(self):
         dialog = BudgetForm(
             user_id=self.budget.user_id, 
@@ -6,137 +6,239 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtGui import QColor
 from PyQt5.QtCore import Qt
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import datetime
 import colorsys
+from models.budget import Category
+from controllers.dashboard_service import DashboardService
+from views.components.task_runner import get_runner
+from utils.tracing import traced
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class ChartCanvas(FigureCanvas):
+    """FigureCanvas whose renders show up as spans in traces."""
+
+    draw = traced(FigureCanvas.draw, name="matplotlib draw", category="draw")
+
 
 # Line Chart for Monthly Spending
 class LineChart(QWidget):
-    def __init__(self, user_id, transaction_controller, parent=None):
+    """Six-month spending vs income chart.
+
+    The chart owns a single Figure with two persistent Line2D artists. New
+    data from a DashboardSnapshot is pushed into those artists with
+    set_ydata() and the canvas is redrawn with draw_idle(), so a refresh never
+    rebuilds the axes and never touches pyplot's global figure manager.
+    """
+
+    MONTH_NAMES = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
+
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.user_id = user_id
-        self.transaction_controller = transaction_controller
         self.init_ui()
 
     def init_ui(self):
         layout = QVBoxLayout()
-        self.canvas = FigureCanvas(plt.figure())  # Create a figure for the canvas
+        # A plain Figure is owned by this widget and freed with it
+        self.figure = Figure()
+        self.canvas = ChartCanvas(self.figure)
         layout.addWidget(self.canvas)
 
-        self.monthly_spending_data = self.get_monthly_spending_data()  # Fetch the spending data
-        self.monthly_income_data = self.get_monthly_income_data()  # Fetch the income data
-        self.plot_line_chart()  # Plot the chart
-
-        self.setLayout(layout)
-
-    def get_monthly_spending_data(self):
-        """Fetch monthly spending data for the user"""
-        data = self.transaction_controller.calculate_last_six_months_spending(self.user_id)
+        self.ax = self.figure.add_subplot(111)
+        positions = range(6)
+        self.spending_line, = self.ax.plot(positions, [0] * 6, marker='o', color='blue', label='Spending')
+        self.income_line, = self.ax.plot(positions, [0] * 6, marker='o', color='green', label='Income')
 
-        current_month = datetime.datetime.now().month - 1
-        current_month_list = [(current_month - i) % 12 for i in range(6)]
-        month_name = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
-
-        dict_data = {}
-        for i in range(5, -1, -1):
-            dict_data[month_name[current_month_list[i]]] = data[i]
-
-        return dict_data
-    
-    def get_monthly_income_data(self):
-        """Fetch monthly income data for the user"""
-        data = self.transaction_controller.calculate_last_six_months_income(self.user_id)
-
-        current_month = datetime.datetime.now().month - 1
-        current_month_list = [(current_month - i) % 12 for i in range(6)]
-        month_name = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
-
-        dict_data = {}
-        for i in range(5, -1, -1):
-            dict_data[month_name[current_month_list[i]]] = data[i]
+        # Set chart labels and title
+        self.ax.set_title('Monthly Spending vs Income')
+        self.ax.set_xlabel('Month')
+        self.ax.set_ylabel('Amount ($)')
+        self.ax.set_xticks(list(positions))
+        # Month names arrive with the first snapshot
+        self.ax.set_xticklabels([""] * 6)
+        self.ax.set_xlim(-0.25, 5.25)
+        self.ax.set_ylim(0, 1)
+        self.ax.grid(True)
+        self.ax.legend()
+
+        self.months = None
+        self.y_max = 1
+        self.monthly_spending_data = {}
+        self.monthly_income_data = {}
 
-        return dict_data 
+        self.setLayout(layout)
 
     def plot_line_chart(self):
-        """Plot the line chart for both income and spending"""
-        spending_data = self.monthly_spending_data
-        income_data = self.monthly_income_data
-        months = list(spending_data.keys())
-
-        # Clear the existing figure to avoid overlapping plots
-        self.canvas.figure.clear()
+        """Push the current data into the existing artists and schedule a redraw"""
+        months = list(self.monthly_spending_data.keys())
+        spending = [float(value) for value in self.monthly_spending_data.values()]
+        income = [float(value) for value in self.monthly_income_data.values()]
+
+        # Tick labels only change when the calendar month rolls over
+        if months != self.months:
+            self.ax.set_xticklabels(months)
+            self.months = months
+
+        self.spending_line.set_ydata(spending)
+        self.income_line.set_ydata(income)
+
+        # Only the y range depends on the data; leave 10% headroom above the peak
+        y_max = max(spending + income + [0]) * 1.1 or 1
+        if y_max != self.y_max:
+            self.ax.set_ylim(0, y_max)
+            self.y_max = y_max
+
+        self.canvas.draw_idle()
+
+    def show_snapshot(self, snapshot):
+        """Redraw the chart from a DashboardSnapshot"""
+        labels = [self.MONTH_NAMES[int(month[5:7]) - 1] for month in snapshot.months]
+        self.show_series(
+            dict(zip(labels, snapshot.monthly_spending)),
+            dict(zip(labels, snapshot.monthly_income))
+        )
 
-        # Add a subplot to the existing figure
-        ax = self.canvas.figure.add_subplot(111)
+    def show_series(self, monthly_spending_data, monthly_income_data):
+        """Plot {month name: amount} series, oldest first; skipped when unchanged"""
+        if (monthly_spending_data == self.monthly_spending_data
+                and monthly_income_data == self.monthly_income_data):
+            return
+        self.monthly_spending_data = monthly_spending_data
+        self.monthly_income_data = monthly_income_data
+        self.plot_line_chart()
 
-        # Plot spending data
-        ax.plot(months, list(spending_data.values()), marker='o', color='blue', label='Spending')
 
-        # Plot income data with a different color
-        ax.plot(months, list(income_data.values()), marker='o', color='green', label='Income')
+def progress_color(percentage):
+    """Green at 0% fading to red at 100%"""
+    hue = 120 - (120 * (percentage / 100))  # Transition from 120° to 0° (Green to Red)
+    saturation = 1  # Full saturation
+    lightness = 0.4  # Set lightness to 40% for better visibility
+    r, g, b = colorsys.hls_to_rgb(hue / 360.0, lightness, saturation)
+    return f"rgb({int(r * 255)}, {int(g * 255)}, {int(b * 255)})"
+
+
+# One colour per whole percent, computed once at import
+PROGRESS_PALETTE = [progress_color(level) for level in range(101)]
+
+# Parsed once for the whole widget; each bar picks its colour through the
+# "level" property instead of carrying a style sheet of its own
+BUDGET_PROGRESS_STYLE = """
+    QLabel#budgetHeader {
+        font-size: 18px;
+        font-weight: bold;
+        margin-bottom: 10px;
+    }
+    QLabel#budgetCategory {
+        font-weight: bold;
+    }
+    QLabel#budgetAmounts {
+        color: #666;
+    }
+    QProgressBar {
+        background-color: #f0f0f0;
+        border: 1px solid #ddd;
+        border-radius: 5px;
+        height: 20px;
+        text-align: center;
+    }
+    QProgressBar::chunk {
+        border-radius: 4px;
+    }
+""" + "".join(
+    f'    QProgressBar[level="{level}"]::chunk {{ background-color: {color}; }}\n'
+    for level, color in enumerate(PROGRESS_PALETTE)
+)
 
-        # Set chart labels and title
-        ax.set_title('Monthly Spending vs Income')
-        ax.set_xlabel('Month')
-        ax.set_ylabel('Amount ($)')
-        ax.grid(True)
+# Budget categories in display order, with the names shown on the dashboard
+CATEGORY_LABELS = {
+    Category.FOODS: 'Food',
+    Category.TRANSPORT: 'Transport',
+    Category.ENTERTAINMENT: 'Entertainment',
+    Category.EDUCATION: 'Education',
+    Category.OTHER: 'Others',
+}
 
-        # Add a legend to distinguish between spending and income lines
-        ax.legend()
 
-        # Render the plot on the canvas
-        self.canvas.draw()
+class BudgetRow(QWidget):
+    """Label, amounts and progress bar of one budget category"""
 
-    def update_chart(self):
-        """Update the line chart with new data"""
-        self.monthly_spending_data = self.get_monthly_spending_data()
-        self.monthly_income_data = self.get_monthly_income_data()
-        self.plot_line_chart()
+    def __init__(self, label, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setSpacing(4)
+
+        self.category_label = QLabel(label)
+        self.category_label.setObjectName("budgetCategory")
+        self.amounts_label = QLabel()
+        self.amounts_label.setObjectName("budgetAmounts")
+        self.progress_bar = QProgressBar()
+
+        layout.addWidget(self.category_label)
+        layout.addWidget(self.amounts_label)
+        layout.addWidget(self.progress_bar)
+
+        self.values = None
+
+    def set_values(self, spending, budget, percentage):
+        """Update the row; does nothing when the numbers are unchanged"""
+        values = (spending, budget, percentage)
+        if values == self.values:
+            return
+        self.values = values
+
+        level = max(0, min(100, int(percentage)))
+        self.amounts_label.setText(f"Rp {spending:,.2f} / Rp {budget:,.2f} ({percentage:.1f}%)")
+        self.progress_bar.setValue(level)
+        if self.progress_bar.property("level") != level:
+            self.progress_bar.setProperty("level", level)
+            # Re-apply the parent's rules for the new property value
+            self.progress_bar.style().unpolish(self.progress_bar)
+            self.progress_bar.style().polish(self.progress_bar)
 
 
 class BudgetProgress(QWidget):
-    def __init__(self, user_id, budget_controller, transaction_controller, parent=None):
+    # Default budget amount if none is set
+    DEFAULT_BUDGET = 1000
+
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.user_id = user_id
-        self.budget_controller = budget_controller
-        self.transaction_controller = transaction_controller
         self.init_ui()
 
     def init_ui(self):
+        self.setStyleSheet(BUDGET_PROGRESS_STYLE)
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
-        self.update_progress(self.user_id)
-
-    def get_category_progress(self):
-        """Fetch the user's budget and current spending for each category"""
-        class_budget = self.budget_controller.get_all_budgets(self.user_id)
-        
-        # Initialize default budget values
-        default_budget = 1000  # Default budget amount if none is set
-        budget_data = {
-            'Food': default_budget,
-            'Transport': default_budget,
-            'Entertainment': default_budget,
-            'Education': default_budget,
-            'Others': default_budget,
-        }
-
-        # Update budget_data with actual values if they exist
-        for i, budget in enumerate(class_budget):
-            category = list(budget_data.keys())[i]
-            budget_data[category] = budget.amount
-
-        # Get spending data
-        spending = self.transaction_controller.calculate_monthly_category_spending(self.user_id)
-        spending_data = {
-            'Food': spending[0] if len(spending) > 0 else 0,
-            'Transport': spending[1] if len(spending) > 1 else 0,
-            'Entertainment': spending[2] if len(spending) > 2 else 0,
-            'Education': spending[3] if len(spending) > 3 else 0,
-            'Others': spending[4] if len(spending) > 4 else 0,
-        }
 
+        # Add a header
+        header = QLabel("Budget Progress")
+        header.setObjectName("budgetHeader")
+        self.layout.addWidget(header)
+
+        # The rows are built once and only updated afterwards
+        self.rows = {}
+        for category, label in CATEGORY_LABELS.items():
+            self.rows[category] = BudgetRow(label)
+            self.layout.addWidget(self.rows[category])
+
+        # Add some spacing at the bottom
+        self.layout.addStretch()
+
+    def progress_from_snapshot(self, snapshot):
+        """Budget, spending and progress of each category from a DashboardSnapshot
+
+        Returns dicts keyed by Category; categories without a current budget
+        use DEFAULT_BUDGET.
+        """
+        budget_data = {category: self.DEFAULT_BUDGET for category in CATEGORY_LABELS}
+        for category, amount in snapshot.category_budgets:
+            budget_data[Category(category)] = amount
+        spending_data = {Category(category): amount for category, amount in snapshot.category_spending}
+        return self.calculate_progress(spending_data, budget_data)
+
+    def calculate_progress(self, spending_data, budget_data):
         # Calculate progress percentages safely
         progress = {}
         for category in budget_data:
@@ -147,81 +249,16 @@ class BudgetProgress(QWidget):
 
         return progress, spending_data, budget_data
 
-    def hsl_to_rgb(self, h, s, l):
-        r, g, b = colorsys.hls_to_rgb(h / 360.0, l, s)
-        return f"rgb({int(r * 255)}, {int(g * 255)}, {int(b * 255)})"
-
-    def calculate_color(self, percentage):
-        hue = 120 - (120 * (percentage / 100))  # Transition from 120° to 0° (Green to Red)
-        saturation = 1  # Full saturation
-        lightness = 0.4  # Set lightness to 40% for better visibility
-        return self.hsl_to_rgb(hue, saturation, lightness)
-
-    def display_progress_bars(self, layout):
-        """Create progress bars for each category"""
+    def display_progress_bars(self):
+        """Push the current progress into the category rows"""
         progress, spending_data, budget_data = self.category_progress
+        for category, row in self.rows.items():
+            row.set_values(spending_data[category], budget_data[category], progress[category])
 
-        # Add a header
-        header = QLabel("Budget Progress")
-        header.setStyleSheet("font-size: 18px; font-weight: bold; margin-bottom: 10px;")
-        layout.addWidget(header)
-
-        for category, progress_percentage in progress.items():
-            # Container for each category
-            container = QWidget()
-            container_layout = QVBoxLayout(container)
-            container_layout.setSpacing(4)
-
-            progress_bar = QProgressBar()
-            progress_bar.setValue(min(100, int(progress_percentage)))
-            
-            # Enhanced progress bar style
-            progress_bar.setStyleSheet(f"""
-                QProgressBar {{
-                    background-color: #f0f0f0;
-                    border: 1px solid #ddd;
-                    border-radius: 5px;
-                    height: 20px;
-                    text-align: center;
-                }}
-                QProgressBar::chunk {{
-                    background-color: {self.calculate_color(min(100, int(progress_percentage)))};
-                    border-radius: 4px;
-                }}
-            """)
-
-            # Category label with spending info
-            label_text = f"{category}"
-            amount_text = f"Rp {spending_data[category]:,.2f} / Rp {budget_data[category]:,.2f}"
-            percentage_text = f"({progress_percentage:.1f}%)"
-            
-            category_label = QLabel(label_text)
-            category_label.setStyleSheet("font-weight: bold;")
-            
-            amounts_label = QLabel(f"{amount_text} {percentage_text}")
-            amounts_label.setStyleSheet("color: #666;")
-
-            container_layout.addWidget(category_label)
-            container_layout.addWidget(amounts_label)
-            container_layout.addWidget(progress_bar)
-
-            layout.addWidget(container)
-            
-        # Add some spacing at the bottom
-        layout.addStretch()
-
-    def update_progress(self, user_id):
-        """Update the budget progress bars based on the new user_id."""
-        self.user_id = user_id
-        # Clear existing widgets
-        while self.layout.count():
-            child = self.layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        # Fetch progress data based on user_id
-        self.category_progress = self.get_category_progress()
-        # Create progress bars
-        self.display_progress_bars(self.layout)
+    def show_snapshot(self, snapshot):
+        """Update the progress bars from a DashboardSnapshot"""
+        self.category_progress = self.progress_from_snapshot(snapshot)
+        self.display_progress_bars()
 
 # Main DashboardPage
 class DashboardPage(QWidget):
@@ -230,12 +267,14 @@ class DashboardPage(QWidget):
         budget_controller, switch_to_savings_page, parent=None
     ):
         super().__init__(parent)
-        print("dashboarid ID in as:", user_id)
+        logger.debug("Dashboard opened for user %s", user_id)
         self.user_controller = user_controller
         self.budget_controller = budget_controller
         self.transaction_controller = transaction_controller
         self.switch_to_savings_page = switch_to_savings_page
         self.user_id = user_id
+        self.dashboard_service = DashboardService()
+        self.snapshot = None
         self.setWindowTitle("Dashboard")
         self.init_ui()
 
@@ -263,7 +302,7 @@ class DashboardPage(QWidget):
         charts_layout = QHBoxLayout()
 
         # Line Chart
-        self.line_chart = LineChart(self.user_id, self.transaction_controller)
+        self.line_chart = LineChart()
         self.line_chart.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         charts_layout.addWidget(self.line_chart)
 
@@ -271,7 +310,7 @@ class DashboardPage(QWidget):
         charts_layout.addItem(QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding))
 
         # Budget Progress
-        self.budget_progress = BudgetProgress(self.user_id, self.budget_controller, self.transaction_controller)
+        self.budget_progress = BudgetProgress()
         self.budget_progress.setFixedWidth(350)  # Set a fixed width for progress bars
         charts_layout.addWidget(self.budget_progress)
 
@@ -301,26 +340,37 @@ class DashboardPage(QWidget):
         # Set the main layout
         self.setLayout(main_layout)
 
+    @traced(category="ui")
     def update_dashboard(self):
-        """Update the dashboard with the latest user info and monthly spending."""
-        logged_in_user = None
-        if logged_in_user:
-            self.welcome_label.setText(f"Welcome!")
-            self.user_id = logged_in_user.user_id
-        else:
-            self.welcome_label.setText("Welcome!")
-            self.user_id = None
-
-        print(f"User ID: {self.user_id}")
-        total_spending = self.transaction_controller.calculate_monthly_spending(
-            self.user_id
+        """Reload the dashboard in the background; results are applied when they arrive."""
+        self.welcome_label.setText("Welcome!")
+        # Keep showing the last snapshot while the new one loads
+        if self.snapshot is None:
+            self.spending_label.setText("Loading...")
+        get_runner().submit(
+            self, self.dashboard_service.snapshot, self.user_id, key="dashboard",
+            on_result=self.apply_snapshot,
+            on_error=self.show_load_error
         )
-        print(f"Total spending this month: {total_spending}")
-        self.spending_label.setText(f"Total Spending This Month: Rp {total_spending:.2f}")
 
-        # Update child widgets
-        self.line_chart.update_chart()
-        self.budget_progress.update_progress(self.user_id)
+    @traced(category="ui")
+    def apply_snapshot(self, snapshot):
+        if snapshot is None:
+            self.show_load_error("no snapshot")
+            return
+        if snapshot == self.snapshot:
+            return
+        self.snapshot = snapshot
+
+        self.spending_label.setText(f"Total Spending This Month: Rp {snapshot.total_spending:.2f}")
+
+        # Update child widgets; each skips the redraw if its part is unchanged
+        self.line_chart.show_snapshot(snapshot)
+        self.budget_progress.show_snapshot(snapshot)
+
+    def show_load_error(self, error):
+        logger.error("Error loading dashboard: %s", error)
+        self.spending_label.setText("Could not load dashboard data")
     
     def income_vs_outcome_chart(self):
         """Placeholder for the income vs outcome chart logic"""
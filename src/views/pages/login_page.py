@@ -6,6 +6,7 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtGui import QPixmap
 from controllers.user_controller import UserController
+from views.components.task_runner import get_runner
 
 
 class LoginPage(QWidget):
@@ -316,9 +317,24 @@ class LoginPage(QWidget):
         email_or_username = self.email_or_username_input.text()
         password = self.password_input.text()
 
-        # Assuming user_controller.login handles hashing and decryption
-        if self.user_controller.login(email_or_username, password):
+        # bcrypt is slow on purpose, so check the password off the UI thread
+        self.set_loading(True)
+        get_runner().submit(
+            self, self.user_controller.login, email_or_username, password,
+            on_result=lambda success: self.on_login_finished(success, email_or_username),
+            on_error=lambda _: self.on_login_finished(False, email_or_username)
+        )
+
+    def on_login_finished(self, success, email_or_username):
+        self.set_loading(False)
+        if success:
             self.login_successful.emit(email_or_username)
         else:
             self.show_error(self.email_or_username_input, "Invalid email/username or password")
             self.show_error(self.password_input, "")
+
+    def set_loading(self, loading):
+        self.login_button.setEnabled(not loading)
+        self.login_button.setText("Signing in..." if loading else "Sign in")
+        self.email_or_username_input.setEnabled(not loading)
+        self.password_input.setEnabled(not loading)
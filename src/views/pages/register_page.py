@@ -5,6 +5,7 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
 from PyQt5.QtCore import Qt
 from PyQt5.QtCore import pyqtSignal
 from controllers.user_controller import UserController
+from views.components.task_runner import get_runner
 
 class RegisterPage(QWidget):
     def __init__(self, main_window=None):
@@ -320,8 +321,17 @@ class RegisterPage(QWidget):
         email = self.email_input.text()
         password = self.password_input.text()
         
-        # Mencoba melakukan registrasi user
-        success, message = self.user_controller.register(name, email, password)
+        # Mencoba melakukan registrasi user (hashing bcrypt di luar UI thread)
+        self.set_loading(True)
+        get_runner().submit(
+            self, self.user_controller.register, name, email, password,
+            on_result=self.on_register_finished,
+            on_error=lambda e: self.on_register_finished((False, f"Registration failed: {e}"))
+        )
+
+    def on_register_finished(self, result):
+        self.set_loading(False)
+        success, message = result
         if success:
             QMessageBox.information(self, "Success", message)
             self.main_window.switch_page("Login")
@@ -331,4 +341,10 @@ class RegisterPage(QWidget):
             elif "email" in message.lower():
                 self.show_error(self.email_input, message)
             else:
-                QMessageBox.critical(self, "Error", message)
\ No newline at end of file
+                QMessageBox.critical(self, "Error", message)
+
+    def set_loading(self, loading):
+        self.register_button.setEnabled(not loading)
+        self.register_button.setText("Creating account..." if loading else "Sign up")
+        for field in (self.name_input, self.email_input, self.password_input):
+            field.setEnabled(not loading)
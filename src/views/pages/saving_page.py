@@ -8,18 +8,31 @@ from PyQt5.QtCore import Qt, QDate
 from PyQt5.QtGui import QIcon
 from decimal import Decimal
 from datetime import datetime
+from views.components.task_runner import get_runner
+from utils.tracing import traced
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
 
 class SavingsPage(QWidget):
     def __init__(self, user_id, controller, parent=None):
         super().__init__(parent)
         self.user_id = user_id
         self.controller = controller
+        # Goals shown in the list, row for row
+        self.savings_goals = []
 
         # Layout for the page
         self.layout = QVBoxLayout(self)
         self.list_widget = QListWidget()
         self.layout.addWidget(self.list_widget)
 
+        # Shown while the first load is running or when it failed
+        self.status_label = QLabel("Loading savings goals...")
+        self.status_label.setAlignment(Qt.AlignCenter)
+        self.layout.addWidget(self.status_label)
+
         # Floating button
         self.add_button = QPushButton("+")
         self.add_button.setFixedSize(50, 50)
@@ -50,12 +63,30 @@ class SavingsPage(QWidget):
         # Load savings goals
         self.refresh_savings_list()
 
+    @traced(category="ui")
     def refresh_savings_list(self):
+        """Reload the goals in the background; the list keeps its items until they arrive."""
+        if not self.savings_goals:
+            self.status_label.setText("Loading savings goals...")
+            self.status_label.show()
+        get_runner().submit(
+            self, self.controller.get_all_savings, self.user_id, key="savings",
+            on_result=self.show_savings, on_error=self.show_load_error
+        )
+
+    @traced(category="ui")
+    def show_savings(self, savings_goals):
+        self.savings_goals = savings_goals
+        self.status_label.hide()
         self.list_widget.clear()
-        savings_goals = self.controller.get_all_savings(self.user_id)
         for goal in savings_goals:
             self.list_widget.addItem(f"{goal.name} - {goal.current_amount}/{goal.target_amount}")
 
+    def show_load_error(self, error):
+        logger.error("Error loading savings goals: %s", error)
+        self.status_label.setText("Could not load savings goals")
+        self.status_label.show()
+
     def show_create_savings_dialog(self):
         dialog = SavingsForm(user_id=self.user_id, controller=self.controller, parent=self)
         if dialog.exec_():  # If the dialog is accepted
@@ -63,16 +94,24 @@ class SavingsPage(QWidget):
 
     def show_savings_detail(self, savings):
         savings_id = self.get_selected_savings_id()
-        selected_goal = self.controller.get_saving_by_id(savings_id)
+        if savings_id is not None:
+            # Fetch the latest figures before showing them
+            get_runner().submit(
+                self, self.controller.get_saving_by_id, savings_id, key="detail",
+                on_result=self.open_savings_detail
+            )
+
+    def open_savings_detail(self, selected_goal):
         if selected_goal:
             dialog = SavingsDetailDialog(goal=selected_goal, controller=self.controller, parent=self)
             if dialog.exec_():  # If any updates or deletions are made
                 self.refresh_savings_list()
 
     def get_selected_savings_id(self):
+        # The rows on screen are the goals from the last load
         current_row = self.list_widget.currentRow()
-        if current_row != -1:
-            return self.controller.get_all_savings(self.user_id)[current_row].saving_id
+        if 0 <= current_row < len(self.savings_goals):
+            return self.savings_goals[current_row].saving_id
         return None
         
 
@@ -93,7 +132,7 @@ class SavingsForm(QDialog):
         self.name_input = QLineEdit(goal.name if goal else "")
         self.target_input = QLineEdit(str(goal.target_amount) if goal else "")
         self.deadline_input = QDateEdit(
-            QDate(*map(int, goal.deadline.split('-'))) if goal else QDate.currentDate()
+            QDate(goal.deadline.year, goal.deadline.month, goal.deadline.day) if goal else QDate.currentDate()
         )
         self.deadline_input.setCalendarPopup(True)
 
@@ -104,9 +143,9 @@ class SavingsForm(QDialog):
 
         # Buttons
         button_layout = QHBoxLayout()
-        save_button = QPushButton("Save")
-        save_button.clicked.connect(self.save_savings)
-        button_layout.addWidget(save_button)
+        self.save_button = QPushButton("Save")
+        self.save_button.clicked.connect(self.save_savings)
+        button_layout.addWidget(self.save_button)
 
         cancel_button = QPushButton("Cancel")
         cancel_button.clicked.connect(self.reject)
@@ -125,14 +164,25 @@ class SavingsForm(QDialog):
 
         if name and target_amount > 0:
             if self.goal:  # Update existing goal
-                self.controller.update_saving(self.goal.saving_id, name, target_amount, deadline)
+                task = (self.controller.update_saving, self.goal.saving_id, name, target_amount, deadline)
             else:  # Create a new goal
-                self.controller.create_saving(self.user_id, name, target_amount, deadline)
+                task = (self.controller.create_saving, self.user_id, name, target_amount, deadline)
 
-            self.accept()
+            self.save_button.setEnabled(False)
+            self.save_button.setText("Saving...")
+            get_runner().submit(self, *task, key="save", on_result=self.on_saved, on_error=self.on_save_failed)
         else:
             QMessageBox.warning(self, "Error", "Please provide valid inputs.")
 
+    def on_saved(self, _):
+        self.accept()
+
+    def on_save_failed(self, error):
+        logger.error("Error saving savings goal: %s", error)
+        self.save_button.setEnabled(True)
+        self.save_button.setText("Save")
+        QMessageBox.warning(self, "Error", "Failed to save the savings goal.")
+
 class SavingsDetailDialog(QDialog):
     def __init__(self, goal, controller, parent=None):
         super().__init__(parent)
@@ -154,19 +204,19 @@ class SavingsDetailDialog(QDialog):
         self.current_amount_input = QLineEdit(str(goal.current_amount))  # Input for current amount
         self.layout.addWidget(self.current_amount_input)
 
-        self.layout.addWidget(QLabel(f"Deadline: {goal.deadline}"))
+        self.layout.addWidget(QLabel(f"Deadline: {goal.deadline:%Y-%m-%d}"))
         self.layout.addWidget(QLabel(f"Progress: {goal.get_progress_percentage():.2f}%"))
 
         # Buttons
         button_layout = QHBoxLayout()
 
-        update_goal_button = QPushButton("Update Goal")
-        update_goal_button.clicked.connect(self.update_savings)
-        button_layout.addWidget(update_goal_button)
+        self.update_goal_button = QPushButton("Update Goal")
+        self.update_goal_button.clicked.connect(self.update_savings)
+        button_layout.addWidget(self.update_goal_button)
 
-        delete_button = QPushButton("Delete")
-        delete_button.clicked.connect(self.delete_savings)
-        button_layout.addWidget(delete_button)
+        self.delete_button = QPushButton("Delete")
+        self.delete_button.clicked.connect(self.delete_savings)
+        button_layout.addWidget(self.delete_button)
 
         close_button = QPushButton("Close")
         close_button.clicked.connect(self.reject)
@@ -185,13 +235,20 @@ class SavingsDetailDialog(QDialog):
         # Ensure the current amount is not negative
         if new_current_amount >= 0:
             # Update current amount via the controller
-            self.controller.update_current_amount(self.goal.saving_id, new_current_amount)
-            # Update the local object and the label
-            self.goal.current_amount = new_current_amount
-            self.current_amount_label.setText(f"Current Amount: {new_current_amount}")
+            self.set_busy(True)
+            get_runner().submit(
+                self, self.controller.update_current_amount, self.goal.saving_id, new_current_amount,
+                key="update", on_result=lambda _: self.on_current_amount_updated(new_current_amount),
+                on_error=self.on_failed
+            )
         else:
             QMessageBox.warning(self, "Error", "Current amount must be a positive number.")
-            return
+
+    def on_current_amount_updated(self, new_current_amount):
+        self.set_busy(False)
+        # Update the local object and the label
+        self.goal.current_amount = new_current_amount
+        self.current_amount_label.setText(f"Current Amount: {new_current_amount}")
 
         # Now update the rest of the goal if needed
         dialog = SavingsForm(user_id=self.goal.user_id, controller=self.controller, goal=self.goal, parent=self)
@@ -204,8 +261,20 @@ class SavingsDetailDialog(QDialog):
             QMessageBox.Yes | QMessageBox.No, QMessageBox.No
         )
         if confirm == QMessageBox.Yes:
-            self.controller.delete_saving(self.goal.saving_id)
-            self.accept()
+            self.set_busy(True)
+            get_runner().submit(
+                self, self.controller.delete_saving, self.goal.saving_id,
+                key="delete", on_result=lambda _: self.accept(), on_error=self.on_failed
+            )
+
+    def on_failed(self, error):
+        logger.error("Error updating savings goal: %s", error)
+        self.set_busy(False)
+        QMessageBox.warning(self, "Error", "Failed to update the savings goal.")
+
+    def set_busy(self, busy):
+        self.update_goal_button.setEnabled(not busy)
+        self.delete_button.setEnabled(not busy)
 
 
 
@@ -1,76 +1,189 @@
 #src/views/pages/transaction_page.py
 
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QPushButton, QLabel, QScrollArea,
+    QWidget, QVBoxLayout, QPushButton, QLabel, QListView,
     QFormLayout, QLineEdit, QComboBox, QHBoxLayout, QMessageBox,
-    QDialog, QFrame
+    QDialog, QStyledItemDelegate, QStyle, QAbstractItemView,
+    QFileDialog, QProgressBar
 )
-from PyQt5.QtCore import Qt, QDate
-from PyQt5.QtGui import QIcon, QFont, QColor
+from PyQt5.QtCore import Qt, QDate, QAbstractListModel, QModelIndex, QRect, QRectF, QSize, pyqtSignal
+from PyQt5.QtGui import QIcon, QFont, QColor, QFontMetrics, QPainter
 from decimal import Decimal
 from models.transaction import TransactionType
 from models.budget import Category
 from datetime import datetime
+import os
+import threading
+from controllers.import_controller import ImportController
+from controllers.export_controller import ExportController
+from views.components.task_runner import get_runner
+from utils.tracing import traced
+from utils.log import get_logger
 
-class TransactionWidget(QFrame):
-    def __init__(self, transaction, parent=None):
+logger = get_logger(__name__)
+
+
+class TransactionListModel(QAbstractListModel):
+    """Transactions of one user, newest first, fetched a page at a time.
+
+    Only the loaded pages are held in memory; the view asks for the next page
+    through canFetchMore/fetchMore when the user scrolls near the end. Pages
+    are queried on a worker thread and appended when they arrive.
+    """
+
+    TransactionRole = Qt.UserRole + 1
+
+    def __init__(self, user_id, controller, page_size=200, parent=None):
         super().__init__(parent)
-        self.transaction = transaction
-        self.setObjectName("transactionWidget")
-        self.setStyleSheet("""
-            #transactionWidget {
-                background-color: white;
-                border-radius: 8px;
-                margin: 4px;
-                padding: 12px;
-            }
-            #transactionWidget:hover {
-                background-color: #f5f5f5;
-            }
-        """)
-        
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(12, 12, 12, 12)
-        
-        # Left side - Date and Description
-        left_widget = QWidget()
-        left_layout = QVBoxLayout(left_widget)
-        left_layout.setSpacing(4)
-        
-        # Convert string date to datetime if needed
-        if isinstance(transaction.date, str):
+        self.user_id = user_id
+        self.controller = controller
+        self.page_size = page_size
+        self._transactions = []
+        self._cursor = None
+        self._has_more = True
+        self._loading = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._transactions)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        transaction = self._transactions[index.row()]
+        if role == self.TransactionRole:
+            return transaction
+        if role == Qt.DisplayRole:
+            return transaction.description
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._loading = True
+        get_runner().submit(
+            self, self.controller.list_transactions,
+            self.user_id, after=self._cursor, limit=self.page_size,
+            key="page", on_result=self._append_page, on_error=self._fetch_failed
+        )
+
+    @traced(category="ui")
+    def _append_page(self, result):
+        page, cursor = result
+        self._loading = False
+        self._cursor = cursor
+        self._has_more = cursor is not None
+        if page:
+            first = len(self._transactions)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self._transactions.extend(page)
+            self.endInsertRows()
+
+    def _fetch_failed(self, error):
+        logger.error("Error fetching transactions: %s", error)
+        self._loading = False
+        self._has_more = False
+
+    def reset(self):
+        """Drop the loaded pages and start again from the newest transaction."""
+        get_runner().cancel(self)
+        self.beginResetModel()
+        self._transactions = []
+        self._cursor = None
+        self._has_more = True
+        self._loading = False
+        self.endResetModel()
+
+
+class TransactionDelegate(QStyledItemDelegate):
+    """Paints a transaction row as the white rounded card the page always had."""
+
+    MARGIN = 4
+    PADDING = 12
+    LINE_SPACING = 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Fonts, colors and metrics are built once, not per row or per paint
+        self.small_font = QFont()
+        self.small_font.setPixelSize(13)
+        self.bold_font = QFont()
+        self.bold_font.setPixelSize(15)
+        self.bold_font.setBold(True)
+        self.small_metrics = QFontMetrics(self.small_font)
+        self.bold_metrics = QFontMetrics(self.bold_font)
+
+        self.card_color = QColor("white")
+        self.hover_color = QColor("#f5f5f5")
+        self.muted_color = QColor("#666")
+        self.text_color = QColor("black")
+        self.income_color = QColor("#2ecc71")
+        self.expense_color = QColor("#e74c3c")
+
+        self.row_height = (
+            2 * (self.MARGIN + self.PADDING)
+            + 2 * self.small_metrics.height()
+            + self.bold_metrics.height()
+            + 2 * self.LINE_SPACING
+        )
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.row_height)
+
+    def paint(self, painter, option, index):
+        transaction = index.data(TransactionListModel.TransactionRole)
+        if transaction is None:
+            return
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        card = option.rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+        hovered = option.state & QStyle.State_MouseOver
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.hover_color if hovered else self.card_color)
+        painter.drawRoundedRect(QRectF(card), 8, 8)
+
+        content = card.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+        is_income = transaction.transaction_type == TransactionType.INCOME
+
+        # Right side - Amount
+        amount_text = f"{'+' if is_income else '-'} Rp.{abs(transaction.amount):.2f}"
+        amount_width = self.bold_metrics.horizontalAdvance(amount_text)
+        painter.setFont(self.bold_font)
+        painter.setPen(self.income_color if is_income else self.expense_color)
+        painter.drawText(content, Qt.AlignRight | Qt.AlignVCenter, amount_text)
+
+        # Left side - Date, Description and Category
+        left = content.adjusted(0, 0, -(amount_width + self.PADDING), 0)
+        lines = [
+            (self._format_date(transaction.date), self.small_font, self.small_metrics, self.muted_color),
+            (transaction.description, self.bold_font, self.bold_metrics, self.text_color),
+            (str(transaction.category), self.small_font, self.small_metrics, self.muted_color),
+        ]
+        top = left.top()
+        for text, font, metrics, color in lines:
+            painter.setFont(font)
+            painter.setPen(color)
+            line = QRect(left.left(), top, left.width(), metrics.height())
+            painter.drawText(
+                line, Qt.AlignLeft | Qt.AlignVCenter,
+                metrics.elidedText(text or "", Qt.ElideRight, line.width())
+            )
+            top += metrics.height() + self.LINE_SPACING
+
+        painter.restore()
+
+    @staticmethod
+    def _format_date(value):
+        if isinstance(value, str):
             try:
-                # Assuming the date string is in ISO format (YYYY-MM-DD)
-                date_obj = datetime.strptime(transaction.date, "%Y-%m-%d")
-                formatted_date = date_obj.strftime("%d %b")
+                return datetime.strptime(value, "%Y-%m-%d").strftime("%d %b")
             except ValueError:
-                # Fallback if date string is in unexpected format
-                formatted_date = transaction.date
-        else:
-            # If it's already a datetime object
-            formatted_date = transaction.date.strftime("%d %b")
-            
-        date = QLabel(formatted_date)
-        date.setStyleSheet("color: #666; font-size: 13px;")
-        description = QLabel(transaction.description)
-        description.setStyleSheet("font-size: 15px; font-weight: bold;")
-        category = QLabel(transaction.category)
-        category.setStyleSheet("color: #666; font-size: 13px;")
-        
-        left_layout.addWidget(date)
-        left_layout.addWidget(description)
-        left_layout.addWidget(category)
-        
-        # Right side - Amount
-        amount_str = f"{'+' if transaction.transaction_type == TransactionType.INCOME else '-'} Rp.{abs(transaction.amount):.2f}"
-        amount = QLabel(amount_str)
-        amount.setStyleSheet(
-            f"font-size: 15px; font-weight: bold; color: {'#2ecc71' if transaction.transaction_type == TransactionType.INCOME else '#e74c3c'};"
-        )
-        amount.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-        
-        layout.addWidget(left_widget, stretch=1)
-        layout.addWidget(amount)
+                return value
+        return value.strftime("%d %b")
 
 class TransactionPage(QWidget):
     def __init__(self, user_id, controller, parent=None):
@@ -94,7 +207,18 @@ class TransactionPage(QWidget):
             QPushButton#addButton:hover {
                 background-color: #27ae60;
             }
-            QScrollArea {
+            QPushButton#importButton, QPushButton#exportButton {
+                background-color: white;
+                color: #333;
+                border: 1px solid #ddd;
+                border-radius: 25px;
+                font-weight: bold;
+                padding: 10px 20px;
+            }
+            QPushButton#importButton:hover, QPushButton#exportButton:hover {
+                background-color: #f5f5f5;
+            }
+            QListView {
                 border: none;
                 background-color: transparent;
             }
@@ -121,17 +245,19 @@ class TransactionPage(QWidget):
         
         self.layout.addWidget(header)
 
-        # Scroll area for transactions
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        
-        scroll_content = QWidget()
-        self.transactions_layout = QVBoxLayout(scroll_content)
-        self.transactions_layout.setSpacing(8)
-        scroll.setWidget(scroll_content)
-        
-        self.layout.addWidget(scroll)
+        # Transaction list, painted by the delegate and loaded page by page
+        self.model = TransactionListModel(user_id, controller, parent=self)
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setItemDelegate(TransactionDelegate(self.list_view))
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.list_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.list_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.list_view.setMouseTracking(True)
+        self.list_view.clicked.connect(self.on_transaction_clicked)
+
+        self.layout.addWidget(self.list_view)
 
         # Floating add button
         self.add_button = QPushButton("+")
@@ -139,30 +265,80 @@ class TransactionPage(QWidget):
         self.add_button.setFixedSize(50, 50)
         self.add_button.clicked.connect(self.show_create_transaction_dialog)
 
+        # Bulk import from bank exports
+        self.import_button = QPushButton("Import")
+        self.import_button.setObjectName("importButton")
+        self.import_button.setFixedHeight(50)
+        self.import_button.clicked.connect(self.show_import_dialog)
+
+        # Export of the whole history; runs off the UI thread
+        self.export_button = QPushButton("Export")
+        self.export_button.setObjectName("exportButton")
+        self.export_button.setFixedHeight(50)
+        self.export_button.clicked.connect(self.export_transactions)
+
         button_layout = QHBoxLayout()
         button_layout.addStretch()
+        button_layout.addWidget(self.export_button)
+        button_layout.addWidget(self.import_button)
         button_layout.addWidget(self.add_button)
         self.layout.addLayout(button_layout)
 
         # Load transactions
         self.refresh_transaction_list()
 
+    @traced(category="ui")
     def refresh_transaction_list(self):
-        # Clear existing transactions
-        while self.transactions_layout.count():
-            child = self.transactions_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        # Add new transactions
-        transactions = self.controller.get_transactions_by_user_id(self.user_id)
-        for transaction in transactions:
-            widget = TransactionWidget(transaction)
-            widget.mousePressEvent = lambda _, t=transaction: self.show_transaction_detail(t)
-            self.transactions_layout.addWidget(widget)
-        
-        # Add stretch at the end
-        self.transactions_layout.addStretch()
+        # Reload from the first page; the view fetches further pages on scroll
+        self.model.reset()
+        if self.model.canFetchMore():
+            self.model.fetchMore()
+
+    def on_transaction_clicked(self, index):
+        self.show_transaction_detail(index.data(TransactionListModel.TransactionRole))
+
+    def show_import_dialog(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Transactions", "", "Bank exports (*.csv *.ofx *.qfx *.qif);;All files (*)"
+        )
+        if not path:
+            return
+        dialog = ImportDialog(self.user_id, path, parent=self)
+        dialog.exec_()
+        # Batches are committed as they go, so even a cancelled import adds rows
+        self.refresh_transaction_list()
+
+    def export_transactions(self):
+        path, selected = QFileDialog.getSaveFileName(
+            self, "Export Transactions", "transactions.csv",
+            "CSV (*.csv);;JSON Lines (*.jsonl);;NumPy arrays (*.npz)"
+        )
+        if not path:
+            return
+        if not os.path.splitext(path)[1]:
+            path += "." + selected.split("*.")[-1].rstrip(")")
+        self.export_button.setEnabled(False)
+        self.export_button.setText("Exporting...")
+        get_runner().submit(
+            self, ExportController().export, self.user_id, "transactions", path, key="export",
+            on_result=self.on_export_finished, on_error=self.on_export_failed
+        )
+
+    def on_export_finished(self, report):
+        if report.error:
+            self.on_export_failed(report.error)
+            return
+        self.export_button.setEnabled(True)
+        self.export_button.setText("Export")
+        QMessageBox.information(
+            self, "Export Complete",
+            f"Exported {report.rows:,} transactions to {os.path.basename(report.path)}."
+        )
+
+    def on_export_failed(self, error):
+        self.export_button.setEnabled(True)
+        self.export_button.setText("Export")
+        QMessageBox.warning(self, "Export Failed", str(error))
 
     def show_create_transaction_dialog(self):
         dialog = TransactionForm(user_id=self.user_id, controller=self.controller, parent=self)
@@ -261,16 +437,16 @@ class TransactionForm(QDialog):
         button_layout = QHBoxLayout()
         button_layout.setSpacing(8)
         
-        save_button = QPushButton("Save")
-        save_button.setObjectName("saveButton")
-        save_button.clicked.connect(self.save_transaction)
+        self.save_button = QPushButton("Save")
+        self.save_button.setObjectName("saveButton")
+        self.save_button.clicked.connect(self.save_transaction)
         
         cancel_button = QPushButton("Cancel")
         cancel_button.setObjectName("cancelButton")
         cancel_button.clicked.connect(self.reject)
         
         button_layout.addStretch()
-        button_layout.addWidget(save_button)
+        button_layout.addWidget(self.save_button)
         button_layout.addWidget(cancel_button)
         
         self.layout.addSpacing(8)
@@ -283,7 +459,7 @@ class TransactionForm(QDialog):
             QMessageBox.warning(self, "Error", "Amount must be a valid number.")
             return
         
-        amount = int(amount * 100) // 100  # Round to 2 decimal places
+        amount = amount.quantize(Decimal("0.01"))  # Round to 2 decimal places
         
         category = self.category_input.currentText()
         transaction_type = self.type_input.currentText()
@@ -298,18 +474,30 @@ class TransactionForm(QDialog):
             )
             if confirm == QMessageBox.Yes:
                 if self.transaction:  # Update existing transaction
-                    self.controller.update_transaction(
+                    task = (
+                        self.controller.update_transaction,
                         self.transaction.transaction_id, amount, category, transaction_type, description
                     )
                 else:  # Create new transaction
-                    self.controller.create_transaction(self.user_id, amount, category, transaction_type, description)
+                    task = (self.controller.create_transaction, self.user_id, amount, category, transaction_type, description)
 
-                self.accept()
+                self.save_button.setEnabled(False)
+                self.save_button.setText("Saving...")
+                get_runner().submit(self, *task, key="save", on_result=self.on_saved, on_error=self.on_save_failed)
             else:
                 self.reject()  # Reject the dialog if user clicks 'No'
         else:
             QMessageBox.warning(self, "Error", "Please provide valid inputs.")
 
+    def on_saved(self, _):
+        self.accept()
+
+    def on_save_failed(self, error):
+        logger.error("Error saving transaction: %s", error)
+        self.save_button.setEnabled(True)
+        self.save_button.setText("Save")
+        QMessageBox.warning(self, "Error", "Failed to save the transaction.")
+
 class TransactionDetailDialog(QDialog):
     def __init__(self, transaction, controller, parent=None):
         super().__init__(parent)
@@ -409,21 +597,21 @@ class TransactionDetailDialog(QDialog):
         button_layout = QHBoxLayout()
         button_layout.setSpacing(8)
 
-        update_button = QPushButton("Update")
-        update_button.setObjectName("updateButton")
-        update_button.clicked.connect(self.update_transaction)
+        self.update_button = QPushButton("Update")
+        self.update_button.setObjectName("updateButton")
+        self.update_button.clicked.connect(self.update_transaction)
 
-        delete_button = QPushButton("Delete")
-        delete_button.setObjectName("deleteButton")
-        delete_button.clicked.connect(self.delete_transaction)
+        self.delete_button = QPushButton("Delete")
+        self.delete_button.setObjectName("deleteButton")
+        self.delete_button.clicked.connect(self.delete_transaction)
 
         close_button = QPushButton("Close")
         close_button.setObjectName("closeButton")
         close_button.clicked.connect(self.reject)
 
         button_layout.addStretch()
-        button_layout.addWidget(update_button)
-        button_layout.addWidget(delete_button)
+        button_layout.addWidget(self.update_button)
+        button_layout.addWidget(self.delete_button)
         button_layout.addWidget(close_button)
 
         self.layout.addLayout(button_layout)
@@ -447,5 +635,136 @@ class TransactionDetailDialog(QDialog):
             QMessageBox.No
         )
         if confirm == QMessageBox.Yes:
-            self.controller.delete_transaction(self.transaction.transaction_id)
-            self.accept()
\ No newline at end of file
+            self.set_busy(True)
+            get_runner().submit(
+                self, self.controller.delete_transaction, self.transaction.transaction_id,
+                key="delete", on_result=lambda _: self.accept(), on_error=self.on_failed
+            )
+
+    def on_failed(self, error):
+        logger.error("Error deleting transaction: %s", error)
+        self.set_busy(False)
+        QMessageBox.warning(self, "Error", "Failed to delete the transaction.")
+
+    def set_busy(self, busy):
+        self.update_button.setEnabled(not busy)
+        self.delete_button.setEnabled(not busy)
+
+
+class ImportDialog(QDialog):
+    """Runs an import in the background and shows its progress."""
+
+    # Emitted from the import thread; Qt queues it to the UI thread
+    progress_changed = pyqtSignal(int, int, float)
+
+    def __init__(self, user_id, path, import_controller=None, parent=None):
+        super().__init__(parent)
+        self.import_controller = import_controller or ImportController()
+        self.cancel_event = threading.Event()
+        self.running = True
+        self.report = None
+
+        self.setWindowTitle("Import Transactions")
+        self.setMinimumWidth(420)
+        self.setStyleSheet("""
+            QDialog {
+                background-color: white;
+            }
+            QLabel {
+                font-size: 14px;
+                padding: 4px 0;
+            }
+            QLabel#errorsLabel {
+                color: #e74c3c;
+                font-size: 12px;
+            }
+            QLabel#duplicatesLabel {
+                color: #7f8c8d;
+                font-size: 12px;
+            }
+            QPushButton {
+                padding: 8px 16px;
+                border-radius: 4px;
+                border: none;
+                background-color: #95a5a6;
+                color: white;
+                font-weight: bold;
+                min-width: 80px;
+            }
+        """)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(os.path.basename(path)))
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        layout.addWidget(self.progress_bar)
+
+        self.status_label = QLabel("Starting...")
+        layout.addWidget(self.status_label)
+        self.errors_label = QLabel()
+        self.errors_label.setObjectName("errorsLabel")
+        self.errors_label.setWordWrap(True)
+        self.errors_label.hide()
+        layout.addWidget(self.errors_label)
+        self.duplicates_label = QLabel()
+        self.duplicates_label.setObjectName("duplicatesLabel")
+        self.duplicates_label.setWordWrap(True)
+        self.duplicates_label.hide()
+        layout.addWidget(self.duplicates_label)
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        self.close_button = QPushButton("Cancel")
+        self.close_button.clicked.connect(self.reject)
+        button_layout.addWidget(self.close_button)
+        layout.addLayout(button_layout)
+
+        self.progress_changed.connect(self.show_progress)
+        get_runner().submit(
+            self, self.import_controller.import_file, user_id, path,
+            progress=self.report_progress, cancel=self.cancel_event,
+            on_result=self.on_finished, on_error=self.on_failed
+        )
+
+    def report_progress(self, report, fraction):
+        # Called on the import thread, so only emit
+        self.progress_changed.emit(report.imported, report.failed, fraction)
+
+    def show_progress(self, imported, failed, fraction):
+        self.progress_bar.setValue(int(fraction * 1000))
+        self.status_label.setText(f"Imported {imported:,} rows" + (f", {failed:,} failed" if failed else ""))
+
+    def on_finished(self, report):
+        self.running = False
+        self.report = report
+        self.progress_bar.setValue(1000 if not report.cancelled else self.progress_bar.value())
+        verb = "Cancelled after importing" if report.cancelled else "Imported"
+        self.status_label.setText(
+            f"{verb} {report.imported:,} rows in {report.elapsed:.1f}s"
+            + (f", {report.failed:,} failed" if report.failed else "")
+            + (f", {report.skipped:,} duplicates skipped" if report.skipped else "")
+        )
+        if report.errors:
+            self.errors_label.setText("\n".join(report.errors[:5]))
+            self.errors_label.show()
+        if report.duplicates:
+            self.duplicates_label.setText("Skipped:\n" + "\n".join(report.duplicates[:5]))
+            self.duplicates_label.show()
+        self.close_button.setText("Close")
+        self.close_button.setEnabled(True)
+
+    def on_failed(self, error):
+        self.running = False
+        self.status_label.setText(f"Import failed: {error}")
+        self.close_button.setText("Close")
+        self.close_button.setEnabled(True)
+
+    def reject(self):
+        # Cancel stops the import after the current batch; Close then dismisses the summary
+        if self.running:
+            self.cancel_event.set()
+            self.status_label.setText("Cancelling...")
+            self.close_button.setEnabled(False)
+            return
+        super().reject()
@@ -0,0 +1,50 @@
+# tests/conftest.py
+# Description : Shared fixtures; the application is imported from src/ like main.py does
+
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import pytest
+
+import database
+from controllers.cache import query_cache
+
+
+@pytest.fixture
+def temp_database(tmp_path):
+    """A freshly migrated database in tmp_path, used by every pooled connection."""
+    path = str(tmp_path / "signance.db")
+    # Cached reads are keyed by user id, which every new database reuses
+    query_cache.clear()
+    database.configure_pool(path=path)
+    database.initialize_database()
+    yield path
+    database.get_pool().close()
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    yield app
+    from views.components import get_runner
+    get_runner().shutdown(wait=True)
+
+
+@pytest.fixture
+def wait_for_tasks(qapp):
+    """Call to pump the event loop until every TaskRunner result has been delivered."""
+    from views.components import get_runner
+
+    def wait(timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while not get_runner().is_idle():
+            assert time.monotonic() < deadline, "background tasks did not finish"
+            qapp.processEvents()
+            time.sleep(0.001)
+        qapp.processEvents()
+    return wait
@@ -0,0 +1,52 @@
+# tests/test_bank_parsers.py
+# Description : Every row of a CSV export is read with the same date format
+
+import io
+from datetime import datetime
+
+from utils.bank_parsers import MAX_HELD_ROWS, ParseError, parse_csv
+
+
+def _parse(text, **options):
+    return list(parse_csv(io.StringIO(text), **options))
+
+
+def test_ambiguous_dates_follow_the_file_order():
+    rows = _parse("Date,Amount\n01/02/2024,-1.00\n03/04/2024,-2.00\n12/25/2024,-3.00\n02/01/2024,-4.00\n")
+    assert [row.date for row in rows] == [
+        datetime(2024, 1, 2), datetime(2024, 3, 4), datetime(2024, 12, 25), datetime(2024, 2, 1)
+    ]
+
+
+def test_day_first_file_stays_day_first():
+    rows = _parse("Date,Amount\n25/12/2024,-1.00\n01/02/2024,-2.00\n")
+    assert [row.date for row in rows] == [datetime(2024, 12, 25), datetime(2024, 2, 1)]
+
+
+def test_unsettled_file_rejects_ambiguous_rows():
+    rows = _parse("Date,Amount\n01/02/2024,-1.00\n05/05/2024,-2.00\n")
+    assert isinstance(rows[0], ParseError) and rows[0].line == 2
+    assert rows[1].date == datetime(2024, 5, 5)
+
+    rows = _parse("Date,Amount\n01/02/2024,-1.00\n", date_format="%d/%m/%Y")
+    assert rows[0].date == datetime(2024, 2, 1)
+
+
+def test_rows_are_held_back_only_up_to_a_limit():
+    read = []
+
+    def lines():
+        yield "Date,Amount\n"
+        for day in range(1, 10000):
+            read.append(day)
+            yield f"0{day % 9 + 1}/12/2024,-1.00\n"
+        yield "25/12/2024,-1.00\n"
+
+    rows = parse_csv(lines(), delimiter=",")
+    first = next(rows)
+    assert isinstance(first, ParseError) and "ambiguous" in str(first)
+    assert len(read) == MAX_HELD_ROWS
+    rows = [first] + list(rows)
+    # The last, unambiguous date settles what is still held back
+    assert rows[-2].date == datetime(2024, 12, 9999 % 9 + 1)
+    assert sum(isinstance(row, ParseError) for row in rows) == 9999 // MAX_HELD_ROWS * MAX_HELD_ROWS
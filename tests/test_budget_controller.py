@@ -0,0 +1,72 @@
+# tests/test_budget_controller.py
+# Description : Budget periods include their whole last day
+
+from datetime import date, timedelta
+
+from controllers.budget_controller import BudgetController
+from database.database import transaction
+from database.dates import to_db_timestamp
+from database.migrations import MIGRATIONS
+
+
+def _add_user():
+    with transaction() as conn:
+        return conn.execute(
+            "INSERT INTO users (username, email, password_hash) VALUES ('u', 'u@example.com', 'x') RETURNING user_id"
+        ).fetchone()[0]
+
+
+def test_budget_is_active_on_its_last_day(temp_database):
+    user_id = _add_user()
+    controller = BudgetController()
+    today = date.today()
+    budget = controller.create_budget(user_id, "transport", 50, today - timedelta(days=17), today)
+
+    assert budget.end_date.date() == today
+    assert [b.budget_id for b in controller.get_active_budgets(user_id)] == [budget.budget_id]
+    assert controller.get_budget_by_id(budget.budget_id).end_date.date() == today
+
+
+def test_budget_ending_yesterday_is_not_active(temp_database):
+    user_id = _add_user()
+    controller = BudgetController()
+    today = date.today()
+    controller.create_budget(user_id, "transport", 50, today - timedelta(days=17), today - timedelta(days=1))
+
+    assert controller.get_active_budgets(user_id) == []
+
+
+def test_migration_moves_end_dates_to_the_next_midnight(temp_database):
+    user_id = _add_user()
+    last_day = date(2025, 3, 31)
+    with transaction() as conn:
+        conn.execute(
+            "INSERT INTO budgets (user_id, category, amount, start_date, end_date) VALUES (?, 'foods', 100, ?, ?)",
+            (user_id, to_db_timestamp(date(2025, 3, 1)), to_db_timestamp(last_day))
+        )
+        next(m for m in MIGRATIONS if m.version == 8).apply(conn)
+        stored = conn.execute("SELECT end_date FROM budgets").fetchone()[0]
+
+    assert stored == to_db_timestamp(last_day + timedelta(days=1))
+    assert BudgetController().get_all_budgets(user_id)[0].end_date.date() == last_day
+
+
+def test_export_reports_the_last_included_day(temp_database, tmp_path):
+    import json
+
+    import numpy as np
+
+    from controllers.export_controller import ExportController, format_timestamp
+
+    user_id = _add_user()
+    BudgetController().create_budget(user_id, "transport", 50, date(2026, 10, 1), date(2026, 10, 31))
+    last_day = to_db_timestamp(date(2026, 10, 31))
+
+    path = tmp_path / "budgets.jsonl"
+    assert ExportController().export(user_id, "budgets", str(path)).error is None
+    assert json.loads(path.read_text())["end_date"] == format_timestamp(last_day)
+
+    path = tmp_path / "budgets.npz"
+    assert ExportController().export(user_id, "budgets", str(path)).error is None
+    with np.load(path) as arrays:
+        assert arrays["end_date"][0] == np.datetime64(last_day.replace(" ", "T"))
@@ -0,0 +1,51 @@
+# tests/test_cli.py
+# Description : Command line failures are JSON errors with exit status 1
+
+import json
+
+import pytest
+
+import cli
+from utils.log import shutdown_logging
+
+
+@pytest.fixture
+def run(temp_database, tmp_path, monkeypatch, capsys):
+    """Call to run `signance <argv>` and get (status, JSON output)."""
+    monkeypatch.setenv("SIGNANCE_LOG_DIR", str(tmp_path / "logs"))
+    monkeypatch.setenv("SIGNANCE_PASSWORD", "cli-password")
+    options = ["--database", temp_database, "--session", str(tmp_path / "session.json")]
+
+    def invoke(*argv):
+        status = cli.main(options + list(argv))
+        # What exiting the process does, while stderr is still captured
+        shutdown_logging()
+        return status, json.loads(capsys.readouterr().out)
+    invoke("register", "cli", "cli@example.com")
+    invoke("login", "cli")
+    return invoke
+
+
+def test_import_of_an_unreadable_file_fails(run, tmp_path):
+    status, result = run("import", str(tmp_path / "missing.csv"))
+    assert status == 1 and result["error"].startswith("import failed")
+
+    export = tmp_path / "bank.csv"
+    export.write_text("Date,Amount,Description\n2025-01-15,-12.50,lunch\n")
+    status, result = run("import", str(export))
+    assert status == 0 and result["imported"] == 1
+
+
+def test_malformed_after_cursor_is_an_error(run):
+    for after in ("not json", "5", '["2025-01-15"]', '["2025-01-15", "x"]'):
+        assert run("transactions", "list", "--after", after) == (1, {"error": "invalid --after"})
+    assert run("transactions", "list", "--after", '["2025-01-15 00:00:00", 7]') == (
+        0, {"transactions": [], "next": None}
+    )
+
+
+def test_unexpected_errors_are_reported_as_json(run, monkeypatch):
+    def broken(self, *args, **kwargs):
+        raise RuntimeError("disk on fire")
+    monkeypatch.setattr(cli.controllers.TransactionController, "list_transactions", broken)
+    assert run("transactions", "list") == (1, {"error": "unexpected error: disk on fire"})
@@ -0,0 +1,42 @@
+# tests/test_dashboard_service.py
+# Description : Dashboard snapshots use current budgets and never cache failures
+
+from datetime import date
+from decimal import Decimal
+
+from controllers.budget_controller import BudgetController
+from controllers.dashboard_service import DashboardService
+from database.database import transaction
+
+
+def _add_user():
+    with transaction() as conn:
+        return conn.execute(
+            "INSERT INTO users (username, email, password_hash) VALUES ('u', 'u@example.com', 'x') RETURNING user_id"
+        ).fetchone()[0]
+
+
+def test_snapshot_only_uses_budgets_active_on_as_of(temp_database):
+    user_id = _add_user()
+    budgets = BudgetController()
+    budgets.create_budget(user_id, "foods", 900, date(2025, 1, 1), date(2025, 1, 31))
+    budgets.create_budget(user_id, "foods", 200, date(2025, 2, 1), date(2025, 2, 28))
+    budgets.create_budget(user_id, "transport", 50, date(2025, 1, 1), date(2025, 1, 31))
+
+    snapshot = DashboardService().snapshot(user_id, as_of=date(2025, 2, 28))
+
+    assert dict(snapshot.category_budgets) == {"foods": Decimal("200.00")}
+
+
+def test_failed_snapshot_is_not_cached(temp_database):
+    user_id = _add_user()
+    service = DashboardService()
+    as_of = date(2025, 2, 1)
+    with transaction() as conn:
+        conn.execute("ALTER TABLE monthly_rollups RENAME TO monthly_rollups_away")
+    assert service.snapshot(user_id, as_of) is None
+
+    with transaction() as conn:
+        conn.execute("ALTER TABLE monthly_rollups_away RENAME TO monthly_rollups")
+    snapshot = service.snapshot(user_id, as_of)
+    assert snapshot is not None and snapshot.as_of == as_of
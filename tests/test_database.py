@@ -0,0 +1,57 @@
+# tests/test_database.py
+# Description : The connection pool opens connections without holding its lock
+
+import threading
+import time
+
+import pytest
+
+from database.database import ConnectionPool
+
+
+class SlowOpenPool(ConnectionPool):
+    OPEN_TIME = 0.2
+
+    def _connect(self):
+        time.sleep(self.OPEN_TIME)
+        return super()._connect()
+
+
+def test_connections_open_in_parallel(tmp_path):
+    pool = SlowOpenPool(tmp_path / "pool.db", pool_size=4)
+    opened = threading.Barrier(4)
+
+    def checkout():
+        with pool.connection() as conn:
+            conn.execute("SELECT 1").fetchone()
+            # Hold on until all four are open, so none is reused
+            opened.wait(timeout=5)
+
+    threads = [threading.Thread(target=checkout) for _ in range(4)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    assert pool.stats()["created"] == 4
+    assert elapsed < 2 * SlowOpenPool.OPEN_TIME
+    pool.close()
+
+
+def test_failed_open_frees_its_slot(tmp_path, monkeypatch):
+    pool = ConnectionPool(tmp_path / "pool.db", pool_size=1, timeout=1)
+
+    def unavailable():
+        raise OSError("disk unavailable")
+    monkeypatch.setattr(pool, "_connect", unavailable)
+    with pytest.raises(OSError):
+        pool.acquire()
+    monkeypatch.undo()
+
+    # The only slot is free again, so this does not time out
+    with pool.connection() as conn:
+        assert conn.execute("SELECT 1").fetchone() == (1,)
+    assert pool.stats()["open"] == 1
+    pool.close()
@@ -0,0 +1,62 @@
+# tests/test_export_controller.py
+# Description : Exports write the user's rows in every format, filtered and formatted
+
+import csv
+import json
+from datetime import date, datetime
+
+import numpy as np
+
+from controllers.export_controller import ExportController
+from database.database import transaction
+from database.dates import to_db_timestamp
+
+
+def _add_user(name, rows):
+    with transaction() as conn:
+        user_id = conn.execute(
+            "INSERT INTO users (username, email, password_hash) VALUES (?, ?, 'x') RETURNING user_id",
+            (name, f"{name}@example.com")
+        ).fetchone()[0]
+        conn.executemany(
+            "INSERT INTO transactions (user_id, amount, category, transaction_type, description, date) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(user_id, amount, category, kind, "row", to_db_timestamp(moment)) for moment, amount, category, kind in rows]
+        )
+    return user_id
+
+
+def test_transactions_export_in_every_format(temp_database, tmp_path):
+    user_id = _add_user("alice", [
+        (datetime(2025, 1, 5, 12), 1234, "foods", "expense"),
+        (datetime(2025, 2, 5, 12), -5, "other", "income"),
+        (datetime(2025, 3, 5, 12), 100000, "foods", "expense"),
+    ])
+    _add_user("bob", [(datetime(2025, 1, 6, 12), 999, "foods", "expense")])
+    controller = ExportController()
+
+    report = controller.export(user_id, "transactions", str(tmp_path / "all.csv"), fetch_size=2)
+    assert (report.error, report.rows) == (None, 3)
+    with open(tmp_path / "all.csv", newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert [row["amount"] for row in rows] == ["12.34", "-0.05", "1000.00"]
+    assert rows[0]["date"].endswith("Z") and rows[0]["date"][10] == "T"
+
+    report = controller.export(
+        user_id, "transactions", str(tmp_path / "foods.jsonl"), category="foods", end=date(2025, 2, 28)
+    )
+    assert report.rows == 1
+    lines = (tmp_path / "foods.jsonl").read_text().splitlines()
+    assert len(lines) == 1 and json.loads(lines[0])["amount"] == "12.34"
+
+    assert controller.export(user_id, "transactions", str(tmp_path / "all.npz")).rows == 3
+    with np.load(tmp_path / "all.npz") as arrays:
+        assert len(arrays["transaction_id"]) == 3
+
+
+def test_failed_export_leaves_no_file(temp_database, tmp_path):
+    user_id = _add_user("alice", [(datetime(2025, 1, 5, 12), 100, "foods", "expense")])
+    path = tmp_path / "missing" / "out.csv"
+    report = ExportController().export(user_id, "transactions", str(path))
+    assert report.error is not None
+    assert not path.exists() and not (tmp_path / "missing" / "out.csv.part").exists()
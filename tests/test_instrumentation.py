@@ -0,0 +1,42 @@
+# tests/test_instrumentation.py
+# Description : Statements are recorded on the thread that ran them
+
+import gc
+import threading
+
+from database import instrumentation
+from database.database import connection
+
+
+def test_statements_are_recorded_before_the_cursor_is_dropped(temp_database, tmp_path):
+    recorded = []
+    record = lambda shape, caller, started, execute_time, fetch_time, rows: recorded.append(
+        (shape, rows, threading.current_thread())
+    )
+    # Every statement is slow, so each one would EXPLAIN
+    instrumentation.enable(slow_ms=0, slow_log=str(tmp_path / "slow.jsonl"))
+    instrumentation.add_listener(record)
+    try:
+        with connection() as conn:
+            # Only the statements below, not the pragmas of a new connection
+            recorded.clear()
+            conn.execute("CREATE TEMP TABLE t (x)")
+            conn.execute("INSERT INTO t VALUES (1), (2)")
+            count = conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+            assert [(shape, rows) for shape, rows, _ in recorded] == [
+                ("CREATE TEMP TABLE t (x)", 0), ("INSERT INTO t VALUES (?), (?)", 0), ("SELECT COUNT(*) FROM t", 1)
+            ]
+            assert count == 2
+
+            # Dropped half-read: recorded by the collector, without an EXPLAIN
+            cursor = conn.execute("SELECT x FROM t WHERE x > 0")
+            next(cursor)
+            del cursor
+            gc.collect()
+        assert recorded[-1][:2] == ("SELECT x FROM t WHERE x > ?", 1)
+        assert all(thread is threading.main_thread() for _, _, thread in recorded)
+        assert "cursor was not read to the end" in (tmp_path / "slow.jsonl").read_text()
+    finally:
+        instrumentation.remove_listener(record)
+        instrumentation.disable()
+        instrumentation.monitor.reset()
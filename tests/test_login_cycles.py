@@ -0,0 +1,51 @@
+# tests/test_login_cycles.py
+# Description : Login/logout cycles leave no pages or widgets behind
+
+import gc
+
+from PyQt5.QtCore import QCoreApplication, QEvent
+from PyQt5.QtWidgets import QApplication
+
+from views.main_window import MainWindow, get_controller
+
+SESSION_PAGES = ["Dashboard", "Transactions", "Savings", "Budget"]
+
+
+def test_login_logout_cycles_do_not_leak_widgets(temp_database, wait_for_tasks):
+    get_controller("UserController").register("cycle", "cycle@example.com", "cycle-password")
+    user_id = get_controller("UserController").get_user_by_username_or_email("cycle")[0]
+    for i in range(20):
+        get_controller("TransactionController").create_transaction(user_id, 10 + i, "foods", "expense", f"cycle {i}")
+
+    def settle():
+        wait_for_tasks()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        gc.collect()
+
+    def cycle():
+        window.on_login_successful("cycle")
+        settle()
+        for name in SESSION_PAGES:
+            window.switch_page(name)
+            settle()
+        assert window.content_area.count() == len(SESSION_PAGES) + 1
+        window.logout()
+        settle()
+
+    window = MainWindow()
+    window.show()
+    settle()
+    # The first cycle loads what stays for the whole process (fonts, styles)
+    cycle()
+    pages = window.content_area.count()
+    widgets = len(QApplication.allWidgets())
+
+    for _ in range(3):
+        cycle()
+        assert window.content_area.count() == pages
+        assert list(window.pages.built_pages()) == ["Login"]
+        assert len(QApplication.allWidgets()) == widgets
+
+    window.close()
+    window.deleteLater()
+    settle()
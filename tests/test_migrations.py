@@ -0,0 +1,18 @@
+# tests/test_migrations.py
+# Description : Schema migrations and the index usage they promise
+
+from database.database import connection
+from database.migrations import LATEST_VERSION, get_schema_version, migrate, verify_query_plans
+
+
+def test_fresh_database_is_at_latest_version(temp_database):
+    with connection() as conn:
+        assert get_schema_version(conn) == LATEST_VERSION
+    assert migrate() == []
+
+
+def test_controller_queries_use_their_indexes(temp_database):
+    failures = verify_query_plans()
+    assert failures == [], "\n".join(
+        f"[migration {version}] {query}\n    plan: {plan}" for version, query, plan in failures
+    )
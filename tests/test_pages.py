@@ -0,0 +1,120 @@
+# tests/test_pages.py
+# Description : Pages load and save through the TaskRunner
+
+import threading
+from datetime import date, timedelta
+
+from controllers.budget_controller import BudgetController
+from models.budget import Category
+from controllers.saving_controller import SavingsController
+from controllers.transaction_controller import TransactionController
+from database.database import transaction
+from views.pages.budget_page import BudgetPage
+from views.pages.dashboard_page import DashboardPage
+from views.pages.saving_page import SavingsPage
+from views.pages import transaction_page
+from views.pages.transaction_page import TransactionDetailDialog, TransactionForm
+
+
+class ThreadRecorder:
+    """Wraps a controller and records the threads its methods ran on."""
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.threads = set()
+
+    def __getattr__(self, name):
+        method = getattr(self.controller, name)
+
+        def call(*args, **kwargs):
+            self.threads.add(threading.current_thread())
+            return method(*args, **kwargs)
+        return call
+
+
+def _add_user():
+    with transaction() as conn:
+        return conn.execute(
+            "INSERT INTO users (username, email, password_hash) VALUES ('u', 'u@example.com', 'x') RETURNING user_id"
+        ).fetchone()[0]
+
+
+def test_budget_page_loads_off_the_ui_thread(wait_for_tasks, temp_database):
+    user_id = _add_user()
+    today = date.today()
+    for category in ("foods", "transport"):
+        BudgetController().create_budget(user_id, category, 100, today, today + timedelta(days=30))
+    controller = ThreadRecorder(BudgetController())
+
+    page = BudgetPage(user_id, controller)
+    assert page.table_widget.rowCount() == 0
+    assert page.status_label.isVisibleTo(page)
+    wait_for_tasks()
+
+    assert page.table_widget.rowCount() == 2
+    assert [budget.category.value for budget in page.budgets] == ["foods", "transport"]
+    assert not page.status_label.isVisibleTo(page)
+    assert threading.main_thread() not in controller.threads
+    page.deleteLater()
+
+
+def test_savings_page_loads_off_the_ui_thread(wait_for_tasks, temp_database):
+    user_id = _add_user()
+    SavingsController().create_saving(user_id, "Holiday", 500, date.today() + timedelta(days=90))
+    controller = ThreadRecorder(SavingsController())
+
+    page = SavingsPage(user_id, controller)
+    assert page.list_widget.count() == 0
+    wait_for_tasks()
+
+    assert page.list_widget.count() == 1
+    assert page.get_selected_savings_id() is None
+    page.list_widget.setCurrentRow(0)
+    assert page.get_selected_savings_id() == page.savings_goals[0].saving_id
+    assert threading.main_thread() not in controller.threads
+    page.deleteLater()
+
+
+def test_transaction_dialogs_save_off_the_ui_thread(wait_for_tasks, temp_database, monkeypatch):
+    monkeypatch.setattr(transaction_page.QMessageBox, "question", lambda *args: transaction_page.QMessageBox.Yes)
+    user_id = _add_user()
+    controller = ThreadRecorder(TransactionController())
+
+    form = TransactionForm(user_id, controller)
+    form.amount_input.setText("12.50")
+    form.description_input.setText("lunch")
+    form.save_transaction()
+    assert not form.save_button.isEnabled()
+    wait_for_tasks()
+    assert form.result() == form.Accepted
+    (saved,), _ = TransactionController().list_transactions(user_id)
+    assert saved.description == "lunch"
+
+    dialog = TransactionDetailDialog(saved, controller)
+    dialog.delete_transaction()
+    assert not dialog.delete_button.isEnabled()
+    wait_for_tasks()
+    assert dialog.result() == dialog.Accepted
+    assert TransactionController().list_transactions(user_id) == ([], None)
+    assert threading.main_thread() not in controller.threads
+    form.deleteLater()
+    dialog.deleteLater()
+
+
+def test_dashboard_shows_only_current_budgets(wait_for_tasks, temp_database):
+    user_id = _add_user()
+    today = date.today()
+    budgets = BudgetController()
+    budgets.create_budget(user_id, "foods", 200, today - timedelta(days=5), today + timedelta(days=5))
+    # Created last, so it would win if expired budgets were still read
+    budgets.create_budget(user_id, "foods", 10, today - timedelta(days=60), today - timedelta(days=31))
+
+    page = DashboardPage(user_id, None, TransactionController(), budgets, lambda: None)
+    page.update_dashboard()
+    wait_for_tasks()
+
+    _, _, budget_data = page.budget_progress.category_progress
+    assert budget_data[Category.FOODS] == 200
+    assert budget_data[Category.TRANSPORT] == page.budget_progress.DEFAULT_BUDGET
+    assert page.line_chart.months == [page.line_chart.MONTH_NAMES[int(month[5:7]) - 1] for month in page.snapshot.months]
+    page.deleteLater()
@@ -0,0 +1,114 @@
+# tests/test_server.py
+# Description : HTTP API sessions, ownership, validation and paging
+
+import asyncio
+import json
+
+import pytest
+
+from server import Request, Server
+
+
+@pytest.fixture
+def api(temp_database):
+    """Call to send (method, path, body, token, query) to a Server and get (status, JSON body)."""
+    server = Server(workers=2)
+    loop = asyncio.new_event_loop()
+
+    def call(method, path, body=None, token=None, query=None):
+        headers = {"authorization": f"Bearer {token}"} if token else {}
+        payload = json.dumps(body).encode() if body is not None else b""
+        status, response = loop.run_until_complete(
+            server.dispatch(Request(method, path, query or {}, headers, payload))
+        )
+        return status, json.loads(response)
+    yield call
+    loop.close()
+    server.close()
+
+
+def _login(api, name):
+    api("POST", "/register", {"username": name, "email": f"{name}@example.com", "password": "api-password"})
+    status, body = api("POST", "/login", {"username": name, "password": "api-password"})
+    assert status == 200
+    return body["token"]
+
+
+def _add(api, token, amount="12.50", description="lunch"):
+    status, body = api("POST", "/transactions", {
+        "amount": amount, "category": "foods", "transaction_type": "expense", "description": description
+    }, token)
+    assert status == 201
+    return body["transaction_id"]
+
+
+def test_requests_need_a_live_session(api):
+    assert api("GET", "/me")[0] == 401
+    assert api("GET", "/transactions", token="not-a-token")[0] == 401
+    assert api("POST", "/login", {"username": "nobody", "password": "x"})[0] == 401
+
+    token = _login(api, "alice")
+    assert api("GET", "/me", token=token)[0] == 200
+    assert api("POST", "/logout", token=token)[0] == 200
+    assert api("GET", "/me", token=token)[0] == 401
+    assert api("GET", "/nowhere", token=token)[0] == 404
+    assert api("PATCH", "/me", token=token)[0] == 405
+
+
+def test_other_users_records_are_not_found(api):
+    alice, bob = _login(api, "alice"), _login(api, "bob")
+    transaction_id = _add(api, alice)
+    status, budget = api("POST", "/budgets", {
+        "category": "foods", "amount": "100", "start_date": "2026-10-01", "end_date": "2026-10-31"
+    }, alice)
+    assert status == 201
+
+    for method, path in [
+        ("GET", f"/transactions/{transaction_id}"), ("PUT", f"/transactions/{transaction_id}"),
+        ("DELETE", f"/transactions/{transaction_id}"), ("GET", f"/budgets/{budget['budget_id']}"),
+        ("DELETE", f"/budgets/{budget['budget_id']}"),
+    ]:
+        assert api(method, path, {}, bob)[0] == 404
+    assert api("GET", f"/transactions/{transaction_id}", token=alice)[0] == 200
+    assert api("GET", "/transactions", token=bob)[1]["transactions"] == []
+
+
+def test_invalid_input_is_rejected(api):
+    token = _login(api, "alice")
+    transaction_id = _add(api, token)
+    for amount in ("0", "-5", "0.001", "abc", "1e400", "NaN"):
+        status, _ = api("POST", "/transactions", {
+            "amount": amount, "category": "foods", "transaction_type": "expense"
+        }, token)
+        assert status == 400, amount
+    assert api("POST", "/transactions", {"amount": "5", "category": "rent", "transaction_type": "expense"}, token)[0] == 400
+    for body in ({"description": 5}, {"description": {"a": 1}}, {"amount": "0.001"}, {"transaction_type": "gift"}):
+        assert api("PUT", f"/transactions/{transaction_id}", body, token)[0] == 400, body
+    assert api("GET", f"/transactions/{transaction_id}", token=token)[1]["description"] == "lunch"
+
+    status, body = api("POST", "/budgets", {
+        "category": "foods", "amount": "100", "start_date": "2026-10-31", "end_date": "2026-10-01"
+    }, token)
+    assert (status, body) == (400, {"error": "start_date is after end_date"})
+
+    status, saving = api("POST", "/savings", {"name": "bike", "target_amount": "300", "deadline": "2027-06-01"}, token)
+    assert api("PUT", f"/savings/{saving['saving_id']}", {"current_amount": -50}, token)[0] == 400
+    status, saving = api("PUT", f"/savings/{saving['saving_id']}", {"current_amount": "50"}, token)
+    assert status == 200 and saving["current_amount"] == "50.00"
+
+
+def test_pages_continue_from_the_next_cursor(api):
+    token = _login(api, "alice")
+    created = [_add(api, token, amount=str(i + 1), description=f"row {i}") for i in range(5)]
+
+    seen, query = [], {"limit": "2"}
+    while True:
+        status, page = api("GET", "/transactions", token=token, query=query)
+        assert status == 200 and len(page["transactions"]) <= 2
+        seen += [row["transaction_id"] for row in page["transactions"]]
+        if page["next"] is None:
+            break
+        query = {"limit": "2", "after": page["next"]}
+    # Newest first, each row exactly once
+    assert seen == created[::-1]
+    assert api("GET", "/transactions", token=token, query={"after": "[1]"})[0] == 400
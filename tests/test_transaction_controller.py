@@ -0,0 +1,142 @@
+# tests/test_transaction_controller.py
+# Description : Cached month readers follow the month they are asked about
+
+from datetime import date, datetime
+from decimal import Decimal
+
+from controllers.transaction_controller import TransactionController
+from database.database import transaction
+from database.dates import to_db_timestamp
+
+
+def _add_user_with_expenses(expenses):
+    with transaction() as conn:
+        user_id = conn.execute(
+            "INSERT INTO users (username, email, password_hash) VALUES ('u', 'u@example.com', 'x') RETURNING user_id"
+        ).fetchone()[0]
+        conn.executemany(
+            "INSERT INTO transactions (user_id, amount, category, transaction_type, description, date) "
+            "VALUES (?, ?, 'foods', 'expense', 'lunch', ?)",
+            [(user_id, amount, to_db_timestamp(moment)) for moment, amount in expenses]
+        )
+    return user_id
+
+
+def test_month_readers_are_cached_per_month(temp_database):
+    user_id = _add_user_with_expenses([(datetime(2025, 1, 15, 12), 1000), (datetime(2025, 2, 10, 12), 2500)])
+    controller = TransactionController()
+
+    assert controller.calculate_monthly_spending(user_id, as_of=date(2025, 1, 31)) == Decimal("10.00")
+    # Same user and data version, next month: must not be the January entry
+    assert controller.calculate_monthly_spending(user_id, as_of=date(2025, 2, 1)) == Decimal("25.00")
+    assert controller.calculate_monthly_category_spending(user_id, as_of=date(2025, 2, 1))[0] == 25
+    assert controller.calculate_last_six_months_spending(user_id, as_of=date(2025, 2, 1))[:2] == [
+        Decimal("25.00"), Decimal("10.00")
+    ]
+    assert controller.calculate_last_six_months_income(user_id, as_of=date(2025, 2, 1)) == [Decimal(0)] * 6
+
+
+def test_failed_reads_are_not_cached(temp_database, monkeypatch):
+    from controllers import budget_controller, saving_controller, transaction_controller
+    from controllers.budget_controller import BudgetController
+    from controllers.saving_controller import SavingsController
+
+    user_id = _add_user_with_expenses([(datetime(2025, 1, 15, 12), 1000)])
+    budgets, savings, transactions = BudgetController(), SavingsController(), TransactionController()
+    budgets.create_budget(user_id, "foods", 50, date(2025, 1, 1), date(2025, 1, 31))
+    savings.create_saving(user_id, "bike", 300, date(2025, 12, 31))
+
+    def unavailable():
+        raise RuntimeError("database unavailable")
+    for module in (budget_controller, saving_controller, transaction_controller):
+        monkeypatch.setattr(module, "connection", unavailable)
+    assert budgets.get_all_budgets(user_id) == []
+    assert budgets.get_active_budgets(user_id, on=date(2025, 1, 15)) == []
+    assert savings.get_all_savings(user_id) is None
+    assert transactions.calculate_monthly_spending(user_id, as_of=date(2025, 1, 31)) == Decimal(0)
+    assert transactions.calculate_last_six_months_spending(user_id, as_of=date(2025, 1, 31))[0] == Decimal(0)
+    monkeypatch.undo()
+
+    # The database is back: no write happened, yet the real rows are read
+    assert len(budgets.get_all_budgets(user_id)) == 1
+    assert len(budgets.get_active_budgets(user_id, on=date(2025, 1, 15))) == 1
+    assert len(savings.get_all_savings(user_id)) == 1
+    assert transactions.calculate_monthly_spending(user_id, as_of=date(2025, 1, 31)) == Decimal("10.00")
+    assert transactions.calculate_last_six_months_spending(user_id, as_of=date(2025, 1, 31))[0] == Decimal("10.00")
+    assert transactions.calculate_monthly_category_spending(user_id, as_of=date(2025, 1, 31))[0] == 10
+
+
+def _rollups_match_transactions(conn):
+    raw = conn.execute(
+        "SELECT user_id, strftime('%Y-%m', date, 'localtime'), transaction_type, category, SUM(amount), COUNT(*) "
+        "FROM transactions GROUP BY 1, 2, 3, 4 ORDER BY 1, 2, 3, 4"
+    ).fetchall()
+    rollups = conn.execute(
+        "SELECT user_id, year_month, transaction_type, category, total, count "
+        "FROM monthly_rollups ORDER BY 1, 2, 3, 4"
+    ).fetchall()
+    return raw == rollups
+
+
+def test_rollups_equal_the_raw_sums(temp_database):
+    from database.database import connection
+
+    user_id = _add_user_with_expenses([
+        (datetime(2025, 1, 31, 23, 30), 1000), (datetime(2025, 2, 1, 0, 30), 2500), (datetime(2025, 2, 14, 12), 700)
+    ])
+    controller = TransactionController()
+    added = controller.create_transaction(user_id, Decimal("40.00"), "other", "income", "pay")
+    with connection() as conn:
+        assert _rollups_match_transactions(conn)
+        first, second = [row[0] for row in conn.execute(
+            "SELECT transaction_id FROM transactions WHERE transaction_type = 'expense' ORDER BY date LIMIT 2"
+        )]
+
+    # Moving a row to another category and emptying a group both show up
+    assert controller.update_transaction(first, Decimal("12.00"), "transport", "expense", "taxi")
+    controller.delete_transaction(second)
+    controller.delete_transaction(added)
+    with connection() as conn:
+        assert _rollups_match_transactions(conn)
+        assert conn.execute("SELECT COUNT(*) FROM monthly_rollups WHERE count <= 0").fetchone()[0] == 0
+
+
+def test_aggregate_months_equal_their_days(temp_database):
+    user_id = _add_user_with_expenses([
+        (datetime(2025, 1, 1, 0, 30), 1000), (datetime(2025, 1, 31, 23, 30), 250),
+        (datetime(2025, 2, 28, 12), 4000), (datetime(2025, 3, 1, 0, 10), 99),
+    ])
+    controller = TransactionController()
+    # Whole months are read from monthly_rollups, days from the transactions
+    months = controller.aggregate(user_id, date(2025, 1, 1), date(2025, 2, 28), group_by=("category",))
+    days = controller.aggregate(user_id, date(2025, 1, 1), date(2025, 2, 28), bucket="day", group_by=("category",))
+
+    assert list(months) == ["2025-01", "2025-02"]
+    for month, groups in months.items():
+        assert groups[("foods",)] == sum(
+            (totals[("foods",)] for day, totals in days.items() if day.startswith(month)), Decimal(0)
+        )
+    assert months["2025-01"][("foods",)] == Decimal("12.50")
+    assert months["2025-02"][("transport",)] == Decimal(0)
+    assert controller.aggregate(user_id, date(2025, 1, 1), date(2025, 12, 31), bucket="year", group_by=()) == {
+        "2025": {(): Decimal("53.49")}
+    }
+
+
+def test_duplicates_are_skipped(temp_database, tmp_path):
+    from controllers.import_controller import ImportController
+
+    user_id = _add_user_with_expenses([])
+    controller = TransactionController()
+    assert controller.create_transaction(user_id, Decimal("9.99"), "foods", "expense", "Lunch", skip_duplicates=True)
+    assert controller.create_transaction(user_id, Decimal("9.99"), "foods", "expense", " lunch ", skip_duplicates=True) is None
+    assert controller.create_transaction(user_id, Decimal("9.99"), "foods", "expense", "Lunch")
+
+    statement = tmp_path / "statement.csv"
+    statement.write_text("Date,Amount,Description\n2025-03-01,-4.50,Coffee\n2025-03-02,-60.00,Groceries\n")
+    first = ImportController().import_file(user_id, str(statement))
+    second = ImportController().import_file(user_id, str(statement))
+    assert (first.imported, first.skipped) == (2, 0)
+    assert (second.imported, second.skipped, len(second.duplicates)) == (0, 2, 2)
+    # Without skip_duplicates an overlapping statement is imported again
+    assert ImportController().import_file(user_id, str(statement), skip_duplicates=False).imported == 2